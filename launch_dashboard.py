@@ -31,17 +31,10 @@ def main():
         sys.exit(1)
     
     # Import after checking
-    from roadmapper.dashboard import get_dashboard_data, get_dashboard_template
-    from flask import Flask, render_template_string
+    from roadmapper.dashboard import create_dashboard_app
     
     # Create Flask app
-    app = Flask(__name__)
-    
-    @app.route("/")
-    def index():
-        data = get_dashboard_data()
-        template = get_dashboard_template()
-        return render_template_string(template, **data)
+    app = create_dashboard_app()
     
     # Open browser after a short delay
     url = "http://127.0.0.1:5000"
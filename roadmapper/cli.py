@@ -6,37 +6,8 @@ from pathlib import Path
 import sys
 
 from roadmapper import __version__
-from roadmapper.init import init_project
-from roadmapper.session import create_session
-from roadmapper.status import show_status
 from roadmapper.utils import ensure_utf8_console
-from roadmapper.config import (
-    load_config,
-    get_config_value,
-    set_config_value,
-    reset_config_value,
-)
 from roadmapper.paths import get_project_root
-from roadmapper.history import read_history, get_session_stats
-from roadmapper.projects import (
-    get_all_projects,
-    register_project,
-    unregister_project,
-    update_project_registry,
-    discover_projects,
-)
-from roadmapper.search import search_projects
-from roadmapper.knowledge import (
-    index_all_projects,
-    search_knowledge,
-    get_knowledge_by_topic,
-    get_related_discoveries,
-    load_knowledge,
-)
-from roadmapper.summarize import summarize_session, generate_roadmap_summary
-from roadmapper.commits import generate_commit_message
-from roadmapper.session_close import close_session
-from roadmapper.docs import suggest_doc_updates, check_doc_consistency, fix_doc_consistency, suggest_next_steps
 
 
 @click.group()
@@ -70,6 +41,8 @@ def init(template, no_git):
     
     Creates the directory structure, templates, and initial roadmap file.
     """
+    from roadmapper.init import init_project
+    
     try:
         init_project(template=template, init_git=not no_git)
         # Project is automatically registered by init_project()
@@ -92,6 +65,8 @@ def session(name):
     Creates a new session file with proper naming (SESSION_YYYY_MM_DD_X.md).
     Auto-increments session letters if multiple sessions exist for the same date.
     """
+    from roadmapper.session import create_session
+    
     try:
         session_path = create_session(name=name)
         click.echo(f"✅ Created session file: {session_path}")
@@ -107,6 +82,8 @@ def status():
     
     Displays current session, recent sessions, and git status summary.
     """
+    from roadmapper.status import show_status
+    
     try:
         show_status()
     except Exception as e:
@@ -131,6 +108,8 @@ def config():
 )
 def config_set(key, value, scope):
     """Set a configuration value."""
+    from roadmapper.config import set_config_value
+    
     try:
         project_root = get_project_root() if scope == "project" else None
         set_config_value(key, value, scope=scope, project_root=project_root)
@@ -144,6 +123,8 @@ def config_set(key, value, scope):
 @click.argument("key")
 def config_get(key):
     """Get a configuration value."""
+    from roadmapper.config import get_config_value
+    
     try:
         project_root = get_project_root()
         value = get_config_value(key, project_root=project_root)
@@ -165,6 +146,8 @@ def config_get(key):
 )
 def config_list(scope):
     """List configuration values."""
+    from roadmapper.config import load_config
+    
     try:
         project_root = get_project_root() if scope != "global" else None
         
@@ -220,6 +203,8 @@ def _print_config(config: dict, prefix: str = "") -> None:
 )
 def config_reset(key, scope):
     """Reset a configuration value (remove from config)."""
+    from roadmapper.config import reset_config_value
+    
     try:
         project_root = get_project_root() if scope == "project" else None
         reset_config_value(key, scope=scope, project_root=project_root)
@@ -248,6 +233,8 @@ def history():
 )
 def history_list(limit, since):
     """List recent session history."""
+    from roadmapper.history import read_history
+    
     try:
         project_root = get_project_root()
         if project_root is None:
@@ -284,8 +271,19 @@ def history_list(limit, since):
     "--since",
     help="Only analyze sessions since this date (YYYY-MM-DD)",
 )
-def history_stats(since):
+@click.option(
+    "--files-changed",
+    is_flag=True,
+    help="Also show files changed since each session started (one git pass)",
+)
+def history_stats(since, files_changed):
     """Show session statistics."""
+    from roadmapper.history import (
+        get_files_changed_for_sessions,
+        get_session_stats,
+        get_weekly_session_counts,
+    )
+    
     try:
         from datetime import datetime
         
@@ -309,6 +307,19 @@ def history_stats(since):
         click.echo(f"  Last 7 days: {stats['sessions_last_7_days']}")
         click.echo(f"  Last 30 days: {stats['sessions_last_30_days']}")
         click.echo(f"  Avg per week: {stats['avg_sessions_per_week']}")
+        
+        if stats["total_sessions"] > 0 and since_date is None:
+            weekly = get_weekly_session_counts(project_root=project_root, weeks=8)
+            click.echo(f"  Last 8 weeks (oldest first): {' '.join(str(count) for count in weekly)}")
+        
+        if files_changed:
+            counts = get_files_changed_for_sessions(project_root=project_root)
+            if counts:
+                click.echo("\n📁 Files changed since session start:\n")
+                for session_file, count in counts.items():
+                    click.echo(f"  {session_file.name}: {count}")
+            else:
+                click.echo("\n📁 No session files found")
     except Exception as e:
         click.echo(f"❌ Error getting stats: {e}", err=True)
         sys.exit(1)
@@ -323,6 +334,8 @@ def projects():
 @projects.command("list")
 def projects_list():
     """List all registered projects."""
+    from roadmapper.projects import get_all_projects
+    
     try:
         projects = get_all_projects()
         
@@ -369,6 +382,8 @@ def projects_list():
 @click.option("--name", help="Project name (defaults to directory name)")
 def projects_register(path, name):
     """Register a project in the registry."""
+    from roadmapper.projects import register_project
+    
     try:
         # Verify it's a roadmapper project
         if not (path / "PROJECT_ROADMAP.md").exists() and not (path / ".roadmapper.toml").exists():
@@ -388,6 +403,8 @@ def projects_register(path, name):
 @click.argument("path", type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path))
 def projects_unregister(path):
     """Unregister a project from the registry."""
+    from roadmapper.projects import unregister_project
+    
     try:
         if unregister_project(path):
             click.echo(f"✅ Unregistered project: {path}")
@@ -402,6 +419,8 @@ def projects_unregister(path):
 @projects.command("discover")
 def projects_discover():
     """Discover and register projects automatically."""
+    from roadmapper.projects import get_all_projects, update_project_registry
+    
     try:
         click.echo("🔍 Discovering projects...")
         new_count = update_project_registry()
@@ -441,7 +460,7 @@ def dashboard(host, port, open_browser):
     try:
         # Try to import Flask
         try:
-            from flask import Flask, render_template_string
+            import flask
         except ImportError:
             click.echo("❌ Flask is required for dashboard. Install it with:", err=True)
             click.echo("   pip install flask", err=True)
@@ -449,15 +468,9 @@ def dashboard(host, port, open_browser):
             click.echo("   pip install 'roadmapper[dashboard]'", err=True)
             sys.exit(1)
         
-        from roadmapper.dashboard import get_dashboard_data, get_dashboard_template
+        from roadmapper.dashboard import create_dashboard_app
         
-        app = Flask(__name__)
-        
-        @app.route("/")
-        def index():
-            data = get_dashboard_data()
-            template = get_dashboard_template()
-            return render_template_string(template, **data)
+        app = create_dashboard_app()
         
         url = f"http://{host}:{port}"
         click.echo(f"🚀 Starting dashboard server...")
@@ -479,6 +492,46 @@ def dashboard(host, port, open_browser):
         sys.exit(1)
 
 
+@main.command()
+@click.option(
+    "--poll",
+    is_flag=True,
+    help="Poll file stats instead of using filesystem notifications",
+)
+@click.option(
+    "--interval",
+    type=float,
+    default=1.0,
+    help="Seconds between polls with --poll (default: 1.0)",
+)
+def watch(poll, interval):
+    """Keep search, knowledge and session caches up to date in the background."""
+    import time
+
+    from roadmapper.watch import IndexDaemon
+
+    def log(message):
+        click.echo(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+
+    daemon = IndexDaemon(on_log=log, use_notifications=not poll, poll_interval=max(0.1, interval))
+
+    try:
+        click.echo("🔄 Indexing registered projects...")
+        daemon.start()
+        click.echo(f"👀 Watching {len(daemon.project_paths)} project(s) ({daemon.backend})")
+        if daemon.backend == "polling" and not poll:
+            click.echo("💡 Install 'roadmapper[watch]' for filesystem notifications instead of polling")
+        click.echo("\n💡 Press Ctrl+C to stop\n")
+
+        while True:
+            time.sleep(3600)
+
+    except KeyboardInterrupt:
+        click.echo("\n\n👋 Watch stopped")
+    finally:
+        daemon.stop()
+
+
 @main.group()
 def knowledge():
     """Query knowledge base extracted from sessions."""
@@ -488,6 +541,8 @@ def knowledge():
 @knowledge.command("index")
 def knowledge_index():
     """Extract and index knowledge from all projects."""
+    from roadmapper.knowledge import index_all_projects, get_knowledge_count
+    
     try:
         click.echo("🔍 Indexing knowledge from all projects...")
         new_count = index_all_projects()
@@ -497,7 +552,7 @@ def knowledge_index():
         else:
             click.echo("📚 No new knowledge found (already indexed)")
         
-        total = len(load_knowledge())
+        total = get_knowledge_count()
         click.echo(f"\n📊 Total knowledge entries: {total}")
     except Exception as e:
         click.echo(f"❌ Error indexing knowledge: {e}", err=True)
@@ -514,26 +569,34 @@ def knowledge_index():
 )
 @click.option(
     "--limit",
-    type=int,
+    type=click.IntRange(min=1),
     default=20,
     help="Maximum number of results (default: 20)",
 )
-def knowledge_search(query, knowledge_type, limit):
+@click.option(
+    "--offset",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of results to skip (default: 0)",
+)
+def knowledge_search(query, knowledge_type, limit, offset):
     """Search knowledge base."""
+    from roadmapper.knowledge import search_knowledge
+    
     try:
         results = search_knowledge(query, knowledge_type)
         
-        if not results:
+        if not results.total:
             click.echo(f"❌ No knowledge found for: '{query}'")
             click.echo("\n💡 Tip: Run 'roadmapper knowledge index' to extract knowledge from projects")
             return
         
-        # Limit results
-        results = results[:limit]
+        # Only the shown page is fetched
+        entries = results.page(offset, limit)
         
-        click.echo(f"📚 Found {len(results)} knowledge entries for: '{query}'\n")
+        click.echo(f"📚 Found {results.total} knowledge entries for: '{query}'\n")
         
-        for i, entry in enumerate(results, 1):
+        for i, entry in enumerate(entries, offset + 1):
             entry_type = entry.get("type", "unknown")
             content = entry.get("content", "")
             project = entry.get("project", "Unknown")
@@ -547,11 +610,16 @@ def knowledge_search(query, knowledge_type, limit):
             icon = type_icons.get(entry_type, "📝")
             
             click.echo(f"{i}. {icon} [{entry_type}] {project}")
-            click.echo(f"   {content[:100]}{'...' if len(content) > 100 else ''}")
+            if entry.get("snippet"):
+                # Ranked full-text search: show the matching part
+                click.echo(f"   {entry['snippet']}")
+            else:
+                click.echo(f"   {content[:100]}{'...' if len(content) > 100 else ''}")
             click.echo(f"   Session: {session_file}\n")
         
-        if len(search_knowledge(query, knowledge_type)) > limit:
-            click.echo(f"... and {len(search_knowledge(query, knowledge_type)) - limit} more results")
+        remaining = results.total - offset - len(entries)
+        if remaining > 0:
+            click.echo(f"... and {remaining} more results (use --offset {offset + len(entries)} to see them)")
     
     except Exception as e:
         click.echo(f"❌ Error searching knowledge: {e}", err=True)
@@ -562,31 +630,38 @@ def knowledge_search(query, knowledge_type, limit):
 @click.argument("topic")
 def knowledge_learn(topic):
     """Answer: 'What did I learn about X?'"""
+    from roadmapper.knowledge import search_knowledge
+    
     try:
-        results = get_knowledge_by_topic(topic)
+        results = search_knowledge(topic)
         
-        if not results:
+        if not results.total:
             click.echo(f"❌ No knowledge found about: '{topic}'")
             click.echo("\n💡 Tip: Run 'roadmapper knowledge index' to extract knowledge from projects")
             return
         
         click.echo(f"📚 What you learned about '{topic}':\n")
         
-        # Group by project
+        # Group by project, keeping only the entries shown (up to 5 per project)
         by_project = {}
+        counts = {}
         for entry in results:
             project = entry.get("project", "Unknown")
-            if project not in by_project:
-                by_project[project] = []
-            by_project[project].append(entry)
+            counts[project] = counts.get(project, 0) + 1
+            shown = by_project.setdefault(project, [])
+            if len(shown) < 5:
+                shown.append(entry)
         
         for project, entries in by_project.items():
-            click.echo(f"📁 {project} ({len(entries)} entries):")
-            for entry in entries[:5]:  # Show up to 5 per project
+            click.echo(f"📁 {project} ({counts[project]} entries):")
+            for entry in entries:
                 content = entry.get("content", "")
-                click.echo(f"  • {content[:80]}{'...' if len(content) > 80 else ''}")
-            if len(entries) > 5:
-                click.echo(f"  ... and {len(entries) - 5} more")
+                if entry.get("snippet"):
+                    click.echo(f"  • {entry['snippet']}")
+                else:
+                    click.echo(f"  • {content[:80]}{'...' if len(content) > 80 else ''}")
+            if counts[project] > 5:
+                click.echo(f"  ... and {counts[project] - 5} more")
             click.echo()
     
     except Exception as e:
@@ -594,9 +669,24 @@ def knowledge_learn(topic):
         sys.exit(1)
 
 
+@knowledge.command("compact")
+def knowledge_compact():
+    """Rewrite the knowledge store without replaced entries."""
+    from roadmapper.knowledge import compact_knowledge
+    
+    try:
+        records, entries = compact_knowledge()
+        click.echo(f"✅ Compacted knowledge base: {records} records -> {entries} entries")
+    except Exception as e:
+        click.echo(f"❌ Error compacting knowledge: {e}", err=True)
+        sys.exit(1)
+
+
 @knowledge.command("stats")
 def knowledge_stats():
     """Show knowledge base statistics."""
+    from roadmapper.knowledge import load_knowledge
+    
     try:
         knowledge = load_knowledge()
         
@@ -660,6 +750,8 @@ def knowledge_stats():
 )
 def search(query, file_types, case_sensitive, max_results, project_paths):
     """Search across all registered projects."""
+    from roadmapper.search import search_projects
+    
     try:
         # Convert project paths if provided
         project_paths_list = list(project_paths) if project_paths else None
@@ -747,6 +839,8 @@ def summarize(session, roadmap):
     Extracts accomplishments, decisions, discoveries, and tasks from session file.
     Can generate summary formatted for adding to PROJECT_ROADMAP.md.
     """
+    from roadmapper.summarize import summarize_session, generate_roadmap_summary
+    
     try:
         project_root = get_project_root()
         
@@ -842,6 +936,8 @@ def commit_msg(session, dry_run):
     
     Use with: git commit -m "$(roadmapper commit-msg)"
     """
+    from roadmapper.commits import generate_commit_message
+    
     try:
         project_root = get_project_root()
         message = generate_commit_message(session, project_root)
@@ -894,6 +990,8 @@ def close(session, no_archive, no_roadmap, no_context):
     
     Use when ending a session to prepare for the next one.
     """
+    from roadmapper.session_close import close_session
+    
     try:
         project_root = get_project_root()
         
@@ -960,6 +1058,8 @@ def docs_suggest(since):
     
     Analyzes git changes and suggests when documentation might need updates.
     """
+    from roadmapper.docs import suggest_doc_updates
+    
     try:
         project_root = get_project_root()
         
@@ -1023,6 +1123,8 @@ def docs_check(fix, dry_run):
     Use --fix to auto-fix issues (with confirmation).
     Use --dry-run to see what would be fixed.
     """
+    from roadmapper.docs import check_doc_consistency, fix_doc_consistency
+    
     try:
         project_root = get_project_root()
         
@@ -1097,6 +1199,8 @@ def docs_suggest_next():
     Analyzes current phase, recent accomplishments, and roadmap status
     to suggest what to work on next.
     """
+    from roadmapper.docs import suggest_next_steps
+    
     try:
         project_root = get_project_root()
         
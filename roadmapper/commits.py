@@ -1,9 +1,10 @@
 """Auto-generate commit messages from session logs and git diffs."""
 
-import subprocess
 from pathlib import Path
 from typing import Optional, List, Dict
 
+from roadmapper import session_grammar as grammar
+from roadmapper.git import get_status, run_git
 from roadmapper.paths import get_project_root
 from roadmapper.summarize import extract_session_summary
 
@@ -25,28 +26,12 @@ def get_git_diff(project_root: Optional[Path] = None) -> str:
         project_root = Path.cwd()
     
     try:
-        # Get staged changes
-        result = subprocess.run(
-            ["git", "diff", "--cached"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        staged_diff = result.stdout
-        
-        # Get unstaged changes
-        result = subprocess.run(
-            ["git", "diff"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        unstaged_diff = result.stdout
+        # Staged changes, then unstaged changes
+        staged_diff = run_git(["diff", "--cached"], project_root).stdout
+        unstaged_diff = run_git(["diff"], project_root).stdout
         
         return staged_diff + unstaged_diff
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    except OSError:
         return ""
 
 
@@ -74,32 +59,22 @@ def get_git_status(project_root: Optional[Path] = None) -> Dict[str, List[str]]:
     }
     
     try:
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        
-        for line in result.stdout.strip().split('\n'):
-            if not line:
-                continue
-            
-            # Parse git status line (format: XY filename)
-            status_code = line[:2]
-            filename = line[3:].strip()
-            
-            if status_code[0] == 'M' or status_code[1] == 'M':
-                status["modified"].append(filename)
-            elif status_code[0] == 'A' or status_code[1] == 'A':
-                status["added"].append(filename)
-            elif status_code[0] == 'D' or status_code[1] == 'D':
-                status["deleted"].append(filename)
-            elif status_code[0] == 'R':
-                status["renamed"].append(filename)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
+        git_status = get_status(project_root)
+    except OSError:
+        git_status = None
+    
+    if git_status is None:
+        return status
+    
+    for entry in git_status.entries:
+        if 'M' in entry.xy:
+            status["modified"].append(entry.display_path)
+        elif 'A' in entry.xy:
+            status["added"].append(entry.display_path)
+        elif 'D' in entry.xy:
+            status["deleted"].append(entry.display_path)
+        elif entry.index == 'R':
+            status["renamed"].append(entry.display_path)
     
     return status
 
@@ -228,7 +203,7 @@ def _generate_subject(
         # Remove prefixes and clean up
         subject = first_acc.replace("✅", "").replace("Phase", "").strip()
         # Remove common prefixes
-        subject = re.sub(r'^(Completed|Added|Created|Implemented|Fixed):?\s*', '', subject, flags=re.IGNORECASE)
+        subject = grammar.SUBJECT_PREFIX.sub('', subject)
         # Limit length
         if len(subject) > 72:
             subject = subject[:69] + "..."
@@ -248,8 +223,3 @@ def _generate_subject(
         return f"Update {filename}"
     else:
         return "Update project"
-
-
-# Import re for regex in _generate_subject
-import re
-
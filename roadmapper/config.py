@@ -30,6 +30,17 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "git": {
         "commit_template": "feat: {summary}",
     },
+    "performance": {
+        "scan_workers": 8,
+        "scan_timeout": 10,
+    },
+    "storage": {
+        "registry": "json",
+        "knowledge": "json",
+    },
+    "knowledge": {
+        "related_threshold": 0.3,
+    },
 }
 
 
@@ -168,6 +179,27 @@ def get_config_value(key: str, project_root: Optional[Path] = None) -> Optional[
     return value
 
 
+def get_storage_backend(store: str) -> str:
+    """
+    Get the backend of a global store (e.g. 'registry') from storage.<store>.
+    
+    Global stores are shared by all projects, so only the global config is
+    read for this setting; project-level overrides are ignored.
+    
+    Args:
+        store: Store name (key in the [storage] section)
+    
+    Returns:
+        "json" or "sqlite"
+    """
+    try:
+        storage = _load_toml(get_global_config_file()).get("storage", {})
+    except ImportError:
+        storage = {}
+    backend = storage.get(store, DEFAULT_CONFIG["storage"].get(store))
+    return "sqlite" if backend == "sqlite" else "json"
+
+
 def set_config_value(
     key: str,
     value: Any,
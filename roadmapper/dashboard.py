@@ -1,12 +1,653 @@
 """Web dashboard for cross-project overview."""
 
+import hashlib
 import json
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
 
-from roadmapper.projects import get_all_projects, get_project_health
-from roadmapper.history import read_history, get_session_stats
+from roadmapper.projects import (
+    get_all_projects,
+    get_project_summary,
+    get_projects_registry_file,
+    load_projects_registry,
+    map_projects,
+)
+from roadmapper.history import read_history
+from roadmapper.knowledge import search_knowledge
+from roadmapper.utils import stat_key
+
+
+# Sort keys accepted by the projects API (prefix with "-" for descending)
+PROJECT_SORT_KEYS = (
+    "name",
+    "health",
+    "last_session",
+    "total_sessions",
+    "sessions_last_7_days",
+    "sessions_last_30_days",
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class DashboardPage:
+    """A rendered dashboard with the validators browsers use for caching."""
+    
+    def __init__(self, fingerprint: Tuple, data: Dict, summaries: Optional[List["ProjectSummary"]] = None):
+        self.fingerprint = fingerprint
+        self.data = data
+        self.summaries = summaries  # What data was built from (for incremental updates)
+        self.etag = hashlib.sha1(repr(fingerprint).encode("utf-8")).hexdigest()
+        # HTTP dates have one-second resolution
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self.html = None
+
+
+_dashboard_page: Optional[DashboardPage] = None
+_dashboard_lock = threading.Lock()
+
+
+def get_dashboard_fingerprint() -> Tuple:
+    """
+    Fingerprint everything the dashboard is computed from.
+    
+    Covers the registry file and, per project, history.jsonl and
+    PROJECT_ROADMAP.md (mtime and size). The current hour is included too,
+    because project health depends on how long ago the last session was.
+    
+    Returns:
+        Hashable fingerprint; equal fingerprints mean equal dashboard data
+    """
+    parts = [datetime.now().strftime("%Y-%m-%dT%H"), stat_key(get_projects_registry_file())]
+    
+    for project_key in sorted(load_projects_registry()):
+        project_path = Path(project_key)
+        parts.append((
+            project_key,
+            stat_key(project_path / ".roadmapper" / "history.jsonl"),
+            stat_key(project_path / "PROJECT_ROADMAP.md"),
+        ))
+    
+    return tuple(parts)
+
+
+def get_dashboard_page() -> DashboardPage:
+    """
+    Get dashboard data, rebuilding it only when an input file changed.
+    
+    Returns:
+        Current DashboardPage (shared; treat as read-only)
+    """
+    global _dashboard_page
+    
+    fingerprint = get_dashboard_fingerprint()
+    page = _dashboard_page
+    if page is not None and page.fingerprint == fingerprint:
+        return page
+    
+    with _dashboard_lock:
+        # Another request may have rebuilt it while we waited
+        page = _dashboard_page
+        if page is None or page.fingerprint != fingerprint:
+            summaries = build_project_summaries(get_all_projects())
+            page = DashboardPage(fingerprint, build_dashboard_data(summaries), summaries)
+            _dashboard_page = page
+    
+    return page
+
+
+def update_dashboard_page(project_paths: Set[Path]) -> Tuple[DashboardPage, DashboardPage]:
+    """
+    Rebuild only the given projects' cards in the cached dashboard.
+    
+    Other projects' summaries are reused, so a change to one project costs one
+    project refresh instead of a fleet rescan. Metrics and patterns are
+    recomputed from the summaries (no file access).
+    
+    Args:
+        project_paths: Projects whose files changed
+    
+    Returns:
+        Tuple of (previous page, updated page)
+    """
+    global _dashboard_page
+    
+    with _dashboard_lock:
+        previous = _dashboard_page
+        if previous is None or previous.summaries is None:
+            previous = None
+    
+    if previous is None:
+        page = get_dashboard_page()
+        return page, page
+    
+    registry = load_projects_registry()
+    changed = {str(path) for path in project_paths}
+    summaries = []
+    for summary in previous.summaries:
+        project_key = str(summary.path)
+        if project_key not in changed:
+            summaries.append(summary)
+        elif project_key in registry and summary.path.exists():
+            project_summary = get_project_summary(summary.path)
+            project_info = dict(registry[project_key])
+            project_info["last_session"] = project_summary["last_session"]
+            project_info["health"] = project_summary["health"]
+            summaries.append(build_project_summary(project_info))
+    
+    with _dashboard_lock:
+        page = DashboardPage(get_dashboard_fingerprint(), build_dashboard_data(summaries), summaries)
+        _dashboard_page = page
+    
+    return previous, page
+
+
+class DashboardEvents:
+    """
+    Pushes dashboard changes to Server-Sent Events subscribers.
+    
+    A ProjectWatcher runs only while at least one browser is subscribed, so
+    an idle dashboard does no scanning. When a project's files change, only
+    that project is refreshed (see update_dashboard_page) and subscribers get
+    the changed cards plus metric deltas.
+    """
+    
+    def __init__(self, watcher_factory: Optional[Callable] = None):
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._watcher_factory = watcher_factory or self._create_watcher
+    
+    def subscribe(self) -> queue.Queue:
+        """Register a subscriber; starts watching on the first one."""
+        subscriber = queue.Queue()
+        with self._lock:
+            self._subscribers.append(subscriber)
+            if self._watcher is None:
+                self._watcher = self._watcher_factory(self.handle_change)
+                self._watcher.start()
+        return subscriber
+    
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """Remove a subscriber; stops watching after the last one leaves."""
+        watcher = None
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+            if not self._subscribers and self._watcher is not None:
+                watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+    
+    def publish(self, event: str, data) -> None:
+        """Send an event to every subscriber."""
+        message = format_sse(event, data)
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.put(message)
+    
+    def handle_change(self, changed: Set[Path]) -> None:
+        """Watcher callback: refresh changed projects and publish the differences."""
+        registry_file = get_projects_registry_file()
+        if registry_file in changed:
+            # Projects were added or removed: rebuild everything and watch the new set
+            page = get_dashboard_page()
+            self.publish("reset", page.data)
+            self._restart_watcher()
+            return
+        
+        previous, page = update_dashboard_page(changed)
+        
+        old_cards = {card["id"]: card for card in previous.data["projects"]}
+        for card in page.data["projects"]:
+            if old_cards.get(card["id"]) != card:
+                self.publish("project", card)
+        
+        delta = metrics_delta(previous.data["metrics"], page.data["metrics"])
+        if delta:
+            self.publish("metrics", {"metrics": page.data["metrics"], "delta": delta})
+        
+        if previous.data["patterns"] != page.data["patterns"]:
+            self.publish("patterns", page.data["patterns"])
+    
+    def _restart_watcher(self) -> None:
+        """Replace the watcher so it covers the current registry."""
+        with self._lock:
+            old_watcher = self._watcher
+            self._watcher = None
+            if self._subscribers:
+                self._watcher = self._watcher_factory(self.handle_change)
+        if old_watcher is not None:
+            # Called from the old watcher's own thread; stop it without joining itself
+            threading.Thread(target=old_watcher.stop, daemon=True).start()
+        if self._watcher is not None:
+            self._watcher.start()
+    
+    @staticmethod
+    def _create_watcher(on_change: Callable[[Set[Path]], None]):
+        from roadmapper.watcher import ProjectWatcher
+        
+        return ProjectWatcher(
+            [Path(project_key) for project_key in load_projects_registry()],
+            on_change,
+            extra_files=[get_projects_registry_file()],
+        )
+
+
+def format_sse(event: str, data) -> str:
+    """Format one Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def metrics_delta(old: Dict, new: Dict) -> Dict:
+    """
+    Numeric differences between two metrics dictionaries.
+    
+    Args:
+        old: Previous metrics
+        new: Current metrics
+    
+    Returns:
+        Changed metrics mapped to (new - old); nested dicts (health_counts)
+        are compared per key. Empty if nothing changed.
+    """
+    delta = {}
+    for key in new.keys() | old.keys():
+        old_value, new_value = old.get(key, 0), new.get(key, 0)
+        if isinstance(new_value, dict) or isinstance(old_value, dict):
+            nested = metrics_delta(old_value or {}, new_value or {})
+            if nested:
+                delta[key] = nested
+        elif new_value != old_value:
+            delta[key] = new_value - old_value
+    return delta
+
+
+# Seconds between keep-alive comments on idle event streams
+SSE_KEEPALIVE_INTERVAL = 15
+
+
+def create_dashboard_app():
+    """
+    Create the dashboard Flask application.
+    
+    Requires Flask (install with: pip install 'roadmapper[dashboard]').
+    
+    Returns:
+        Flask app serving the dashboard
+    """
+    from flask import Flask, Response, jsonify, render_template_string, request
+    
+    app = Flask(__name__)
+    events = DashboardEvents()
+    
+    def conditional_json(page: DashboardPage, body: Dict):
+        """JSON response validated by the dashboard page's ETag."""
+        response = jsonify(body)
+        response.set_etag(page.etag)
+        response.last_modified = page.last_modified
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    
+    def bad_request(message: str):
+        response = jsonify({"error": message})
+        response.status_code = 400
+        return response
+    
+    @app.route("/")
+    def index():
+        page = get_dashboard_page()
+        if page.html is None:
+            page.html = render_template_string(get_dashboard_template(), **page.data)
+        
+        response = Response(page.html, mimetype="text/html")
+        response.set_etag(page.etag)
+        response.last_modified = page.last_modified
+        # Let browsers keep the page but revalidate it on every load
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    
+    @app.route("/events")
+    def event_stream():
+        subscriber = events.subscribe()
+        
+        def generate():
+            try:
+                while True:
+                    try:
+                        yield subscriber.get(timeout=SSE_KEEPALIVE_INTERVAL)
+                    except queue.Empty:
+                        yield ": keep-alive\n\n"
+            finally:
+                # Runs when the browser disconnects
+                events.unsubscribe(subscriber)
+        
+        response = Response(generate(), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+    
+    @app.route("/api/projects")
+    def api_projects():
+        page = get_dashboard_page()
+        try:
+            body = query_projects(
+                page.data["projects"],
+                health=request.args.get("health"),
+                sort=request.args.get("sort", "name"),
+                page=request.args.get("page", 1),
+                per_page=request.args.get("per_page", DEFAULT_PAGE_SIZE),
+            )
+        except ValueError as e:
+            return bad_request(str(e))
+        return conditional_json(page, body)
+    
+    @app.route("/api/projects/<project_id>/history")
+    def api_project_history(project_id):
+        page = get_dashboard_page()
+        project = find_project(page.data["projects"], project_id)
+        if project is None:
+            response = jsonify({"error": f"Unknown project: {project_id}"})
+            response.status_code = 404
+            return response
+        try:
+            body = query_project_history(
+                project,
+                since=request.args.get("since"),
+                page=request.args.get("page", 1),
+                per_page=request.args.get("per_page", DEFAULT_PAGE_SIZE),
+            )
+        except ValueError as e:
+            return bad_request(str(e))
+        return conditional_json(page, body)
+    
+    @app.route("/api/metrics")
+    def api_metrics():
+        page = get_dashboard_page()
+        return conditional_json(page, page.data["metrics"])
+    
+    @app.route("/api/patterns")
+    def api_patterns():
+        page = get_dashboard_page()
+        return conditional_json(page, {"patterns": page.data["patterns"]})
+    
+    @app.route("/api/knowledge")
+    def api_knowledge():
+        try:
+            body = query_knowledge(
+                request.args.get("q", ""),
+                knowledge_type=request.args.get("type"),
+                page=request.args.get("page", 1),
+                per_page=request.args.get("per_page", DEFAULT_PAGE_SIZE),
+            )
+        except ValueError as e:
+            return bad_request(str(e))
+        return jsonify(body)
+    
+    return app
+
+
+def get_project_id(project_path: Path) -> str:
+    """Stable short ID for a project, used in API URLs."""
+    return hashlib.sha1(str(project_path).encode("utf-8")).hexdigest()[:12]
+
+
+def find_project(projects: List[Dict], project_id: str) -> Optional[Dict]:
+    """Find a project card by ID, or None."""
+    for project in projects:
+        if project["id"] == project_id:
+            return project
+    return None
+
+
+def paginate(items: List, page, per_page) -> Dict:
+    """
+    Cut one page out of a list.
+    
+    Args:
+        items: Items to paginate
+        page: 1-based page number (int or numeric string)
+        per_page: Items per page, at most MAX_PAGE_SIZE (int or numeric string)
+    
+    Returns:
+        Dictionary with items, page, per_page, total and pages
+    
+    Raises:
+        ValueError: If page or per_page is not a positive integer
+    """
+    page = _parse_positive_int(page, "page")
+    per_page = min(_parse_positive_int(per_page, "per_page"), MAX_PAGE_SIZE)
+    
+    start = (page - 1) * per_page
+    return {
+        "items": items[start:start + per_page],
+        "page": page,
+        "per_page": per_page,
+        "total": len(items),
+        "pages": (len(items) + per_page - 1) // per_page,
+    }
+
+
+def _parse_positive_int(value, name: str) -> int:
+    """Parse a positive integer query parameter."""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if number < 1:
+        raise ValueError(f"{name} must be at least 1")
+    return number
+
+
+def query_projects(
+    projects: List[Dict],
+    health: Optional[str] = None,
+    sort: str = "name",
+    page=1,
+    per_page=DEFAULT_PAGE_SIZE,
+) -> Dict:
+    """
+    Filter, sort and paginate project cards for the projects API.
+    
+    Args:
+        projects: Project cards from get_dashboard_data()
+        health: Only include projects with this health (comma-separated for several)
+        sort: One of PROJECT_SORT_KEYS, prefixed with "-" for descending
+        page: 1-based page number
+        per_page: Projects per page
+    
+    Returns:
+        Dictionary with the page of projects and pagination info
+    
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    if health:
+        wanted = {value.strip() for value in health.split(",") if value.strip()}
+        projects = [project for project in projects if project["health"] in wanted]
+    
+    sort_key = sort.lstrip("-")
+    if sort_key not in PROJECT_SORT_KEYS:
+        raise ValueError(f"sort must be one of: {', '.join(PROJECT_SORT_KEYS)}")
+    
+    # Projects without a value (e.g. no last session) sort last either way
+    present = [project for project in projects if project.get(sort_key) is not None]
+    missing = [project for project in projects if project.get(sort_key) is None]
+    present.sort(key=lambda project: project[sort_key], reverse=sort.startswith("-"))
+    
+    result = paginate(present + missing, page, per_page)
+    result["projects"] = result.pop("items")
+    return result
+
+
+def query_project_history(
+    project: Dict,
+    since: Optional[str] = None,
+    page=1,
+    per_page=DEFAULT_PAGE_SIZE,
+) -> Dict:
+    """
+    Get a page of one project's session history (most recent first).
+    
+    Args:
+        project: Project card from get_dashboard_data()
+        since: Only include sessions since this date (YYYY-MM-DD)
+        page: 1-based page number
+        per_page: Sessions per page
+    
+    Returns:
+        Dictionary with the page of history records and pagination info
+    
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    since_date = None
+    if since:
+        try:
+            since_date = datetime.strptime(since, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"Invalid date format: {since}. Use YYYY-MM-DD")
+    
+    # Read only as many recent records as the requested page needs
+    page_number = _parse_positive_int(page, "page")
+    page_size = min(_parse_positive_int(per_page, "per_page"), MAX_PAGE_SIZE)
+    records = read_history(
+        project_root=Path(project["path"]),
+        limit=page_number * page_size if since_date is None else None,
+        since=since_date,
+    )
+    
+    result = paginate(records, page_number, page_size)
+    result["history"] = result.pop("items")
+    result["project"] = project["id"]
+    if since_date is None:
+        # Only the newest records were read; the card has the full count
+        result["total"] = max(project["total_sessions"], len(records))
+        result["pages"] = (result["total"] + page_size - 1) // page_size
+    return result
+
+
+def query_knowledge(
+    query: str,
+    knowledge_type: Optional[str] = None,
+    page=1,
+    per_page=DEFAULT_PAGE_SIZE,
+) -> Dict:
+    """
+    Get a page of knowledge search results for the knowledge API.
+    
+    The search runs once; only the requested page of entries is fetched.
+    
+    Args:
+        query: Search query
+        knowledge_type: Optional filter by type
+        page: 1-based page number
+        per_page: Entries per page
+    
+    Returns:
+        Dictionary with the page of entries and pagination info
+    
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    if not query.strip():
+        raise ValueError("q is required")
+    
+    result = paginate(search_knowledge(query, knowledge_type or None), page, per_page)
+    result["entries"] = result.pop("items")
+    result["query"] = query
+    return result
+
+
+class ProjectSummary:
+    """
+    Everything the dashboard knows about one project.
+    
+    Built once per project (one history read), then shared by the metrics
+    aggregation, the project cards and every pattern detector.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        health: str,
+        last_session: Optional[str],
+        total_sessions: int = 0,
+        sessions_last_7_days: int = 0,
+        sessions_last_30_days: int = 0,
+        partial: bool = False,
+    ):
+        self.name = name
+        self.path = path
+        self.health = health
+        self.last_session = last_session  # YYYY-MM-DD, or None
+        self.total_sessions = total_sessions
+        self.sessions_last_7_days = sessions_last_7_days
+        self.sessions_last_30_days = sessions_last_30_days
+        self.partial = partial  # Session counts unknown (history not read in time)
+    
+    def to_dict(self) -> Dict:
+        """Project card data for the dashboard template and API."""
+        return {
+            "id": get_project_id(self.path),
+            "name": self.name,
+            "path": str(self.path),
+            "health": self.health,
+            "total_sessions": self.total_sessions,
+            "sessions_last_7_days": self.sessions_last_7_days,
+            "sessions_last_30_days": self.sessions_last_30_days,
+            "last_session": self.last_session,
+            "partial": self.partial,
+        }
+
+
+def build_project_summary(project_info: Dict, with_history: bool = True) -> ProjectSummary:
+    """
+    Summarize one registered project (safe to run in a worker thread).
+    
+    Args:
+        project_info: Project metadata from the registry
+        with_history: Whether to include session counts (False gives a
+            partial summary, with zero counts)
+    
+    Returns:
+        ProjectSummary for the project
+    """
+    project_path = Path(project_info["path"])
+    
+    last_session = project_info.get("last_session")
+    last_session_date = None
+    if last_session and last_session.get("date"):
+        try:
+            last_session_date = last_session["date"][:10]  # YYYY-MM-DD
+        except Exception:
+            pass
+    
+    summary = ProjectSummary(
+        name=project_info.get("name", project_path.name),
+        path=project_path,
+        health=project_info.get("health", "unknown"),
+        last_session=last_session_date,
+        partial=True,
+    )
+    
+    if with_history:
+        try:
+            # Saved per project; only recomputed when its history changed
+            counts = get_project_summary(project_path)
+            summary.total_sessions = counts["total_sessions"]
+            summary.sessions_last_7_days = counts["sessions_last_7_days"]
+            summary.sessions_last_30_days = counts["sessions_last_30_days"]
+            summary.partial = False
+        except Exception:
+            pass
+    
+    return summary
 
 
 def get_dashboard_data() -> Dict:
@@ -16,134 +657,124 @@ def get_dashboard_data() -> Dict:
     Returns:
         Dictionary with projects, metrics, and patterns
     """
-    projects = get_all_projects()
+    return build_dashboard_data(build_project_summaries(get_all_projects()))
+
+
+def build_project_summaries(projects: List[Dict]) -> List[ProjectSummary]:
+    """Summarize projects in parallel; one slow project can't stall the whole page."""
+    return map_projects(
+        build_project_summary,
+        projects,
+        default=lambda project_info: build_project_summary(project_info, with_history=False),
+    )
+
+
+def build_dashboard_data(summaries: List[ProjectSummary]) -> Dict:
+    """Build the dashboard's projects, metrics and patterns from project summaries."""
+    return {
+        "projects": [summary.to_dict() for summary in summaries],
+        "metrics": compute_metrics(summaries),
+        "patterns": detect_patterns(summaries),
+    }
+
+
+def compute_metrics(summaries: List[ProjectSummary]) -> Dict:
+    """
+    Aggregate cross-project metrics.
     
-    # Calculate cross-project metrics
-    total_projects = len(projects)
-    total_sessions = 0
-    sessions_last_7_days = 0
-    sessions_last_30_days = 0
+    Args:
+        summaries: Per-project summaries
     
+    Returns:
+        Dictionary of dashboard metrics
+    """
     health_counts = {
         "healthy": 0,
         "inactive": 0,
         "stale": 0,
         "unknown": 0,
     }
-    
-    projects_data = []
-    
-    for project_info in projects:
-        project_path = Path(project_info["path"])
-        
-        # Get project stats
-        try:
-            stats = get_session_stats(project_path)
-            project_sessions = stats.get("total_sessions", 0)
-            total_sessions += project_sessions
-            
-            # Count recent sessions
-            history = read_history(project_path)
-            now = datetime.now()
-            for record in history:
-                try:
-                    record_date_str = record["date"].replace("Z", "+00:00")
-                    record_date = datetime.fromisoformat(record_date_str)
-                    if record_date.tzinfo is None:
-                        record_date = record_date.replace(tzinfo=now.tzinfo if now.tzinfo else None)
-                    days_ago = (now - record_date).days
-                    if days_ago <= 7:
-                        sessions_last_7_days += 1
-                    if days_ago <= 30:
-                        sessions_last_30_days += 1
-                except Exception:
-                    pass
-        except Exception:
-            project_sessions = 0
-        
-        # Count health status
-        health = project_info.get("health", "unknown")
-        health_counts[health] = health_counts.get(health, 0) + 1
-        
-        # Get last session info
-        last_session = project_info.get("last_session")
-        last_session_date = None
-        if last_session and last_session.get("date"):
-            try:
-                last_session_date = last_session["date"][:10]  # YYYY-MM-DD
-            except Exception:
-                pass
-        
-        projects_data.append({
-            "name": project_info.get("name", project_path.name),
-            "path": str(project_path),
-            "health": health,
-            "total_sessions": project_sessions,
-            "last_session": last_session_date,
-        })
-    
-    # Simple pattern detection - find common terms/issues
-    patterns = detect_patterns(projects)
+    for summary in summaries:
+        health_counts[summary.health] = health_counts.get(summary.health, 0) + 1
     
     return {
-        "projects": projects_data,
-        "metrics": {
-            "total_projects": total_projects,
-            "total_sessions": total_sessions,
-            "sessions_last_7_days": sessions_last_7_days,
-            "sessions_last_30_days": sessions_last_30_days,
-            "health_counts": health_counts,
-        },
-        "patterns": patterns,
+        "total_projects": len(summaries),
+        "total_sessions": sum(s.total_sessions for s in summaries),
+        "sessions_last_7_days": sum(s.sessions_last_7_days for s in summaries),
+        "sessions_last_30_days": sum(s.sessions_last_30_days for s in summaries),
+        "health_counts": health_counts,
     }
 
 
-def detect_patterns(projects: List[Dict]) -> List[Dict]:
+# Pattern detectors take all project summaries and return a pattern dict or None.
+# They must only use the summaries (no file access), so adding one adds no I/O,
+# and skip partial summaries when they rely on session counts.
+PatternDetector = Callable[[List[ProjectSummary]], Optional[Dict]]
+
+PATTERN_DETECTORS: List[PatternDetector] = []
+
+
+def pattern_detector(detector: PatternDetector) -> PatternDetector:
+    """Register a pattern detector (usable as a decorator)."""
+    PATTERN_DETECTORS.append(detector)
+    return detector
+
+
+def detect_patterns(summaries: List[ProjectSummary]) -> List[Dict]:
     """
     Detect common patterns/issues across projects.
     
-    This is a simple implementation - can be enhanced later.
+    Runs every registered detector over the precomputed summaries.
     
     Args:
-        projects: List of project info dictionaries
+        summaries: Per-project summaries
     
     Returns:
         List of detected patterns
     """
     patterns = []
     
-    # Find projects with similar health issues
-    stale_projects = [p for p in projects if p.get("health") == "stale"]
-    if len(stale_projects) >= 2:
-        patterns.append({
-            "type": "stale_projects",
-            "title": f"{len(stale_projects)} projects haven't been worked on recently",
-            "description": "Consider reviewing or archiving these projects",
-            "projects": [p.get("name") for p in stale_projects[:5]],
-        })
-    
-    # Find projects with no sessions
-    no_session_projects = []
-    for project_info in projects:
-        project_path = Path(project_info["path"])
+    for detector in PATTERN_DETECTORS:
         try:
-            stats = get_session_stats(project_path)
-            if stats.get("total_sessions", 0) == 0:
-                no_session_projects.append(project_info.get("name"))
+            pattern = detector(summaries)
         except Exception:
-            pass
-    
-    if no_session_projects:
-        patterns.append({
-            "type": "no_sessions",
-            "title": f"{len(no_session_projects)} projects have no session history",
-            "description": "These projects may need initialization or are new",
-            "projects": no_session_projects[:5],
-        })
+            continue  # A broken detector shouldn't take down the dashboard
+        if pattern:
+            patterns.append(pattern)
     
     return patterns
 
 
+@pattern_detector
+def detect_stale_projects(summaries: List[ProjectSummary]) -> Optional[Dict]:
+    """Find projects that haven't been worked on recently."""
+    stale_projects = [s for s in summaries if s.health == "stale"]
+    if len(stale_projects) < 2:
+        return None
+    
+    return {
+        "type": "stale_projects",
+        "title": f"{len(stale_projects)} projects haven't been worked on recently",
+        "description": "Consider reviewing or archiving these projects",
+        "projects": [s.name for s in stale_projects[:5]],
+    }
+
+
+@pattern_detector
+def detect_projects_without_sessions(summaries: List[ProjectSummary]) -> Optional[Dict]:
+    """Find projects with no session history (partial summaries are not counted)."""
+    no_session_projects = [s.name for s in summaries if not s.partial and s.total_sessions == 0]
+    if not no_session_projects:
+        return None
+    
+    return {
+        "type": "no_sessions",
+        "title": f"{len(no_session_projects)} projects have no session history",
+        "description": "These projects may need initialization or are new",
+        "projects": no_session_projects[:5],
+    }
+
+
 def get_dashboard_template() -> str:
     """Get HTML template for dashboard (Jinja2 format)."""
     return """<!DOCTYPE html>
@@ -286,6 +917,11 @@ def get_dashboard_template() -> str:
         .health-badge.inactive { background: #fef5e7; color: #f39c12; }
         .health-badge.stale { background: #ecf0f1; color: #95a5a6; }
         .health-badge.unknown { background: #ecf0f1; color: #95a5a6; }
+        .last-session {
+            margin-top: 10px;
+            font-size: 12px;
+            color: #7f8c8d;
+        }
     </style>
 </head>
 <body>
@@ -297,19 +933,19 @@ def get_dashboard_template() -> str:
         
         <div class="metrics">
             <div class="metric-card">
-                <div class="metric-value">{{ metrics.total_projects }}</div>
+                <div class="metric-value" data-metric="total_projects">{{ metrics.total_projects }}</div>
                 <div class="metric-label">Total Projects</div>
             </div>
             <div class="metric-card">
-                <div class="metric-value">{{ metrics.total_sessions }}</div>
+                <div class="metric-value" data-metric="total_sessions">{{ metrics.total_sessions }}</div>
                 <div class="metric-label">Total Sessions</div>
             </div>
             <div class="metric-card">
-                <div class="metric-value">{{ metrics.sessions_last_7_days }}</div>
+                <div class="metric-value" data-metric="sessions_last_7_days">{{ metrics.sessions_last_7_days }}</div>
                 <div class="metric-label">Sessions (7 days)</div>
             </div>
             <div class="metric-card">
-                <div class="metric-value">{{ metrics.sessions_last_30_days }}</div>
+                <div class="metric-value" data-metric="sessions_last_30_days">{{ metrics.sessions_last_30_days }}</div>
                 <div class="metric-label">Sessions (30 days)</div>
             </div>
         </div>
@@ -334,26 +970,58 @@ def get_dashboard_template() -> str:
         <h2 style="margin: 20px 0;">📁 Projects</h2>
         <div class="projects-grid">
             {% for project in projects %}
-            <div class="project-card {{ project.health }}">
+            <div class="project-card {{ project.health }}" data-project-id="{{ project.id }}">
                 <div class="project-name">{{ project.name }}</div>
                 <div class="project-path">{{ project.path }}</div>
                 <div class="project-stats">
                     <div class="stat-item">
-                        <span class="stat-value">{{ project.total_sessions }}</span> sessions
+                        <span class="stat-value" data-field="total_sessions">{{ project.total_sessions }}</span> sessions
                     </div>
                     <div class="stat-item">
-                        Health: <span class="health-badge {{ project.health }}">{{ project.health }}</span>
+                        Health: <span class="health-badge {{ project.health }}" data-field="health">{{ project.health }}</span>
                     </div>
                 </div>
-                {% if project.last_session %}
-                <div style="margin-top: 10px; font-size: 12px; color: #7f8c8d;">
-                    Last session: {{ project.last_session }}
+                <div class="last-session" data-field="last_session"{% if not project.last_session %} hidden{% endif %}>
+                    Last session: <span>{{ project.last_session or "" }}</span>
                 </div>
-                {% endif %}
             </div>
             {% endfor %}
         </div>
     </div>
+    <script>
+        // Live updates: the server pushes changed project cards and metrics
+        if (window.EventSource) {
+            const source = new EventSource("/events");
+            
+            source.addEventListener("project", (event) => {
+                const project = JSON.parse(event.data);
+                const card = document.querySelector(`[data-project-id="${project.id}"]`);
+                if (!card) {
+                    window.location.reload();  // New project: re-render the page
+                    return;
+                }
+                card.className = `project-card ${project.health}`;
+                card.querySelector('[data-field="total_sessions"]').textContent = project.total_sessions;
+                const badge = card.querySelector('[data-field="health"]');
+                badge.className = `health-badge ${project.health}`;
+                badge.textContent = project.health;
+                const lastSession = card.querySelector('[data-field="last_session"]');
+                lastSession.hidden = !project.last_session;
+                lastSession.querySelector("span").textContent = project.last_session || "";
+            });
+            
+            source.addEventListener("metrics", (event) => {
+                const metrics = JSON.parse(event.data).metrics;
+                for (const element of document.querySelectorAll("[data-metric]")) {
+                    element.textContent = metrics[element.dataset.metric];
+                }
+            });
+            
+            // Pattern and project-set changes are rare; the page is already rebuilt server-side
+            source.addEventListener("patterns", () => window.location.reload());
+            source.addEventListener("reset", () => window.location.reload());
+        }
+    </script>
 </body>
 </html>"""
 
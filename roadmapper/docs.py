@@ -1,10 +1,11 @@
 """Incremental documentation monitoring and suggestions."""
 
-import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 from datetime import datetime
 
+from roadmapper import session_grammar as grammar
+from roadmapper.git import run_git
 from roadmapper.paths import get_project_root
 from roadmapper.utils import read_text_file
 
@@ -40,35 +41,25 @@ def get_recent_changes(
     try:
         # Get git diff
         if since:
-            cmd = ["git", "diff", "--name-status", since, "HEAD"]
+            args = ["diff", "--name-status", "-z", since, "HEAD"]
         else:
-            cmd = ["git", "diff", "--name-status", "HEAD"]
+            args = ["diff", "--name-status", "-z", "HEAD"]
         
-        result = subprocess.run(
-            cmd,
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = run_git(args, project_root)
         
-        if result.returncode != 0:
+        if not result.ok:
             # Try unstaged changes
-            result = subprocess.run(
-                ["git", "diff", "--name-status"],
-                cwd=project_root,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
+            result = run_git(["diff", "--name-status", "-z"], project_root)
         
-        for line in result.stdout.strip().split('\n'):
-            if not line:
+        # NUL-separated: status, path (renames and copies: status, old path, new path)
+        fields = result.stdout.split("\0")
+        i = 0
+        while i < len(fields) - 1:
+            status_code = fields[i][:1]
+            i += 3 if status_code in ("R", "C") else 2
+            filename = fields[i - 1] if i <= len(fields) else ""
+            if not status_code or not filename:
                 continue
-            
-            # Parse git status line (format: XY filename)
-            status_code = line[0]
-            filename = line[1:].strip().split('\t')[-1] if '\t' in line else line[2:].strip()
             file_path = project_root / filename
             
             if status_code == 'M':
@@ -84,7 +75,7 @@ def get_recent_changes(
             elif _is_doc_file(file_path):
                 changes["doc_files"].append(filename)
     
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    except OSError:
         pass
     
     return changes
@@ -341,14 +332,8 @@ def _extract_feature_list(content: str) -> Set[str]:
     
     # Look for feature-like patterns
     # This is a simple implementation - could be enhanced
-    feature_patterns = [
-        r'roadmapper (\w+)',
-        r'`roadmapper (\w+)`',
-        r'roadmapper\.(\w+)',
-    ]
-    
-    for pattern in feature_patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE)
+    for pattern in grammar.FEATURE_PATTERNS:
+        matches = pattern.findall(content)
         features.update(matches)
     
     return features
@@ -357,14 +342,8 @@ def _extract_feature_list(content: str) -> Set[str]:
 def _extract_phase_status(content: str, phase_name: str) -> Optional[str]:
     """Extract phase status from content."""
     # Look for phase status patterns
-    patterns = [
-        rf"{phase_name}.*?✅.*?Complete",
-        rf"{phase_name}.*?🔵.*?In Progress",
-        rf"{phase_name}.*?🟡.*?Planning",
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
+    for pattern in grammar.phase_status_patterns(phase_name):
+        match = pattern.search(content)
         if match:
             if "Complete" in match.group(0):
                 return "Complete"
@@ -420,7 +399,7 @@ def suggest_next_steps(
         # Extract accomplishments
         if "## ✅ Session Accomplishments" in session_content:
             acc_section = session_content.split("## ✅ Session Accomplishments")[1].split("##")[0]
-            accomplishments = re.findall(r'[-*]\s*✅\s*(.+?)(?=\n[-*]|\n##|\Z)', acc_section, re.MULTILINE)
+            accomplishments = grammar.CHECKED_ITEM.findall(acc_section)
             recent_accomplishments = [acc.strip() for acc in accomplishments[:5]]
     
     # Suggest based on phase
@@ -430,7 +409,7 @@ def suggest_next_steps(
         for feature_num in ["4.2.1", "4.2.2", "4.2.3", "4.2.4", "4.2.5", "4.2.6"]:
             if f"Phase {feature_num}" in roadmap_content or f"4.2.{feature_num[-1]}" in roadmap_content:
                 # Check if marked complete
-                feature_section = re.search(rf"Phase {feature_num}.*?(?=Phase |\Z)", roadmap_content, re.DOTALL | re.IGNORECASE)
+                feature_section = grammar.phase_section_pattern(feature_num).search(roadmap_content)
                 if feature_section and "✅" in feature_section.group(0):
                     completed_features.append(feature_num)
         
@@ -487,14 +466,12 @@ def suggest_next_steps(
 def _find_current_phase(content: str) -> Optional[str]:
     """Find the current active phase from roadmap."""
     # Look for phase progress section
-    phase_pattern = r'Phase Progress:.*?🔵 Phase (\d+[\.\d]*):\s*([^\n]+)'
-    match = re.search(phase_pattern, content, re.DOTALL)
+    match = grammar.PHASE_PROGRESS.search(content)
     if match:
         return f"Phase {match.group(1)}"
     
     # Fallback: look for first incomplete phase
-    phase_pattern = r'🔵 Phase (\d+[\.\d]*):\s*([^\n]+)'
-    match = re.search(phase_pattern, content)
+    match = grammar.ACTIVE_PHASE.search(content)
     if match:
         return f"Phase {match.group(1)}"
     
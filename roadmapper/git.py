@@ -0,0 +1,440 @@
+"""Shared git access for roadmapper.
+
+Every git invocation goes through run_git(), which remembers results for the
+rest of the process (one CLI command), so asking for the same information
+twice never spawns a second git process. Working tree state comes from a
+single `git status --porcelain=v2 --branch -z` call that yields the branch,
+upstream ahead/behind counts and file status together.
+
+Values derived from history alone (files changed between two commits, commit
+lists, ...) never change for the same commit IDs, so memoize() keeps them on
+disk under .roadmapper/cache/git/, keyed by those IDs.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from roadmapper.paths import get_project_cache_dir
+
+
+# Seconds before a git command is killed (a hung network drive or credential
+# prompt must not hold a worker thread forever)
+GIT_TIMEOUT = 60
+
+# Total size of the on-disk memo cache; least recently used entries go first
+MAX_MEMO_CACHE_BYTES = 4 * 1024 * 1024
+
+# Eviction trims the cache to this size, so it doesn't run again on the next write
+MEMO_CACHE_TRIM_BYTES = MAX_MEMO_CACHE_BYTES * 3 // 4
+
+
+class GitResult:
+    """Exit code and output of a git command."""
+
+    def __init__(self, returncode: int, stdout: str, stderr: str):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+    @property
+    def ok(self) -> bool:
+        """True if git exited successfully."""
+        return self.returncode == 0
+
+
+class StatusEntry:
+    """One changed, unmerged or untracked path from git status."""
+
+    def __init__(self, xy: str, path: str, orig_path: Optional[str] = None):
+        self.xy = xy  # Index and worktree status ("M.", ".D", "??", ...)
+        self.path = path  # Relative to the repository root
+        self.orig_path = orig_path  # Source path of a rename or copy
+
+    @property
+    def index(self) -> str:
+        """Index (staged) status letter, "." if unchanged."""
+        return self.xy[0]
+
+    @property
+    def worktree(self) -> str:
+        """Worktree (unstaged) status letter, "." if unchanged."""
+        return self.xy[1]
+
+    @property
+    def display_path(self) -> str:
+        """Path as `git status --short` shows it ("old -> new" for renames)."""
+        if self.orig_path is not None:
+            return f"{self.orig_path} -> {self.path}"
+        return self.path
+
+    def short_format(self) -> str:
+        """Format the entry as a `git status --short` line."""
+        return f"{self.xy.replace('.', ' ')} {self.display_path}"
+
+
+class GitStatus:
+    """Parsed `git status --porcelain=v2 --branch` output."""
+
+    def __init__(self):
+        self.oid: Optional[str] = None  # None before the first commit
+        self.branch: Optional[str] = None  # None when HEAD is detached
+        self.upstream: Optional[str] = None
+        self.ahead = 0
+        self.behind = 0
+        self.entries: List[StatusEntry] = []
+
+    @property
+    def clean(self) -> bool:
+        """True if nothing is changed or untracked."""
+        return not self.entries
+
+
+_results: Dict[Tuple[str, Tuple[str, ...]], GitResult] = {}
+_statuses: Dict[str, Optional[GitStatus]] = {}
+
+# Estimated memo cache size per memo directory, kept up to date by memo writes
+_memo_sizes: Dict[str, int] = {}
+
+
+def run_git(args: Sequence[str], cwd: Path, cache: bool = True) -> GitResult:
+    """
+    Run a git command, reusing the result of an identical earlier call.
+
+    Args:
+        args: Arguments after "git"
+        cwd: Directory to run in
+        cache: Set to False for commands that change the repository
+
+    Returns:
+        GitResult (failed, and not remembered, if git ran longer than GIT_TIMEOUT)
+
+    Raises:
+        FileNotFoundError: If git is not installed
+    """
+    key = (str(cwd), tuple(args))
+    if cache and key in _results:
+        return _results[key]
+
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=GIT_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        return GitResult(-1, "", f"git {' '.join(args)} timed out after {GIT_TIMEOUT}s")
+    result = GitResult(completed.returncode, completed.stdout, completed.stderr)
+
+    if cache:
+        _results[key] = result
+    else:
+        clear_git_cache()  # The command may have changed what earlier results report
+    return result
+
+
+def get_status(cwd: Path) -> Optional[GitStatus]:
+    """
+    Get branch and working tree status in one git call.
+
+    Args:
+        cwd: Directory inside the repository
+
+    Returns:
+        GitStatus, or None if cwd is not in a git repository
+
+    Raises:
+        FileNotFoundError: If git is not installed
+    """
+    key = str(cwd)
+    if key not in _statuses:
+        result = run_git(["status", "--porcelain=v2", "--branch", "-z"], cwd)
+        _statuses[key] = parse_status(result.stdout) if result.ok else None
+    return _statuses[key]
+
+
+def parse_status(output: str) -> GitStatus:
+    """
+    Parse NUL-delimited `git status --porcelain=v2 --branch -z` output.
+
+    Args:
+        output: Raw git output
+
+    Returns:
+        GitStatus
+    """
+    status = GitStatus()
+    records = output.split("\0")
+
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+
+        kind = record[0]
+        if kind == "#":
+            _parse_branch_header(status, record)
+        elif kind == "1":
+            # 1 XY sub mH mI mW hH hI path
+            fields = record.split(" ", 8)
+            status.entries.append(StatusEntry(fields[1], fields[8]))
+        elif kind == "2":
+            # 2 XY sub mH mI mW hH hI Xscore path, then origPath as its own record
+            fields = record.split(" ", 9)
+            orig_path = records[i] if i < len(records) else None
+            i += 1
+            status.entries.append(StatusEntry(fields[1], fields[9], orig_path))
+        elif kind == "u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            fields = record.split(" ", 10)
+            status.entries.append(StatusEntry(fields[1], fields[10]))
+        elif kind == "?":
+            status.entries.append(StatusEntry("??", record[2:]))
+
+    return status
+
+
+def _parse_branch_header(status: GitStatus, record: str) -> None:
+    """Apply a "# branch.<field> <value>" header line."""
+    _, field, value = (record.split(" ", 2) + ["", ""])[:3]
+
+    if field == "branch.oid":
+        status.oid = None if value == "(initial)" else value
+    elif field == "branch.head":
+        status.branch = None if value == "(detached)" else value
+    elif field == "branch.upstream":
+        status.upstream = value
+    elif field == "branch.ab":
+        ahead, _, behind = value.partition(" ")
+        status.ahead = int(ahead.lstrip("+") or 0)
+        status.behind = int(behind.lstrip("-") or 0)
+
+
+class LogCommit:
+    """A commit and the paths it changed, from log_changes()."""
+
+    def __init__(self, oid: str, commit_time: int, changes: List[Tuple[str, List[str]]]):
+        self.oid = oid
+        self.commit_time = commit_time  # Committer time, seconds since the epoch
+        self.changes = changes  # (status letter, paths); renames/copies list old then new
+
+
+def log_changes(cwd: Path, revision: str = "HEAD") -> List[LogCommit]:
+    """
+    Get every commit reachable from a revision with its changed paths.
+
+    Runs a single `git log --name-status -z` over the whole history, newest
+    commit first. Merge commits are listed without changes, as git log
+    reports them by default. Paths are relative to the repository root.
+
+    Args:
+        cwd: Directory inside the repository
+        revision: Revision to walk from
+
+    Returns:
+        Commits, newest first (empty if there is no history)
+
+    Raises:
+        FileNotFoundError: If git is not installed
+    """
+    result = run_git(
+        ["log", "-z", "-M", "--name-status", "--format=%x1e%H %ct", revision, "--"], cwd
+    )
+    if not result.ok:
+        return []
+
+    commits = []
+    for chunk in result.stdout.split("\x1e")[1:]:
+        header, _, body = chunk.partition("\0")
+        oid, _, commit_time = header.partition(" ")
+        fields = body.lstrip("\n").split("\0")
+
+        changes = []
+        i = 0
+        while i < len(fields) and fields[i]:
+            status = fields[i][0]
+            path_count = 2 if status in ("R", "C") else 1
+            changes.append((status, fields[i + 1:i + 1 + path_count]))
+            i += 1 + path_count
+
+        commits.append(LogCommit(oid, int(commit_time or 0), changes))
+
+    return commits
+
+
+def get_branch(cwd: Path) -> Optional[str]:
+    """
+    Get the current branch name.
+
+    Uses the status already fetched for cwd if there is one; otherwise asks
+    for the branch alone, which is cheaper than a full status.
+
+    Args:
+        cwd: Directory inside the repository
+
+    Returns:
+        Branch name, or None if detached, not a repository, or git is missing
+    """
+    try:
+        if str(cwd) in _statuses:
+            status = _statuses[str(cwd)]
+            return status.branch if status else None
+
+        result = run_git(["branch", "--show-current"], cwd)
+    except OSError:
+        return None
+
+    branch = result.stdout.strip()
+    return branch if result.ok and branch else None
+
+
+def get_head(cwd: Path) -> Optional[str]:
+    """
+    Get the commit ID of HEAD.
+
+    Args:
+        cwd: Directory inside the repository
+
+    Returns:
+        Full commit ID, or None if there are no commits, not a repository,
+        or git is missing
+    """
+    try:
+        if str(cwd) in _statuses:
+            status = _statuses[str(cwd)]
+            return status.oid if status else None
+
+        result = run_git(["rev-parse", "--verify", "--quiet", "HEAD"], cwd)
+    except OSError:
+        return None
+
+    head = result.stdout.strip()
+    return head if result.ok and head else None
+
+
+def get_prefix(cwd: Path) -> str:
+    """
+    Get a directory's path relative to the repository root.
+
+    Args:
+        cwd: Directory inside the repository
+
+    Returns:
+        "" at the root, otherwise the relative path ending in "/"
+
+    Raises:
+        FileNotFoundError: If git is not installed
+    """
+    result = run_git(["rev-parse", "--show-prefix"], cwd)
+    return result.stdout.strip() if result.ok else ""
+
+
+def memoize(project_root: Path, key: Sequence[str], compute: Callable[[], Any]) -> Any:
+    """
+    Get a git-derived value from the on-disk cache, computing it on a miss.
+
+    The key must identify everything the value depends on by immutable
+    object IDs (commit SHAs), never by ref names, so entries never go stale.
+
+    Args:
+        project_root: Project root (the cache lives in its .roadmapper/cache/git/)
+        key: Metric name followed by the commit IDs and arguments it depends on
+        compute: Computes the value; must return JSON-serializable data, or
+            None if it can't be computed (None is not cached)
+
+    Returns:
+        Cached or computed value
+    """
+    key = [str(part) for part in key]
+    try:
+        memo_dir = get_project_cache_dir(project_root) / "git"
+        memo_dir.mkdir(exist_ok=True)
+    except OSError:
+        return compute()
+
+    memo_file = memo_dir / (hashlib.sha1("\0".join(key).encode("utf-8")).hexdigest() + ".json")
+    try:
+        entry = json.loads(memo_file.read_text(encoding="utf-8"))
+        if entry.get("key") == key:
+            os.utime(memo_file)  # Mark as recently used
+            return entry["value"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    value = compute()
+    if value is None:
+        return None
+
+    try:
+        data = json.dumps({"key": key, "value": value}).encode("utf-8")
+        tmp_file = memo_file.with_suffix(".tmp")
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, memo_file)
+        _count_memo_write(memo_dir, len(data))
+    except OSError:
+        pass
+
+    return value
+
+
+def _count_memo_write(memo_dir: Path, size: int) -> None:
+    """
+    Add a write to the memo cache's size estimate, evicting once it is over the limit.
+
+    The directory is only scanned the first time a process writes to it and
+    when the estimate goes over MAX_MEMO_CACHE_BYTES (an overwritten entry is
+    counted twice, which only makes eviction come a little early).
+    """
+    total = _memo_sizes.get(str(memo_dir))
+    if total is None:
+        total = _evict_memo_entries(memo_dir, MAX_MEMO_CACHE_BYTES)
+    else:
+        total += size
+        if total > MAX_MEMO_CACHE_BYTES:
+            total = _evict_memo_entries(memo_dir, MEMO_CACHE_TRIM_BYTES)
+    _memo_sizes[str(memo_dir)] = total
+
+
+def _evict_memo_entries(memo_dir: Path, max_bytes: int) -> int:
+    """
+    Delete least recently used memo entries until the cache fits in max_bytes.
+
+    Returns:
+        Total size of the entries left
+    """
+    entries = []
+    total = 0
+    for memo_file in memo_dir.glob("*.json"):
+        try:
+            stat = memo_file.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, memo_file))
+        total += stat.st_size
+
+    if total <= max_bytes:
+        return total
+
+    for _, size, memo_file in sorted(entries):
+        try:
+            memo_file.unlink()
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+    return total
+
+
+def clear_git_cache() -> None:
+    """Forget remembered git results (e.g. after changing the repository)."""
+    _results.clear()
+    _statuses.clear()
@@ -1,12 +1,21 @@
 """Session history tracking for roadmapper."""
 
+import bisect
+import hashlib
 import json
-import subprocess
+import os
+from array import array
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from roadmapper.paths import get_project_history_file, get_project_root
+from roadmapper.git import LogCommit, get_branch, get_head, get_prefix, log_changes, memoize, run_git
+from roadmapper.paths import (
+    get_project_cache_dir,
+    get_project_history_file,
+    get_project_root,
+    list_session_files,
+)
 from roadmapper.utils import read_text_file, write_text_file
 
 
@@ -30,18 +39,7 @@ def log_session(
     history_file = get_project_history_file(project_root)
     
     # Get git branch if available
-    branch = None
-    try:
-        result = subprocess.run(
-            ["git", "branch", "--show-current"],
-            capture_output=True,
-            text=True,
-            cwd=project_root,
-        )
-        if result.returncode == 0:
-            branch = result.stdout.strip()
-    except (FileNotFoundError, Exception):
-        pass
+    branch = get_branch(project_root)
     
     # Create event record
     event = {
@@ -64,6 +62,394 @@ def log_session(
         pass
 
 
+class HistoryRecords:
+    """
+    Parsed contents of a history.jsonl file.
+    
+    Records are kept in file (chronological) order. Dates are parsed once and
+    normalized to naive datetimes: history timestamps are local wall-clock
+    times, so any timezone suffix is dropped rather than converted.
+    
+    Instances are shared between callers through the history cache and must
+    be treated as read-only.
+    """
+    
+    def __init__(self, records: List[Dict], dates: List[Optional[datetime]]):
+        self.records = records
+        self.dates = dates
+        self._timestamps = None
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    @property
+    def timestamps(self) -> array:
+        """
+        Sorted session times as a compact array of seconds.
+        
+        Built on first use and kept with the (cached) record set, so window
+        counts and histograms are bisections rather than per-record loops.
+        """
+        if self._timestamps is None:
+            self._timestamps = array("d", sorted(_to_timestamp(d) for d in self.dates if d is not None))
+        return self._timestamps
+    
+    def count_since(self, when: datetime) -> int:
+        """Count sessions dated at or after `when` (naive local time)."""
+        timestamps = self.timestamps
+        return len(timestamps) - bisect.bisect_left(timestamps, _to_timestamp(when))
+    
+    def weekly_counts(self, weeks: int, now: Optional[datetime] = None) -> List[int]:
+        """
+        Count sessions per week for the last `weeks` weeks.
+        
+        Args:
+            weeks: Number of weeks to report
+            now: End of the last week (defaults to the current time)
+        
+        Returns:
+            Session counts per week, oldest week first
+        """
+        if now is None:
+            now = datetime.now()
+        
+        timestamps = self.timestamps
+        end = _to_timestamp(now)
+        bounds = [
+            bisect.bisect_left(timestamps, end - (weeks - i) * _SECONDS_PER_WEEK)
+            for i in range(weeks)
+        ]
+        bounds.append(bisect.bisect_left(timestamps, end))
+        return [bounds[i + 1] - bounds[i] for i in range(weeks)]
+
+
+# Parsed history per file: path -> ((mtime_ns, size), HistoryRecords)
+_history_cache: Dict[str, Tuple[Tuple[int, int], HistoryRecords]] = {}
+
+# Sidecar date index for --since queries: one (timestamp, offset) sample per stride lines
+_INDEX_VERSION = 1
+_INDEX_STRIDE = 256
+_INDEX_TAIL_BYTES = 4096
+
+_EPOCH = datetime(1970, 1, 1)
+_SECONDS_PER_WEEK = 7 * 24 * 3600
+
+
+def parse_history_date(date_str: str) -> Optional[datetime]:
+    """
+    Parse a history record date into a naive datetime.
+    
+    Args:
+        date_str: ISO 8601 date string (e.g. "2025-11-04T07:17:36.323083Z")
+    
+    Returns:
+        Naive datetime, or None if the date can't be parsed
+    """
+    try:
+        record_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return record_date.replace(tzinfo=None)
+
+
+def load_history(project_root: Optional[Path] = None) -> HistoryRecords:
+    """
+    Load parsed session history, reusing the cached copy when possible.
+    
+    The cache is keyed on the history file path plus its mtime and size, so
+    each file is read and parsed at most once until it changes.
+    
+    Args:
+        project_root: Project root directory (searches from cwd if None)
+    
+    Returns:
+        HistoryRecords in chronological order (empty if no history)
+    """
+    history_file = _find_history_file(project_root)
+    if history_file is None:
+        return HistoryRecords([], [])
+    
+    try:
+        stat = history_file.stat()
+    except OSError:
+        return HistoryRecords([], [])
+    
+    cache_key = str(history_file)
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+    cached = _history_cache.get(cache_key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    
+    records = []
+    dates = []
+    try:
+        content = read_text_file(history_file)
+    except (OSError, UnicodeDecodeError):
+        return HistoryRecords([], [])
+    
+    for line in content.split("\n"):
+        record = _parse_history_line(line)
+        if record is None:
+            continue
+        records.append(record)
+        dates.append(parse_history_date(record.get("date")))
+    
+    history = HistoryRecords(records, dates)
+    _history_cache[cache_key] = (fingerprint, history)
+    return history
+
+
+def _find_history_file(project_root: Optional[Path]) -> Optional[Path]:
+    """Resolve a project's history file (None when not in a project)."""
+    if project_root is None:
+        project_root = get_project_root()
+    
+    if project_root is None:
+        return None
+    
+    return get_project_history_file(project_root)
+
+
+def _get_cached_history(history_file: Path) -> Optional[HistoryRecords]:
+    """Return cached history if it is still current, without reading the file."""
+    cached = _history_cache.get(str(history_file))
+    if cached is None:
+        return None
+    
+    try:
+        stat = history_file.stat()
+    except OSError:
+        return None
+    
+    if cached[0] != (stat.st_mtime_ns, stat.st_size):
+        return None
+    return cached[1]
+
+
+def _parse_history_line(line: str) -> Optional[Dict]:
+    """Parse one JSONL line into a record (None for blank or invalid lines)."""
+    if not line.strip():
+        return None
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _iter_lines_reversed(file_path: Path, block_size: int = 8192) -> Iterator[str]:
+    """
+    Yield a file's lines from last to first.
+    
+    Reads fixed-size blocks backwards from the end of the file, so only as
+    much of the file is read as the caller consumes.
+    """
+    with file_path.open("rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # First piece may be the tail of a line that starts in an earlier block
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                yield line.decode("utf-8", errors="replace")
+        
+        yield remainder.decode("utf-8", errors="replace")
+
+
+def _read_history_tail(history_file: Path, limit: int) -> List[Dict]:
+    """Read the last `limit` valid records of a history file (most recent first)."""
+    records = []
+    
+    try:
+        for line in _iter_lines_reversed(history_file):
+            record = _parse_history_line(line)
+            if record is None:
+                continue
+            records.append(record)
+            if len(records) >= limit:
+                break
+    except OSError:
+        return []
+    
+    return records
+
+
+def _to_timestamp(record_date: datetime) -> float:
+    """Convert a naive history datetime to seconds on a fixed (UTC-like) scale."""
+    return (record_date - _EPOCH).total_seconds()
+
+
+def _get_history_index_file(history_file: Path) -> Path:
+    """Get path to the sidecar date index for a history file."""
+    return get_project_cache_dir(history_file.parent.parent) / "history_index.json"
+
+
+def _load_history_index(history_file: Path) -> Optional[Dict]:
+    """
+    Load the sidecar date index for a history file, extending it if needed.
+    
+    The index samples (timestamp, byte offset) for every _INDEX_STRIDE-th
+    line. History is append-only, so when the file has grown only the new
+    lines are scanned, after checking that the indexed prefix is unchanged;
+    a file that shrank or was rewritten is re-indexed from scratch. Every
+    scanned line's date is compared against the latest date seen so far, so
+    "ordered" is only true while the whole file is in chronological order
+    (merged-in history from another machine usually isn't).
+    
+    Returns:
+        Index dictionary, or None if the file can't be indexed
+    """
+    try:
+        size = history_file.stat().st_size
+    except OSError:
+        return None
+    
+    index_file = _get_history_index_file(history_file)
+    index = None
+    if index_file.exists():
+        try:
+            index = json.loads(read_text_file(index_file))
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            index = None
+    
+    if (
+        not index
+        or index.get("version") != _INDEX_VERSION
+        or index.get("stride") != _INDEX_STRIDE
+        or index["end"] > size
+        or index.get("tail") != _hash_history_tail(history_file, index["end"])
+    ):
+        index = {
+            "version": _INDEX_VERSION,
+            "stride": _INDEX_STRIDE,
+            "end": 0,  # Byte offset just past the last indexed line
+            "tail": "",  # Hash of the indexed bytes just before "end"
+            "lines": 0,  # Lines indexed so far
+            "ordered": True,  # False once any dated line is older than one before it
+            "latest": None,  # Latest timestamp of the indexed lines
+            "pending": True,  # Waiting for a parseable line to sample
+            "samples": [],
+        }
+    
+    if index["end"] == size:
+        return index
+    
+    samples = index["samples"]
+    try:
+        with history_file.open("rb") as f:
+            f.seek(index["end"])
+            offset = index["end"]
+            pending = index["pending"]
+            latest = index["latest"]
+            for raw_line in f:
+                if not raw_line.endswith(b"\n"):
+                    break  # Partial last line - index it once it is complete
+                line_offset = offset
+                offset += len(raw_line)
+                index["lines"] += 1
+                if index["lines"] % _INDEX_STRIDE == 1:
+                    pending = True
+                
+                record = _parse_history_line(raw_line.decode("utf-8", errors="replace"))
+                record_date = parse_history_date(record.get("date")) if record else None
+                if record_date is None:
+                    continue  # Sample the next parseable line instead
+                
+                timestamp = _to_timestamp(record_date)
+                if latest is not None and timestamp < latest:
+                    index["ordered"] = False
+                latest = timestamp if latest is None else max(latest, timestamp)
+                if pending:
+                    samples.append([timestamp, line_offset])
+                    pending = False
+            index["end"] = offset
+            index["pending"] = pending
+            index["latest"] = latest
+    except OSError:
+        return None
+    
+    index["tail"] = _hash_history_tail(history_file, index["end"])
+    try:
+        index_file.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    except OSError:
+        pass  # Index is still usable for this call
+    
+    return index
+
+
+def _hash_history_tail(history_file: Path, end: int) -> str:
+    """Hash the bytes of a history file just before `end` (detects a rewritten prefix)."""
+    start = max(0, end - _INDEX_TAIL_BYTES)
+    try:
+        with history_file.open("rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+    except OSError:
+        return ""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _load_history_since(history_file: Path, since: datetime) -> HistoryRecords:
+    """
+    Load only the records dated at or after `since`.
+    
+    Uses the cached full history when it is current. Otherwise bisects the
+    sidecar date index to the last sample before `since` and parses the file
+    only from that byte offset on. Falls back to filtering the full history
+    if the file is not in chronological order.
+    """
+    since = since.replace(tzinfo=None)
+    
+    history = _get_cached_history(history_file)
+    if history is None:
+        index = _load_history_index(history_file)
+        if index is None or not index["ordered"]:
+            history = load_history(history_file.parent.parent)
+        else:
+            samples = index["samples"]
+            position = bisect.bisect_left([sample[0] for sample in samples], _to_timestamp(since))
+            start = samples[position - 1][1] if position > 0 else 0
+            history = _read_history_from(history_file, start)
+    
+    records = []
+    dates = []
+    for record, record_date in zip(history.records, history.dates):
+        if record_date is not None and record_date >= since:
+            records.append(record)
+            dates.append(record_date)
+    return HistoryRecords(records, dates)
+
+
+def _read_history_from(history_file: Path, offset: int) -> HistoryRecords:
+    """Parse history records starting at a byte offset (must be a line start)."""
+    records = []
+    dates = []
+    
+    try:
+        with history_file.open("rb") as f:
+            f.seek(offset)
+            for raw_line in f:
+                record = _parse_history_line(raw_line.decode("utf-8", errors="replace"))
+                if record is None:
+                    continue
+                records.append(record)
+                dates.append(parse_history_date(record.get("date")))
+    except OSError:
+        return HistoryRecords([], [])
+    
+    return HistoryRecords(records, dates)
+
+
+def clear_history_cache() -> None:
+    """Forget all cached history (e.g. for long-running processes)."""
+    _history_cache.clear()
+
+
 def read_history(
     project_root: Optional[Path] = None,
     limit: Optional[int] = None,
@@ -80,49 +466,29 @@ def read_history(
     Returns:
         List of history records (most recent first)
     """
-    if project_root is None:
-        project_root = get_project_root()
+    if limit and not since:
+        # Recent records only: seek from the end unless the full history is already cached
+        history_file = _find_history_file(project_root)
+        if history_file is None or not history_file.exists():
+            return []
+        if _get_cached_history(history_file) is None:
+            return _read_history_tail(history_file, limit)
     
-    if project_root is None:
-        return []
+    if since:
+        history_file = _find_history_file(project_root)
+        if history_file is None or not history_file.exists():
+            return []
+        records = list(_load_history_since(history_file, since).records)
+    else:
+        records = list(load_history(project_root).records)
     
-    history_file = get_project_history_file(project_root)
+    # Reverse to get most recent first
+    records.reverse()
     
-    if not history_file.exists():
-        return []
+    if limit:
+        records = records[:limit]
     
-    try:
-        content = read_text_file(history_file)
-        records = []
-        for line in content.strip().split("\n"):
-            if not line.strip():
-                continue
-            try:
-                record = json.loads(line)
-                # Filter by date if specified
-                if since:
-                    record_date_str = record["date"].replace("Z", "+00:00")
-                    record_date = datetime.fromisoformat(record_date_str)
-                    # Make both timezone-aware or both naive for comparison
-                    if record_date.tzinfo is None and since.tzinfo is not None:
-                        record_date = record_date.replace(tzinfo=since.tzinfo)
-                    elif record_date.tzinfo is not None and since.tzinfo is None:
-                        since = since.replace(tzinfo=record_date.tzinfo)
-                    if record_date < since:
-                        continue
-                records.append(record)
-            except (json.JSONDecodeError, KeyError):
-                continue
-        
-        # Reverse to get most recent first
-        records.reverse()
-        
-        if limit:
-            records = records[:limit]
-        
-        return records
-    except Exception:
-        return []
+    return records
 
 
 def get_session_stats(
@@ -139,9 +505,9 @@ def get_session_stats(
     Returns:
         Dictionary with statistics
     """
-    records = read_history(project_root=project_root, since=since)
+    history = _load_stats_history(project_root, since)
     
-    if not records:
+    if not history:
         return {
             "total_sessions": 0,
             "sessions_last_7_days": 0,
@@ -149,44 +515,16 @@ def get_session_stats(
             "avg_sessions_per_week": 0.0,
         }
     
-    total = len(records)
+    total = len(history)
     
     # Count sessions in last 7 and 30 days
     now = datetime.now()
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
-    last_7_days = 0
-    last_30_days = 0
+    last_7_days = history.count_since(now - timedelta(days=7))
+    last_30_days = history.count_since(now - timedelta(days=30))
     
-    for record in records:
-        try:
-            record_date_str = record["date"].replace("Z", "+00:00")
-            record_date = datetime.fromisoformat(record_date_str)
-            # Make timezone-aware if needed for comparison
-            if record_date.tzinfo is None:
-                record_date = record_date.replace(tzinfo=now.tzinfo if now.tzinfo else None)
-            if record_date.tzinfo and now.tzinfo is None:
-                now = now.replace(tzinfo=record_date.tzinfo)
-                week_ago = week_ago.replace(tzinfo=record_date.tzinfo)
-                month_ago = month_ago.replace(tzinfo=record_date.tzinfo)
-            if record_date >= week_ago:
-                last_7_days += 1
-            if record_date >= month_ago:
-                last_30_days += 1
-        except (ValueError, KeyError):
-            continue
-    
-    # Calculate average sessions per week
-    if records:
-        first_date_str = records[-1]["date"].replace("Z", "+00:00")
-        first_date = datetime.fromisoformat(first_date_str)
-        # Make timezone-aware if needed
-        if first_date.tzinfo is None and now.tzinfo is not None:
-            first_date = first_date.replace(tzinfo=now.tzinfo)
-        elif first_date.tzinfo is not None and now.tzinfo is None:
-            now = now.replace(tzinfo=first_date.tzinfo)
-        days_span = (now - first_date).days
+    # Calculate average sessions per week (from the oldest record)
+    if history.timestamps:
+        days_span = int((_to_timestamp(now) - history.timestamps[0]) // 86400)
         if days_span > 0:
             avg_per_week = (total / days_span) * 7
         else:
@@ -202,6 +540,34 @@ def get_session_stats(
     }
 
 
+def get_weekly_session_counts(
+    project_root: Optional[Path] = None,
+    weeks: int = 8,
+) -> List[int]:
+    """
+    Get a per-week session histogram.
+    
+    Args:
+        project_root: Project root directory (searches from cwd if None)
+        weeks: Number of weeks to report (default: 8)
+    
+    Returns:
+        Session counts per week, oldest week first
+    """
+    return load_history(project_root).weekly_counts(weeks)
+
+
+def _load_stats_history(project_root: Optional[Path], since: Optional[datetime]) -> HistoryRecords:
+    """Load the record set statistics are computed over."""
+    if since is None:
+        return load_history(project_root)
+    
+    history_file = _find_history_file(project_root)
+    if history_file is None or not history_file.exists():
+        return HistoryRecords([], [])
+    return _load_history_since(history_file, since)
+
+
 def get_files_changed_for_session(
     session_file: Path,
     project_root: Optional[Path] = None,
@@ -222,36 +588,183 @@ def get_files_changed_for_session(
     if project_root is None:
         return 0
     
+    # History results depend only on commit IDs, so they are memoized on disk
+    head = get_head(project_root)
+    if head is None:
+        return 0
+    
     try:
-        # Get file creation time from git or filesystem
-        result = subprocess.run(
-            ["git", "log", "--follow", "--format=%H", "--", str(session_file)],
-            capture_output=True,
-            text=True,
-            cwd=project_root,
+        # Commit that first added this file (as of HEAD)
+        first_commit = memoize(
+            project_root,
+            ["first-commit", head, str(session_file)],
+            lambda: _find_first_commit(session_file, project_root),
         )
-        
-        if result.returncode != 0:
-            return 0
-        
-        commits = result.stdout.strip().split("\n")
-        if not commits:
+        if not first_commit:
             return 0
         
         # Get files changed since first commit that added this file
-        first_commit = commits[-1]
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "--diff-filter=ACMR", f"{first_commit}^..HEAD"],
-            capture_output=True,
-            text=True,
-            cwd=project_root,
+        files_changed = memoize(
+            project_root,
+            ["files-changed", first_commit, head],
+            lambda: _count_files_changed(f"{first_commit}^..{head}", project_root),
         )
-        
-        if result.returncode == 0:
-            files = [f for f in result.stdout.strip().split("\n") if f]
-            return len(files)
+        return files_changed or 0
     except (FileNotFoundError, Exception):
-        pass
+        return 0
+
+
+def _find_first_commit(session_file: Path, project_root: Path) -> Optional[str]:
+    """Find the oldest commit touching a file ("" if never committed, None on failure)."""
+    result = run_git(["log", "--follow", "--format=%H", "--", str(session_file)], project_root)
+    if not result.ok:
+        return None
+    
+    commits = result.stdout.strip().split("\n")
+    return commits[-1]
+
+
+def _count_files_changed(revision_range: str, project_root: Path) -> Optional[int]:
+    """Count files added, copied, modified or renamed in a revision range, or None on failure."""
+    result = run_git(["diff", "--name-only", "--diff-filter=ACMR", revision_range], project_root)
+    if not result.ok:
+        return None
+    
+    return len([f for f in result.stdout.strip().split("\n") if f])
+
+
+def get_files_changed_for_sessions(
+    session_files: Optional[List[Path]] = None,
+    project_root: Optional[Path] = None,
+) -> Dict[Path, int]:
+    """
+    Get the number of files changed since each session started, in one git pass.
+    
+    Counts like get_files_changed_for_session(), but reads history with a
+    single `git log` instead of two git processes per session. A session
+    starts at the oldest commit touching its file (following renames); a file
+    counts if it was added, copied, modified or renamed from that commit on
+    and still exists at HEAD. Unlike the per-session call, a session file that
+    was never committed still gets a count: its window starts at the first
+    commit made after its history.jsonl date.
+    
+    Args:
+        session_files: Session files to report on (defaults to all current
+            and archived session files)
+        project_root: Project root directory (searches from cwd if None)
     
-    return 0
+    Returns:
+        Mapping of session file to number of files changed (0 if unknown)
+    """
+    if project_root is None:
+        project_root = get_project_root()
+    
+    if session_files is None:
+        session_files = list_session_files(project_root) if project_root else []
+    
+    counts = {session_file: 0 for session_file in session_files}
+    if project_root is None or not session_files:
+        return counts
+    
+    try:
+        commits = log_changes(project_root)
+        prefix = get_prefix(project_root)
+    except OSError:
+        return counts
+    
+    if not commits:
+        return counts
+    
+    # Where each session's window starts (index into commits, newest first)
+    oldest_changes = _index_oldest_changes(commits)
+    session_dates = None
+    starts = []
+    for session_file in session_files:
+        try:
+            rel_path = prefix + session_file.resolve().relative_to(project_root.resolve()).as_posix()
+        except ValueError:
+            continue
+        
+        start = _find_first_commit_index(oldest_changes, rel_path)
+        if start is None:
+            # Not committed yet: fall back to when the session was logged
+            if session_dates is None:
+                session_dates = _get_session_dates(project_root)
+            start = _find_commit_index_since(commits, session_dates.get(session_file.name))
+        if start is not None:
+            starts.append((start, session_file))
+    
+    # Walk newest to oldest: a path's newest change decides whether it exists at HEAD
+    starts.sort(key=lambda item: item[0])
+    seen = set()
+    present = set()
+    pending = 0
+    for index, commit in enumerate(commits):
+        if pending == len(starts):
+            break
+        
+        for status, paths in commit.changes:
+            if status == "R" and paths[0] not in seen:
+                seen.add(paths[0])  # Renamed away
+            path = paths[-1]
+            if path not in seen:
+                seen.add(path)
+                if status in ("A", "C", "M", "R"):
+                    present.add(path)
+        
+        while pending < len(starts) and starts[pending][0] == index:
+            counts[starts[pending][1]] = len(present)
+            pending += 1
+    
+    return counts
+
+
+def _index_oldest_changes(commits: List[LogCommit]) -> Dict[str, Tuple[int, str, List[str]]]:
+    """Map each path to its oldest change: (commit index, status, paths)."""
+    oldest = {}
+    for index, commit in enumerate(commits):
+        for status, paths in commit.changes:
+            for path in paths:
+                oldest[path] = (index, status, paths)
+    return oldest
 
+
+def _find_first_commit_index(
+    oldest_changes: Dict[str, Tuple[int, str, List[str]]],
+    rel_path: str,
+) -> Optional[int]:
+    """Find the index of the oldest commit touching a path, following renames (like git log --follow)."""
+    change = oldest_changes.get(rel_path)
+    first = None
+    while change is not None and (first is None or change[0] >= first):
+        index, status, paths = change
+        first = index
+        if status != "R" or paths[-1] != rel_path:
+            break
+        rel_path = paths[0]  # Continue with the name it was renamed from
+        change = oldest_changes.get(rel_path)
+    return first
+
+
+def _get_session_dates(project_root: Path) -> Dict[str, datetime]:
+    """Map session file names to their earliest history.jsonl date."""
+    history = load_history(project_root)
+    dates = {}
+    for record, record_date in zip(history.records, history.dates):
+        name = record.get("file")
+        if name and record_date is not None and (name not in dates or record_date < dates[name]):
+            dates[name] = record_date
+    return dates
+
+
+def _find_commit_index_since(commits: List[LogCommit], since: Optional[datetime]) -> Optional[int]:
+    """Find the index of the oldest commit made at or after a (naive local) time."""
+    if since is None:
+        return None
+    
+    found = None
+    for index, commit in enumerate(commits):
+        if datetime.fromtimestamp(commit.commit_time) < since:
+            break
+        found = index
+    return found
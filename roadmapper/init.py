@@ -1,10 +1,10 @@
 """Project initialization functionality."""
 
 import os
-import subprocess
 from pathlib import Path
 from typing import Optional
 
+from roadmapper.git import get_status, run_git
 from roadmapper.templates import get_template
 from roadmapper.utils import write_text_file
 from roadmapper.projects import register_project
@@ -51,20 +51,15 @@ def init_project(template: str = "default", init_git: bool = True) -> None:
     # Initialize git if requested and not already a git repo
     if init_git:
         try:
-            result = subprocess.run(
-                ["git", "status"],
-                capture_output=True,
-                text=True,
-                cwd=cwd,
-            )
-            if result.returncode != 0:
+            if get_status(cwd) is None:
                 # Not a git repo, initialize it
-                subprocess.run(["git", "init"], cwd=cwd, check=True)
-                print("✅ Git repository initialized")
+                result = run_git(["init"], cwd, cache=False)
+                if result.ok:
+                    print("✅ Git repository initialized")
+                else:
+                    print("⚠️  Error initializing git repository")
         except FileNotFoundError:
             print("⚠️  Git not found, skipping git initialization")
-        except subprocess.CalledProcessError:
-            print("⚠️  Error checking git status, skipping git initialization")
     
     # Automatically register this project in the registry
     try:
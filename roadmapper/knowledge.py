@@ -1,19 +1,69 @@
 """Knowledge base extraction and query system."""
 
+import hashlib
 import json
-import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 
-from roadmapper.projects import get_all_projects
-from roadmapper.utils import read_text_file
-from roadmapper.paths import get_global_config_dir
+from roadmapper import session_cache
+from roadmapper import session_grammar as grammar
+from roadmapper.config import DEFAULT_CONFIG, get_config_value, get_storage_backend
+from roadmapper.knowledge_db import KnowledgeDatabase
+from roadmapper.knowledge_entry import compute_entry_id
+from roadmapper.knowledge_log import KnowledgeLog
+from roadmapper.projects import load_projects_registry
+from roadmapper.session_parser import SessionDocument
+from roadmapper.utils import read_text_file, write_text_file
+from roadmapper.paths import get_global_config_dir, list_session_files
+
+
+# Bump when manifest layout changes (forces a full reindex)
+MANIFEST_VERSION = 1
+
+
+_knowledge_databases: Dict[str, KnowledgeDatabase] = {}
+
+
+def get_knowledge_backend() -> str:
+    """Get the knowledge storage backend ("json" or "sqlite") from storage.knowledge."""
+    return get_storage_backend("knowledge")
 
 
 def get_knowledge_file() -> Path:
-    """Get path to knowledge base file (~/.roadmapper/knowledge.json)."""
-    return get_global_config_dir() / "knowledge.json"
+    """Get path to the knowledge store (~/.roadmapper/knowledge.db or the ~/.roadmapper/knowledge/ log)."""
+    if get_knowledge_backend() == "sqlite":
+        return get_global_config_dir() / "knowledge.db"
+    return get_global_config_dir() / "knowledge"
+
+
+def get_knowledge_database() -> KnowledgeDatabase:
+    """Open the SQLite knowledge store, migrating knowledge.json into it on first use."""
+    db_file = get_global_config_dir() / "knowledge.db"
+    database = _knowledge_databases.get(str(db_file))
+    if database is None or not db_file.exists():
+        database = KnowledgeDatabase.open(db_file, get_global_config_dir() / "knowledge.json")
+        _knowledge_databases[str(db_file)] = database
+    return database
+
+
+def get_knowledge_log() -> KnowledgeLog:
+    """
+    Open the append-only knowledge log, migrating knowledge.json into it on first use.
+    
+    Writers in several processes (e.g. `roadmapper watch` and a foreground
+    `roadmapper index`) are serialized by the log's file lock, and each
+    re-reads the manifest once it holds the lock, so no process overwrites
+    another's appends.
+    """
+    return KnowledgeLog.open(get_global_config_dir() / "knowledge", get_global_config_dir() / "knowledge.json")
+
+
+def _get_knowledge_store() -> Union[KnowledgeDatabase, KnowledgeLog]:
+    """Open the configured knowledge store."""
+    if get_knowledge_backend() == "sqlite":
+        return get_knowledge_database()
+    return get_knowledge_log()
 
 
 def load_knowledge() -> List[Dict]:
@@ -23,29 +73,91 @@ def load_knowledge() -> List[Dict]:
     Returns:
         List of knowledge entries
     """
-    knowledge_file = get_knowledge_file()
+    if get_knowledge_backend() == "sqlite":
+        return get_knowledge_database().load()
     
-    if not knowledge_file.exists():
-        return []
-    
-    try:
-        content = read_text_file(knowledge_file)
-        return json.loads(content)
-    except (json.JSONDecodeError, IOError):
-        return []
+    return get_knowledge_log().load()
 
 
 def save_knowledge(knowledge: List[Dict]) -> None:
     """
-    Save knowledge base to disk.
+    Replace the whole knowledge base.
+    
+    Index runs append to the knowledge base instead (see index_all_projects).
     
     Args:
         knowledge: List of knowledge entries
     """
-    knowledge_file = get_knowledge_file()
-    content = json.dumps(knowledge, indent=2, sort_keys=True)
-    knowledge_file.parent.mkdir(parents=True, exist_ok=True)
-    knowledge_file.write_text(content, encoding='utf-8')
+    if get_knowledge_backend() == "sqlite":
+        get_knowledge_database().replace_all(knowledge)
+        return
+    
+    get_knowledge_log().replace_all(knowledge)
+
+
+def compact_knowledge(only_if_needed: bool = False) -> Optional[Tuple[int, int]]:
+    """
+    Compact the knowledge store.
+    
+    Rewrites the live entries of the knowledge log into one segment,
+    dropping replaced entries and tombstones. With the SQLite store, the
+    full-text index is merged and the database file is vacuumed.
+    
+    Args:
+        only_if_needed: Only compact a log that is mostly dead records
+    
+    Returns:
+        Tuple of (records before, entries after), or None if compaction
+        wasn't needed
+    """
+    if get_knowledge_backend() == "sqlite":
+        return None if only_if_needed else get_knowledge_database().compact()
+    
+    log = get_knowledge_log()
+    if only_if_needed and not log.needs_compaction():
+        return None
+    return log.compact()
+
+
+def get_knowledge_manifest_file() -> Path:
+    """Get path to knowledge manifest file (~/.roadmapper/knowledge_manifest.json)."""
+    return get_global_config_dir() / "knowledge_manifest.json"
+
+
+def load_knowledge_manifest() -> Dict:
+    """
+    Load the knowledge manifest from disk.
+    
+    The manifest fingerprints every indexed session file (mtime, size,
+    content hash) so reindexing can skip files that haven't changed, and
+    names the store ("store_id") those files were indexed into.
+    
+    Returns:
+        Manifest dictionary with a "files" mapping of path to fingerprint
+    """
+    manifest_file = get_knowledge_manifest_file()
+    
+    if manifest_file.exists():
+        try:
+            manifest = json.loads(read_text_file(manifest_file))
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (json.JSONDecodeError, IOError):
+            pass
+    
+    return {"version": MANIFEST_VERSION, "files": {}}
+
+
+def save_knowledge_manifest(manifest: Dict) -> None:
+    """
+    Save the knowledge manifest to disk.
+    
+    Args:
+        manifest: Manifest dictionary
+    """
+    manifest_file = get_knowledge_manifest_file()
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    write_text_file(manifest_file, json.dumps(manifest, separators=(",", ":")))
 
 
 def extract_knowledge_from_session(session_file: Path, project_path: Path, project_name: str) -> List[Dict]:
@@ -63,41 +175,15 @@ def extract_knowledge_from_session(session_file: Path, project_path: Path, proje
     knowledge_entries = []
     
     try:
-        content = read_text_file(session_file)
-        
-        # Extract from "Discoveries" section
-        discoveries = _extract_section(content, "Discoveries")
-        if discoveries:
-            for discovery in discoveries:
-                knowledge_entries.append({
-                    "type": "discovery",
-                    "content": discovery,
-                    "project": project_name,
-                    "project_path": str(project_path),
-                    "session_file": session_file.name,
-                    "extracted_at": datetime.now().isoformat(),
-                })
-        
-        # Extract from "Session Accomplishments" -> "Completed"
-        accomplishments = _extract_accomplishments(content)
-        if accomplishments:
-            for accomplishment in accomplishments:
-                knowledge_entries.append({
-                    "type": "accomplishment",
-                    "content": accomplishment,
-                    "project": project_name,
-                    "project_path": str(project_path),
-                    "session_file": session_file.name,
-                    "extracted_at": datetime.now().isoformat(),
-                })
+        # Parsed once per content version (see session_cache)
+        extracted = session_cache.get_parsed(session_file, "knowledge", _extract_knowledge)
         
-        # Extract from "Work Log" - look for key insights
-        insights = _extract_insights(content)
-        if insights:
-            for insight in insights:
+        for entry_type, contents in extracted:
+            for content in contents:
                 knowledge_entries.append({
-                    "type": "insight",
-                    "content": insight,
+                    "id": compute_entry_id(content, str(project_path), session_file.name),
+                    "type": entry_type,
+                    "content": content,
                     "project": project_name,
                     "project_path": str(project_path),
                     "session_file": session_file.name,
@@ -110,74 +196,87 @@ def extract_knowledge_from_session(session_file: Path, project_path: Path, proje
     return knowledge_entries
 
 
-def _extract_section(content: str, section_name: str) -> List[str]:
+def _extract_knowledge(document: SessionDocument) -> List[List]:
+    """Extract knowledge items from a parsed session file as [type, items] pairs."""
+    return [
+        # From "Discoveries" section
+        ["discovery", _extract_section(document, "Discoveries")],
+        # From "Session Accomplishments" -> "Completed"
+        ["accomplishment", _extract_accomplishments(document)],
+        # From "Work Log" - key insights
+        ["insight", _extract_insights(document)],
+    ]
+
+
+def _extract_section(document: SessionDocument, section_name: str) -> List[str]:
     """Extract items from a markdown section."""
     # Look for section header
-    pattern = rf"##\s*{section_name}.*?\n(.*?)(?=\n##|\Z)"
-    match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+    section = document.find_section(grammar.heading_pattern(section_name))
     
-    if not match:
+    if section is None:
         return []
     
-    section_content = match.group(1)
-    
-    # Extract list items
+    # Extract list items (- item or * item)
     items = []
-    for line in section_content.split("\n"):
-        line = line.strip()
-        # Match markdown list items: - item or * item
-        if re.match(r"^[-*]\s+(.+)$", line):
-            item = re.match(r"^[-*]\s+(.+)$", line).group(1).strip()
-            if item and len(item) > 10:  # Filter out very short items
-                items.append(item)
+    for list_item in section.items:
+        item = list_item.text
+        if item and len(item) > 10:  # Filter out very short items
+            items.append(item)
     
     return items
 
 
-def _extract_accomplishments(content: str) -> List[str]:
+def _extract_accomplishments(document: SessionDocument) -> List[str]:
     """Extract accomplishments from session file."""
-    # Look for "Session Accomplishments" -> "Completed"
-    pattern = r"##\s*✅\s*Session Accomplishments.*?\n\*\*Completed:\*\*\s*\n(.*?)(?=\n\*\*|\n##|\Z)"
-    match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+    # Look for "Session Accomplishments" -> "**Completed:**"
+    section = document.find_section(grammar.ACCOMPLISHMENTS_HEADING)
+    if section is None:
+        return []
     
-    if not match:
+    lines = document.lines
+    label_line, _ = document.find_line(grammar.COMPLETED_BOLD_LABEL, section.line + 1)
+    if label_line == -1 or label_line == len(lines) - 1:
         return []
     
-    completed_section = match.group(1)
+    # The list starts at the first non-blank line after the label and runs
+    # until the next "**" label or "##" heading
+    start = label_line + 1
+    while start < len(lines) and not lines[start].strip():
+        start += 1
+    
     items = []
     
-    for line in completed_section.split("\n"):
+    for line_num in range(start, len(lines)):
+        line = lines[line_num]
+        if line_num > start and line.startswith(("**", "##")):
+            break
         line = line.strip()
         # Match checkmark items: - [x] or - ✅
-        if re.match(r"^-\s*(\[x\]|✅)\s+(.+)$", line, re.IGNORECASE):
-            item = re.match(r"^-\s*(\[x\]|✅)\s+(.+)$", line, re.IGNORECASE).group(2).strip()
+        item_match = grammar.CHECKBOX_LINE.match(line)
+        if item_match:
+            item = item_match.group(2).strip()
             if item and len(item) > 10:
                 items.append(item)
     
     return items
 
 
-def _extract_insights(content: str) -> List[str]:
+def _extract_insights(document: SessionDocument) -> List[str]:
     """Extract key insights from work log section."""
     # Look for work log and extract notable findings
-    pattern = r"##\s*🔧\s*Work Log.*?\n(.*?)(?=\n##|\Z)"
-    match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+    section = document.find_section(grammar.WORK_LOG_HEADING)
     
-    if not match:
+    if section is None:
         return []
     
-    work_log = match.group(1)
+    work_log = section.content
     insights = []
     
     # Look for patterns that indicate insights:
     # - "Learn:", "Learned:", "Discovery:", "Found:", "Key insight:"
-    insight_patterns = [
-        r"(?:Learn|Learned|Discovery|Found|Key insight|Insight|Important|Note|Remember):\s*(.+?)(?:\n|$)",
-        r"\*\*(.+?)\*\*:\s*(.+?)(?:\n|$)",  # Bold headers followed by content
-    ]
-    
-    for pattern in insight_patterns:
-        matches = re.finditer(pattern, work_log, re.IGNORECASE | re.MULTILINE)
+    # - Bold headers followed by content
+    for pattern in grammar.INSIGHT_PATTERNS:
+        matches = pattern.finditer(work_log)
         for match in matches:
             insight = match.group(1).strip()
             if len(insight) > 20:  # Filter short items
@@ -186,75 +285,238 @@ def _extract_insights(content: str) -> List[str]:
     return insights[:5]  # Limit to top 5 insights per session
 
 
-def index_all_projects() -> int:
+def index_all_projects(project_paths: Optional[Iterable[Path]] = None) -> int:
     """
     Extract knowledge from all registered projects.
     
-    Returns:
-        Number of new knowledge entries added
-    """
-    projects = get_all_projects()
-    existing_knowledge = load_knowledge()
+    Only session files that are new or changed since the last run (per the
+    knowledge manifest) are re-extracted. Entries from session files that no
+    longer exist are dropped. Changes are appended to the knowledge log
+    rather than rewriting it. Entries are deduplicated by id against the
+    store's id index, so an entry is stored once however often it is
+    re-extracted. When nothing changed, no entries are read or written.
     
-    # Create set of existing entries (by content hash)
-    existing_hashes = {_hash_entry(e) for e in existing_knowledge}
+    The manifest records the id of the store it was built against. If the
+    configured store is another one (storage.knowledge was switched, or the
+    store was deleted and recreated), every project is rescanned and every
+    source in the store is rebuilt.
     
-    new_entries = []
+    Args:
+        project_paths: Only scan these registered projects for changed
+            session files (defaults to all of them)
     
-    for project_info in projects:
-        project_path = Path(project_info["path"])
-        project_name = project_info.get("name", project_path.name)
+    Returns:
+        Number of new knowledge entries added
+    """
+    registry = load_projects_registry()
+    store = _get_knowledge_store()
+    manifest = load_knowledge_manifest()
+    
+    # Sources are (project_path, session file name) - the granularity entries record
+    dirty_sources = set()
+    scanned_projects = set()
+    seen_files = set()
+    only_projects = {str(path) for path in project_paths} if project_paths is not None else None
+    
+    manifest_changed = False
+    if manifest.get("store_id") != store.store_id:
+        # The manifest describes another store - rebuild everything in this one
+        manifest = {"version": MANIFEST_VERSION, "store_id": store.store_id, "files": {}}
+        manifest_changed = True
+        dirty_sources |= {
+            (project_path, session_file) for project_path, session_file in store.sources()
+            # Keep the knowledge of projects that may be on an unmounted drive
+            if project_path not in registry or Path(project_path).exists()
+        }
+        only_projects = None
+    files = manifest["files"]
+    
+    for project_key, project_info in registry.items():
+        if only_projects is not None and project_key not in only_projects:
+            continue
+        project_path = Path(project_key)
+        if not project_path.exists():
+            continue  # Possibly an unmounted drive - keep its knowledge
         
-        # Process current session files
-        for session_file in project_path.glob("SESSION_*.md"):
-            entries = extract_knowledge_from_session(session_file, project_path, project_name)
-            for entry in entries:
-                entry_hash = _hash_entry(entry)
-                if entry_hash not in existing_hashes:
-                    new_entries.append(entry)
-                    existing_hashes.add(entry_hash)
+        project_name = project_info.get("name", project_path.name)
+        scanned_projects.add(str(project_path))
         
-        # Process archived sessions
-        archive_dir = project_path / "docs" / "archive" / "sessions"
-        if archive_dir.exists():
-            for session_file in archive_dir.glob("SESSION_*.md"):
-                entries = extract_knowledge_from_session(session_file, project_path, project_name)
-                for entry in entries:
-                    entry_hash = _hash_entry(entry)
-                    if entry_hash not in existing_hashes:
-                        new_entries.append(entry)
-                        existing_hashes.add(entry_hash)
+        for session_file in list_session_files(project_path):
+            file_key = str(session_file)
+            seen_files.add(file_key)
+            
+            try:
+                stat = session_file.stat()
+            except OSError:
+                continue
+            
+            record = files.get(file_key)
+            if record and record["mtime"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+                continue
+            
+            content_hash = _hash_file(session_file)
+            if record and record["hash"] == content_hash and record["project"] == project_name:
+                # Touched but not modified
+                record["mtime"] = stat.st_mtime_ns
+                record["size"] = stat.st_size
+                manifest_changed = True
+                continue
+            
+            files[file_key] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": content_hash,
+                "project": project_name,
+                "project_path": str(project_path),
+            }
+            dirty_sources.add((str(project_path), session_file.name))
+    
+    # Drop files that were deleted, or whose project was unregistered
+    for file_key in list(files):
+        record = files[file_key]
+        deleted = record["project_path"] in scanned_projects and file_key not in seen_files
+        if deleted or record["project_path"] not in registry:
+            del files[file_key]
+            dirty_sources.add((record["project_path"], Path(file_key).name))
+    
+    if not dirty_sources:
+        if manifest_changed:
+            save_knowledge_manifest(manifest)
+        return 0
+    
+    # Only the dirty sources' entries are touched
+    new_count = store.replace_sources(dirty_sources, _extract_sources(files, dirty_sources))
+    save_knowledge_manifest(manifest)
+    
+    return new_count
+
+
+def _extract_sources(files: Dict, dirty_sources: set) -> List[Dict]:
+    """Extract the entries of every file of the dirty sources."""
+    entries = []
+    # Re-extract every file of a dirty source (a session can exist both in root and archive)
+    with session_cache.batch():
+        for file_key, record in sorted(files.items()):
+            session_file = Path(file_key)
+            if (record["project_path"], session_file.name) not in dirty_sources:
+                continue
+            
+            entries.extend(extract_knowledge_from_session(
+                session_file, Path(record["project_path"]), record["project"]
+            ))
+    return entries
+
+
+def get_knowledge_count() -> int:
+    """
+    Get number of entries in the knowledge base.
     
-    # Add new entries to knowledge base
-    if new_entries:
-        all_knowledge = existing_knowledge + new_entries
-        save_knowledge(all_knowledge)
+    Reads the count kept by the store; no entries are loaded.
     
-    return len(new_entries)
+    Returns:
+        Number of knowledge entries
+    """
+    if get_knowledge_backend() == "sqlite":
+        return get_knowledge_database().count()
+    
+    return get_knowledge_log().count()
 
 
-def _hash_entry(entry: Dict) -> str:
-    """Create a hash for a knowledge entry to detect duplicates."""
-    # Use content + project + session_file as unique identifier
-    key = f"{entry.get('content', '')}{entry.get('project', '')}{entry.get('session_file', '')}"
-    return str(hash(key))
+def _hash_file(file_path: Path) -> str:
+    """Hash file content (detects touched-but-unchanged files)."""
+    try:
+        return hashlib.sha256(file_path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
 
 
-def search_knowledge(query: str, knowledge_type: Optional[str] = None) -> List[Dict]:
+class KnowledgeResults:
+    """
+    Results of a knowledge search, fetched a page at a time.
+    
+    The total is known up front; entries are only fetched for the pages
+    asked for (page() or slicing), so counting results and showing the
+    first page doesn't evaluate the search twice. Iteration runs the search
+    once for all entries, streaming them when the store can. Behaves like a
+    read-only list for len(), indexing and slicing.
+    """
+    
+    def __init__(
+        self,
+        total: int,
+        fetch: Callable[[int, int], List[Dict]],
+        stream: Optional[Callable[[], Iterator[Dict]]] = None,
+    ):
+        self.total = total
+        self._fetch = fetch  # (offset, limit) -> entries
+        self._stream = stream  # () -> every entry, in order
+    
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get a page of results.
+        
+        Args:
+            offset: Number of results to skip
+            limit: Maximum number of results (None for all remaining)
+        
+        Returns:
+            List of knowledge entries
+        """
+        offset = max(0, offset)
+        if limit is None:
+            limit = self.total - offset
+        if limit <= 0 or offset >= self.total:
+            return []
+        return self._fetch(offset, min(limit, self.total - offset))
+    
+    def __len__(self) -> int:
+        return self.total
+    
+    def __iter__(self) -> Iterator[Dict]:
+        if self._stream is not None:
+            return self._stream()
+        return iter(self.page())
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.total)
+            if step != 1:
+                return list(self)[index]
+            return self.page(start, max(0, stop - start))
+        
+        if index < 0:
+            index += self.total
+        entries = self.page(index, 1) if 0 <= index < self.total else []
+        if not entries:
+            raise IndexError("knowledge result index out of range")
+        return entries[0]
+
+
+def search_knowledge(query: str, knowledge_type: Optional[str] = None) -> KnowledgeResults:
     """
     Search knowledge base.
     
+    With the SQLite store, results come from its full-text index, best
+    matches first, each with a "snippet" of the matching content; only the
+    count is queried until pages are requested. Otherwise entries containing
+    the query are collected in one pass, in the order they were added.
+    
     Args:
         query: Search query
         knowledge_type: Optional filter by type ("discovery", "accomplishment", "insight")
     
     Returns:
-        List of matching knowledge entries
+        KnowledgeResults with the total and paged access to the entries
     """
-    knowledge = load_knowledge()
+    if get_knowledge_backend() == "sqlite":
+        database = get_knowledge_database()
+        return KnowledgeResults(
+            database.count_matches(query, knowledge_type),
+            lambda offset, limit: database.search(query, knowledge_type, limit, offset),
+            lambda: database.iter_search(query, knowledge_type),
+        )
     
-    if not knowledge:
-        return []
+    knowledge = load_knowledge()
     
     # Simple text search (case-insensitive)
     query_lower = query.lower()
@@ -270,14 +532,14 @@ def search_knowledge(query: str, knowledge_type: Optional[str] = None) -> List[D
         if query_lower in content:
             results.append(entry)
     
-    return results
+    return KnowledgeResults(len(results), lambda offset, limit: results[offset:offset + limit])
 
 
 def get_knowledge_by_topic(topic: str) -> List[Dict]:
     """
     Get knowledge entries related to a topic.
     
-    Uses simple keyword matching - can be enhanced with better NLP.
+    Uses keyword matching (ranked full-text search with the SQLite store).
     
     Args:
         topic: Topic to search for
@@ -285,45 +547,38 @@ def get_knowledge_by_topic(topic: str) -> List[Dict]:
     Returns:
         List of related knowledge entries
     """
-    return search_knowledge(topic)
+    return list(search_knowledge(topic))
 
 
-def get_related_discoveries(entry: Dict) -> List[Dict]:
+def get_related_discoveries(entry: Dict, threshold: Optional[float] = None, limit: int = 10) -> List[Dict]:
     """
     Find related discoveries across projects.
     
+    Related entries are those of other projects whose significant words
+    overlap the entry's (Jaccard similarity, estimated from MinHash
+    signatures). Candidates come from the store's LSH bucket table, so only
+    likely matches are compared rather than the whole knowledge base.
+    
     Args:
         entry: Knowledge entry to find related entries for
+        threshold: Minimum similarity, 0-1 (defaults to knowledge.related_threshold)
+        limit: Maximum number of related entries
     
     Returns:
-        List of related knowledge entries
+        List of related knowledge entries, most similar first, each with its
+        estimated "similarity"
     """
-    knowledge = load_knowledge()
-    
-    if not knowledge:
-        return []
-    
-    # Extract keywords from entry content
-    content = entry.get("content", "").lower()
-    # Simple keyword extraction (first few significant words)
-    words = [w for w in content.split() if len(w) > 4][:5]
-    
-    related = []
-    for other_entry in knowledge:
-        # Skip same entry
-        if _hash_entry(other_entry) == _hash_entry(entry):
-            continue
-        
-        # Skip same project (we want cross-project relations)
-        if other_entry.get("project") == entry.get("project"):
-            continue
-        
-        other_content = other_entry.get("content", "").lower()
-        # Check if any keywords appear in other entry
-        if any(word in other_content for word in words):
-            related.append(other_entry)
-    
-    return related[:10]  # Limit to 10 related entries
-
+    if threshold is None:
+        threshold = _get_related_threshold()
+    return _get_knowledge_store().related(entry, threshold, limit)
 
 
+def _get_related_threshold() -> float:
+    """Read the related-entry similarity threshold from configuration."""
+    default = DEFAULT_CONFIG["knowledge"]["related_threshold"]
+    try:
+        value = get_config_value("knowledge.related_threshold")
+        threshold = float(default if value is None else value)
+    except (ImportError, TypeError, ValueError):
+        threshold = default
+    return min(1.0, max(0.0, threshold))
@@ -0,0 +1,467 @@
+"""SQLite FTS5 storage for the knowledge base.
+
+Used instead of knowledge.json when storage.knowledge is "sqlite". Entries
+live in an `entries` table (type, project and session file are indexed
+columns; the full entry is kept as JSON), mirrored into an FTS5 index over
+content, type, project and session file. Searches are answered from the
+index, ranked by BM25, without loading the knowledge base into memory.
+
+Each entry's id (see knowledge_entry) is a unique column, so an entry is
+stored at most once. Each entry's MinHash signature is stored with it and
+its LSH buckets (see knowledge_lsh) in `lsh_buckets`, so related entries
+are found by bucket lookups.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from roadmapper.knowledge_entry import with_entry_id
+from roadmapper.knowledge_lsh import DEFAULT_THRESHOLD, band_keys, estimate_similarity, minhash_signature
+
+
+# Bump when the table layout changes (and add the upgrade to _create)
+SCHEMA_VERSION = 1
+
+# Marks matched terms in snippets
+SNIPPET_START = "["
+SNIPPET_END = "]"
+
+# Tokens of a search query (FTS5 syntax characters are dropped)
+_QUERY_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    entry_id TEXT,
+    type TEXT,
+    project TEXT,
+    project_path TEXT,
+    session_file TEXT,
+    content TEXT NOT NULL,
+    entry TEXT NOT NULL,
+    minhash BLOB
+);
+CREATE UNIQUE INDEX IF NOT EXISTS entries_entry_id ON entries (entry_id);
+CREATE INDEX IF NOT EXISTS entries_type ON entries (type);
+CREATE INDEX IF NOT EXISTS entries_project ON entries (project, session_file);
+CREATE INDEX IF NOT EXISTS entries_source ON entries (project_path, session_file);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    content, type, project, session_file,
+    content='entries', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    entry_id TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, entry_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lsh_buckets_entry_id ON lsh_buckets (entry_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, content, type, project, session_file)
+    VALUES (new.id, new.content, new.type, new.project, new.session_file);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, content, type, project, session_file)
+    VALUES ('delete', old.id, old.content, old.type, old.project, old.session_file);
+    DELETE FROM lsh_buckets WHERE entry_id = old.entry_id;
+END;
+"""
+
+
+class KnowledgeDatabase:
+    """
+    The knowledge base in a SQLite database with an FTS5 index.
+
+    A connection is opened per operation, so one KnowledgeDatabase can be
+    used from several threads.
+    """
+
+    def __init__(self, db_file: Path):
+        self.db_file = db_file
+
+    @classmethod
+    def open(cls, db_file: Path, json_file: Optional[Path] = None) -> "KnowledgeDatabase":
+        """
+        Open (creating if needed) a knowledge database.
+
+        A new database is filled from json_file if that exists, which is then
+        renamed to knowledge.json.migrated so it can't drift out of sync.
+
+        Args:
+            db_file: Path to database file
+            json_file: knowledge.json to migrate from
+
+        Returns:
+            KnowledgeDatabase
+
+        Raises:
+            RuntimeError: If the database was written by a newer roadmapper,
+                or this Python's SQLite was built without FTS5
+        """
+        database = cls(db_file)
+        created = not db_file.exists()
+        database._create()
+
+        if created and json_file is not None and json_file.exists():
+            try:
+                knowledge = json.loads(json_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                knowledge = None
+            if isinstance(knowledge, list):
+                database.replace_all(knowledge)
+                try:
+                    os.replace(json_file, json_file.with_name(json_file.name + ".migrated"))
+                except OSError:
+                    pass
+
+        return database
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.db_file), timeout=10)
+        connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL
+        return connection
+
+    def _create(self) -> None:
+        """
+        Create the schema and switch to WAL mode (both persist in the file).
+
+        Raises:
+            RuntimeError: If the database was written by a newer roadmapper,
+                or this Python's SQLite was built without FTS5
+        """
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"{self.db_file} was written by a newer roadmapper (schema version {version});"
+                    " upgrade roadmapper to use it"
+                )
+            connection.execute("PRAGMA journal_mode=WAL")
+            try:
+                connection.executescript(_SCHEMA)
+            except sqlite3.OperationalError as e:
+                if "fts5" in str(e):
+                    raise RuntimeError(
+                        "The SQLite knowledge store needs SQLite with FTS5 support"
+                    ) from e
+                raise
+            connection.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('store_id', ?)", (uuid.uuid4().hex,)
+            )
+            connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            connection.commit()
+
+    def load(self) -> List[Dict]:
+        """
+        Load every entry.
+
+        Returns:
+            List of knowledge entries (in insertion order)
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT entry FROM entries ORDER BY id").fetchall()
+        return [json.loads(entry) for (entry,) in rows]
+
+    @property
+    def store_id(self) -> str:
+        """Random id given to the database when it was created (see knowledge.index_all_projects)."""
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT value FROM meta WHERE key = 'store_id'").fetchone()[0]
+
+    def sources(self) -> Set[Tuple[str, str]]:
+        """(project_path, session file name) pairs that have entries."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT DISTINCT project_path, session_file FROM entries").fetchall()
+        return set(rows)
+
+    def count(self) -> int:
+        """Number of entries."""
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def compact(self) -> Tuple[int, int]:
+        """
+        Merge the full-text index into one segment and vacuum the database.
+
+        Returns:
+            Tuple of (entries before, entries after) - always equal, as no
+            dead rows are kept
+        """
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute("INSERT INTO entries_fts (entries_fts) VALUES ('optimize')")
+            connection.execute("VACUUM")
+        count = self.count()
+        return count, count
+
+    def replace_all(self, knowledge: List[Dict]) -> None:
+        """
+        Replace every entry, in one transaction.
+
+        Duplicate entries (same id) are stored once.
+
+        Args:
+            knowledge: List of knowledge entries
+        """
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute("DELETE FROM lsh_buckets")
+                connection.execute("DELETE FROM entries")
+                connection.execute("INSERT INTO entries_fts (entries_fts) VALUES ('delete-all')")
+                rows = [_to_row(with_entry_id(entry)) for entry in knowledge]
+                connection.executemany(_INSERT, rows)
+                connection.executemany(_INSERT_BUCKET, _bucket_rows(rows))
+
+    def replace_sources(self, sources: Set[Tuple[str, str]], entries: Iterable[Dict]) -> int:
+        """
+        Replace the entries of some session files, in one transaction.
+
+        Entries already stored (by id) under another source are skipped. An
+        entry that was stored before for the same source keeps its original
+        record (and extracted_at).
+
+        Args:
+            sources: (project_path, session file name) pairs to replace
+            entries: Newly extracted entries of those sources
+
+        Returns:
+            Number of entries that weren't stored before
+        """
+        new_count = 0
+        with closing(self._connect()) as connection:
+            with connection:
+                replaced = {}
+                for project_path, session_file in sources:
+                    rows = connection.execute(
+                        "SELECT entry FROM entries WHERE project_path = ? AND session_file = ?",
+                        (project_path, session_file),
+                    ).fetchall()
+                    for (stored,) in rows:
+                        stored = with_entry_id(json.loads(stored))
+                        replaced.setdefault(stored["id"], stored)
+                    connection.execute(
+                        "DELETE FROM entries WHERE project_path = ? AND session_file = ?",
+                        (project_path, session_file),
+                    )
+
+                seen = set()
+                rows = []
+                for entry in entries:
+                    entry = with_entry_id(entry)
+                    key = entry["id"]
+                    if key in seen or _contains(connection, key):
+                        continue
+                    seen.add(key)
+                    if key in replaced:
+                        entry = replaced[key]
+                    else:
+                        new_count += 1
+                    rows.append(_to_row(entry))
+                connection.executemany(_INSERT, rows)
+                connection.executemany(_INSERT_BUCKET, _bucket_rows(rows))
+
+        return new_count
+
+    def count_matches(self, query: str, knowledge_type: Optional[str] = None) -> int:
+        """
+        Count the entries search() would return.
+
+        Args:
+            query: Search query
+            knowledge_type: Optional filter by type
+
+        Returns:
+            Number of matching entries
+        """
+        match = build_match_query(query)
+        if match is None:
+            return 0
+
+        sql, params = _match_sql("COUNT(*)", match, knowledge_type)
+        with closing(self._connect()) as connection:
+            return connection.execute(sql, params).fetchone()[0]
+
+    def search(
+        self,
+        query: str,
+        knowledge_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict]:
+        """
+        Full-text search of entry content, best matches first (BM25).
+
+        Every word of the query must match after stemming (so "caching"
+        finds "cache" and "cached"); the last word also matches as a prefix.
+
+        Args:
+            query: Search query
+            knowledge_type: Optional filter by type
+            limit: Maximum number of results (None for all)
+            offset: Number of best matches to skip
+
+        Returns:
+            Matching entries, each with a "snippet" of the matching content
+        """
+        return list(self.iter_search(query, knowledge_type, limit, offset))
+
+    def iter_search(
+        self,
+        query: str,
+        knowledge_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Iterator[Dict]:
+        """
+        Like search(), but yield entries as the query produces them.
+
+        The query runs once however many entries are read; the connection
+        stays open until the iterator is exhausted or closed.
+        """
+        match = build_match_query(query)
+        if match is None:
+            return
+
+        sql, params = _match_sql(
+            "e.entry, snippet(entries_fts, 0, ?, ?, '...', 16)", match, knowledge_type
+        )
+        params = [SNIPPET_START, SNIPPET_END] + params
+        sql += " ORDER BY bm25(entries_fts) LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+
+        with closing(self._connect()) as connection:
+            for entry, snippet in connection.execute(sql, params):
+                entry = json.loads(entry)
+                entry["snippet"] = snippet
+                yield entry
+
+    def related(
+        self,
+        entry: Dict,
+        threshold: float = DEFAULT_THRESHOLD,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Find entries of other projects similar to an entry (MinHash/LSH).
+
+        Only entries sharing an LSH bucket with the entry are compared.
+
+        Args:
+            entry: Knowledge entry to find related entries for
+            threshold: Minimum estimated similarity (0-1)
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            Related entries, most similar first, each with its estimated "similarity"
+        """
+        signature = minhash_signature(entry.get("content", ""))
+        if signature is None:
+            return []
+
+        buckets = band_keys(signature)
+        sql = (
+            "SELECT e.entry, e.minhash FROM entries e WHERE e.entry_id IN ("
+            " SELECT entry_id FROM lsh_buckets WHERE "
+            + " OR ".join(["(band = ? AND bucket = ?)"] * len(buckets))
+            + ") AND e.project IS NOT ?"
+        )
+        params = [value for bucket in buckets for value in bucket] + [entry.get("project")]
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(sql, params).fetchall()
+
+        matches = []
+        for stored, other_signature in rows:
+            similarity = estimate_similarity(signature, other_signature)
+            if similarity >= threshold:
+                stored = json.loads(stored)
+                stored["similarity"] = similarity
+                matches.append(stored)
+        matches.sort(key=lambda match: -match["similarity"])
+        return matches if limit is None else matches[:limit]
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query over the content column.
+
+    Args:
+        query: Search query as typed
+
+    Returns:
+        FTS5 MATCH expression, or None if the query has no words
+    """
+    tokens = _QUERY_TOKEN.findall(query)
+    if not tokens:
+        return None
+    # Only the last word is a prefix (it may be unfinished); prefix terms on
+    # every word would expand to many index lookups each
+    terms = [f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*']
+    return "content : (" + " AND ".join(terms) + ")"
+
+
+def _match_sql(columns: str, match: str, knowledge_type: Optional[str]) -> Tuple[str, List]:
+    """SELECT statement (and its parameters) over the entries matching an FTS5 query."""
+    sql = (
+        f"SELECT {columns}"
+        " FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid"
+        " WHERE entries_fts MATCH ?"
+    )
+    params: List = [match]
+    if knowledge_type:
+        sql += " AND e.type = ?"
+        params.append(knowledge_type)
+    return sql, params
+
+
+# Duplicates of a stored entry (same id) are skipped
+_INSERT = (
+    "INSERT OR IGNORE INTO entries (entry_id, type, project, project_path, session_file, content, entry, minhash)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_INSERT_BUCKET = "INSERT OR IGNORE INTO lsh_buckets (band, bucket, entry_id) VALUES (?, ?, ?)"
+
+
+def _to_row(entry: Dict) -> tuple:
+    """Table row for a knowledge entry (which has its "id" set)."""
+    return (
+        entry["id"],
+        entry.get("type"),
+        entry.get("project"),
+        entry.get("project_path"),
+        entry.get("session_file"),
+        entry.get("content", ""),
+        json.dumps(entry, sort_keys=True),
+        minhash_signature(entry.get("content", "")),
+    )
+
+
+def _bucket_rows(rows: List[tuple]) -> List[tuple]:
+    """lsh_buckets rows for rows starting with the entry id and ending with its signature."""
+    return [
+        (band, value, row[0])
+        for row in rows if row[-1] is not None
+        for band, value in band_keys(row[-1])
+    ]
+
+
+def _contains(connection: sqlite3.Connection, key: str) -> bool:
+    """Check whether an entry with this id is stored."""
+    row = connection.execute("SELECT 1 FROM entries WHERE entry_id = ?", (key,)).fetchone()
+    return row is not None
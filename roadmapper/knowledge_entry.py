@@ -0,0 +1,74 @@
+"""Stable identity of knowledge entries.
+
+An entry's id is a content address: a blake2b digest of its normalized
+content, project path and session file name. It is the same in every
+process, so both knowledge stores can use it as a persistent dedup key.
+The path (not the project name) is hashed, so two clones of a project with
+the same name never share an entry, and each entry belongs to exactly one
+source (project path and session file).
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Dict
+
+
+# Bytes of the blake2b digest (hex id is twice as long)
+ID_DIGEST_SIZE = 16
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_content(content: str) -> str:
+    """Content as compared for identity (NFC, whitespace collapsed)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", content)).strip()
+
+
+def compute_entry_id(content: str, project_path: str, session_file: str) -> str:
+    """
+    Compute the id of a knowledge entry from its parts.
+
+    Args:
+        content: Entry content
+        project_path: Resolved project root, as registered (the registry key)
+        session_file: Session file name
+
+    Returns:
+        Hex digest identifying the entry
+    """
+    key = "\0".join((normalize_content(content or ""), project_path or "", session_file or ""))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=ID_DIGEST_SIZE).hexdigest()
+
+
+def entry_id(entry: Dict) -> str:
+    """
+    Get the id of a knowledge entry.
+
+    Uses the stored "id" if the entry has one (entries indexed before ids
+    were stored get theirs computed).
+
+    Args:
+        entry: Knowledge entry
+
+    Returns:
+        Hex digest identifying the entry
+    """
+    stored = entry.get("id")
+    if stored:
+        return stored
+    return compute_entry_id(
+        entry.get("content", ""), entry.get("project_path", ""), entry.get("session_file", "")
+    )
+
+
+def with_entry_id(entry: Dict) -> Dict:
+    """
+    Return the entry with its "id" set (the entry itself if it already has one).
+
+    Args:
+        entry: Knowledge entry
+    """
+    if entry.get("id"):
+        return entry
+    return dict(entry, id=entry_id(entry))
@@ -0,0 +1,803 @@
+"""Append-only storage for the knowledge base.
+
+Used when storage.knowledge is "json". Entries are written as JSON Lines to
+segment files in ~/.roadmapper/knowledge/, listed in order by manifest.json.
+Reindexing a session file appends a tombstone for it (dropping its earlier
+entries) followed by its current entries, so the cost of an index run
+depends on what changed, not on the size of the knowledge base.
+
+Dropped entries stay in the segments until compact() rewrites the live
+entries into a single segment (`roadmapper knowledge compact`; the watch
+daemon also compacts once most records are dead).
+
+Writers take an advisory lock on the `lock` file (flock; msvcrt.locking on
+Windows) and re-read manifest.json under it, so appends and compactions from
+several processes are applied one after the other. Readers don't lock: every
+file is replaced atomically, and segments only grow.
+
+index.json maps the id of every live entry (see knowledge_entry) to its
+source and its position in the segments, so new entries are deduplicated
+against the whole knowledge base without reading any segment, and single
+entries are read with one seek. Index runs append their changes to
+index.log; they are folded into index.json when the log is compacted.
+
+lsh.db is a SQLite table of the MinHash signatures, positions and LSH
+buckets (see knowledge_lsh) of the live entries. Index runs insert and
+delete only the rows of the entries they change, and related() reads only
+the buckets of the entry it is given.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import uuid
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from roadmapper.knowledge_entry import with_entry_id
+from roadmapper.knowledge_lsh import DEFAULT_THRESHOLD, band_keys, estimate_similarity, minhash_signature
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+# Bump when the segment, manifest or index layout (or how ids are computed) changes
+LOG_VERSION = 1
+
+# Start a new segment once the current one is this large
+MAX_SEGMENT_BYTES = 4 * 1024 * 1024
+
+# Compact when dead records outnumber live entries and there are at least this many
+MIN_DEAD_RECORDS_TO_COMPACT = 1000
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+class KnowledgeLog:
+    """
+    The knowledge base as a log of JSON Lines segments.
+
+    A line is either an entry or a tombstone {"tombstone": [project_path,
+    session_file]} that drops the entries of that source written before it.
+    The manifest lists the segments and counts live entries per source, so
+    the entry count is known without reading any segment.
+    """
+
+    def __init__(self, directory: Path, manifest: Dict):
+        self.directory = directory
+        self.manifest = manifest
+        self._lock_depth = 0
+        self._index_base: Optional[str] = None  # Snapshot index.log changes apply to
+        self._lsh_created = False  # Whether lsh.db's tables were checked
+
+    @classmethod
+    def open(cls, directory: Path, json_file: Optional[Path] = None) -> "KnowledgeLog":
+        """
+        Open (creating if needed) a knowledge log.
+
+        A new log is filled from json_file (the old single-file knowledge
+        base) if that exists, which is then renamed to knowledge.json.migrated.
+
+        Args:
+            directory: Log directory
+            json_file: knowledge.json to migrate from
+
+        Returns:
+            KnowledgeLog
+
+        Raises:
+            RuntimeError: If the log was written by a newer roadmapper
+        """
+        log = cls(directory, {})
+        if log._reload_manifest():
+            return log
+
+        with log._locked():
+            if log._reload_manifest():
+                return log  # Created by another process meanwhile
+
+            version = log.manifest.get("version")
+            if version is not None:
+                raise RuntimeError(
+                    f"{directory} was written by a newer roadmapper (log version {version});"
+                    " upgrade roadmapper to use it"
+                )
+
+            log.manifest = _empty_manifest()
+            knowledge = None
+            if json_file is not None and json_file.exists():
+                try:
+                    knowledge = json.loads(json_file.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    knowledge = None
+            if isinstance(knowledge, list):
+                log.replace_all(knowledge)
+                try:
+                    os.replace(json_file, json_file.with_name(json_file.name + ".migrated"))
+                except OSError:
+                    pass
+            else:
+                log._save_manifest()  # Keeps the new store_id
+        return log
+
+    @property
+    def manifest_file(self) -> Path:
+        return self.directory / "manifest.json"
+
+    @property
+    def index_file(self) -> Path:
+        return self.directory / "index.json"
+
+    @property
+    def index_log_file(self) -> Path:
+        return self.directory / "index.log"
+
+    @property
+    def lsh_db_file(self) -> Path:
+        return self.directory / "lsh.db"
+
+    @property
+    def lock_file(self) -> Path:
+        return self.directory / "lock"
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Hold the log's write lock (an advisory lock on the lock file).
+
+        Every change to the log happens under this lock, so writers in other
+        processes (e.g. `roadmapper watch` and a foreground `roadmapper index`)
+        take turns. On entry the manifest is re-read, so changes made by the
+        previous holder are kept. Re-entrant within one KnowledgeLog.
+        """
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.lock_file.open("a+b") as f:
+            _lock(f)
+            self._lock_depth = 1
+            try:
+                self._reload_manifest()
+                yield
+            finally:
+                self._lock_depth = 0
+                _unlock(f)
+
+    def _reload_manifest(self) -> bool:
+        """
+        Re-read manifest.json (kept in self.manifest even if of another layout).
+
+        Returns:
+            True if it is of the current layout
+        """
+        try:
+            manifest = json.loads(self.manifest_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(manifest, dict):
+            return False
+        self.manifest = manifest
+        return manifest.get("version") == LOG_VERSION
+
+    @property
+    def store_id(self) -> str:
+        """Random id given to the log when it was created (see knowledge.index_all_projects)."""
+        return self.manifest["store_id"]
+
+    def sources(self) -> Set[Tuple[str, str]]:
+        """(project_path, session file name) pairs that have live entries."""
+        return {
+            (project_path, session_file)
+            for project_path, sessions in self.manifest["sources"].items()
+            for session_file in sessions
+        }
+
+    def count(self) -> int:
+        """Number of live entries (from the manifest; no segment is read)."""
+        return sum(
+            count
+            for sessions in self.manifest["sources"].values()
+            for count in sessions.values()
+        )
+
+    def dead_records(self) -> int:
+        """Records (dropped entries and tombstones) compaction would remove."""
+        return self.manifest["records"] - self.count()
+
+    def needs_compaction(self) -> bool:
+        """Check whether most of the log is dead records."""
+        dead = self.dead_records()
+        return dead >= MIN_DEAD_RECORDS_TO_COMPACT and dead > self.count()
+
+    def load(self) -> List[Dict]:
+        """
+        Replay the log.
+
+        Returns:
+            Live entries, in the order they were (last) written
+        """
+        return [entry for entry, location in self._replay()]
+
+    def get(self, keys: Iterable[str]) -> List[Dict]:
+        """
+        Read entries by id, seeking to each one in its segment.
+
+        Args:
+            keys: Entry ids
+
+        Returns:
+            The entries that are stored, in the order asked for
+        """
+        index = self._load_index()[0]
+        entries = []
+        for key in keys:
+            record = index.get(key)
+            if record is None:
+                continue
+            entry = _read_record(self.directory / record[3], record[4])
+            if entry is not None and entry.get("id") == key:
+                entries.append(entry)
+        return entries
+
+    def related(
+        self,
+        entry: Dict,
+        threshold: float = DEFAULT_THRESHOLD,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Find entries of other projects similar to an entry (MinHash/LSH).
+
+        Only the entry's buckets are looked up in lsh.db, and only entries
+        sharing one of them are compared and read.
+
+        Args:
+            entry: Knowledge entry to find related entries for
+            threshold: Minimum estimated similarity (0-1)
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            Related entries, most similar first, each with its estimated "similarity"
+        """
+        signature = minhash_signature(entry.get("content", ""))
+        if signature is None:
+            return []
+
+        if self._lsh_records() != self.manifest["records"]:
+            with self._locked():  # Re-reads the manifest, which another process may have moved on
+                if self._lsh_records() != self.manifest["records"]:
+                    self._rebuild_lsh(self._replay())
+
+        buckets = band_keys(signature)
+        sql = (
+            "SELECT entry_id, minhash, segment, offset FROM signatures WHERE entry_id IN ("
+            " SELECT entry_id FROM lsh_buckets WHERE "
+            + " OR ".join(["(band = ? AND bucket = ?)"] * len(buckets))
+            + ")"
+        )
+        params = [value for bucket in buckets for value in bucket]
+        with closing(self._connect_lsh()) as connection:
+            rows = connection.execute(sql, params).fetchall()
+
+        matches = []
+        for key, other_signature, segment, offset in rows:
+            similarity = estimate_similarity(signature, other_signature)
+            if similarity >= threshold:
+                matches.append((similarity, key, segment, offset))
+        matches.sort(key=lambda match: (-match[0], match[1]))
+
+        related = []
+        for similarity, key, segment, offset in matches:
+            other = _read_record(self.directory / segment, offset)
+            if other is None or other.get("id") != key or other.get("project") == entry.get("project"):
+                continue
+            other["similarity"] = similarity
+            related.append(other)
+            if limit is not None and len(related) >= limit:
+                break
+        return related
+
+    def replace_sources(self, sources: Set[Tuple[str, str]], entries: Iterable[Dict]) -> int:
+        """
+        Replace the entries of some session files by appending to the log.
+
+        Entries already stored (by id) under another source are skipped. An
+        entry that was stored before for the same source keeps its original
+        extracted_at.
+
+        Args:
+            sources: (project_path, session file name) pairs to replace
+            entries: Newly extracted entries of those sources
+
+        Returns:
+            Number of entries that weren't stored before
+        """
+        with self._locked():
+            index, rebuilt = self._load_index()
+            lsh_current = self._lsh_records() == self.manifest["records"]
+            replaced = {}  # id -> extracted_at
+            for key, record in list(index.items()):
+                if (record[0], record[1]) in sources:
+                    replaced[key] = record[2]
+                    del index[key]
+
+            new_entries = []
+            new_count = 0
+            for entry in entries:
+                entry = with_entry_id(entry)
+                key = entry["id"]
+                if key in index:
+                    continue
+                if key in replaced:
+                    entry = dict(entry, extracted_at=replaced[key])
+                else:
+                    new_count += 1
+                index[key] = None  # Located once written
+                new_entries.append(entry)
+
+            stored = self.manifest["sources"]
+            removed_sources = [
+                (project_path, session_file) for project_path, session_file in sources
+                if session_file in stored.get(project_path, {})
+            ]
+            locations = self._append(new_entries, removed_sources)
+            added = {}
+            for entry, location in zip(new_entries, locations):
+                added[entry["id"]] = index[entry["id"]] = _index_record(entry, location)
+            if rebuilt:
+                self._save_index(index)
+            elif replaced or added:
+                self._append_index_delta(replaced, added)
+            if lsh_current:
+                self._update_lsh(replaced, zip(new_entries, locations))
+            else:
+                self._rebuild_lsh(self._replay())
+            return new_count
+
+    def _append(self, entries: List[Dict], removed_sources: List[Tuple[str, str]]) -> List[Tuple[str, int]]:
+        """
+        Drop the entries of some sources, then add entries, by appending to the log.
+
+        Args:
+            entries: Entries to add
+            removed_sources: (project_path, session file name) pairs whose
+                earlier entries are dropped
+
+        Returns:
+            (segment, offset) of each added entry
+        """
+        if not entries and not removed_sources:
+            return []
+
+        sources = self.manifest["sources"]
+        records = 0
+        locations = []
+
+        segment, f = self._open_segment()
+        with f:
+            for project_path, session_file in sorted(removed_sources):
+                f.write(_encode({"tombstone": [project_path, session_file]}))
+                records += 1
+                sessions = sources.get(project_path, {})
+                sessions.pop(session_file, None)
+                if not sessions:
+                    sources.pop(project_path, None)
+
+            for entry in entries:
+                locations.append((segment, f.tell()))
+                f.write(_encode(entry))
+                records += 1
+                _count_entry(sources, entry)
+
+        self.manifest["records"] += records
+        self._save_manifest()
+        return locations
+
+    def replace_all(self, entries: List[Dict]) -> None:
+        """
+        Replace the whole log with the given entries (one new segment).
+
+        Duplicate entries (same id) are stored once.
+
+        Args:
+            entries: Entries to keep
+        """
+        with self._locked():
+            seen = set()
+            unique_entries = []
+            for entry in entries:
+                entry = with_entry_id(entry)
+                if entry["id"] not in seen:
+                    seen.add(entry["id"])
+                    unique_entries.append(entry)
+
+            old_segments = list(self.manifest["segments"])
+            segment, offsets = self._write_segment(unique_entries)
+            self._use_segment(segment, unique_entries)
+            self._save_index({
+                entry["id"]: _index_record(entry, (segment, offset))
+                for entry, offset in zip(unique_entries, offsets)
+            })
+            self._rebuild_lsh((entry, (segment, offset)) for entry, offset in zip(unique_entries, offsets))
+            self._remove_segments(old_segments)
+
+    def compact(self) -> Tuple[int, int]:
+        """
+        Rewrite the live entries into a single segment.
+
+        Holds the write lock throughout, so other writers wait until it is done.
+
+        Returns:
+            Tuple of (records before, entries after)
+        """
+        with self._locked():
+            old_segments = list(self.manifest["segments"])
+            records = self.manifest["records"]
+
+            lsh_current = self._lsh_records() == records
+            entries = self.load()
+            new_segment, offsets = self._write_segment(entries)
+
+            self._use_segment(new_segment, entries)
+            self._save_index({
+                entry["id"]: _index_record(entry, (new_segment, offset))
+                for entry, offset in zip(entries, offsets)
+            })
+            locations = [(entry, (new_segment, offset)) for entry, offset in zip(entries, offsets)]
+            if lsh_current:
+                self._move_lsh(locations)  # Same entries, so their signatures are kept
+            else:
+                self._rebuild_lsh(locations)
+            self._remove_segments(old_segments)
+            return records, len(entries)
+
+    def _use_segment(self, segment: str, entries: List[Dict]) -> None:
+        """Point the manifest at a single segment holding `entries`."""
+        self.manifest = _empty_manifest(self.manifest["next_segment"], self.manifest.get("store_id"))
+        self.manifest["segments"] = [segment]
+        self.manifest["records"] = len(entries)
+        for entry in entries:
+            _count_entry(self.manifest["sources"], entry)
+        self._save_manifest()
+
+    def _new_segment_name(self) -> str:
+        number = self.manifest["next_segment"]
+        self.manifest["next_segment"] = number + 1
+        return f"segment-{number:06d}.jsonl"
+
+    def _write_segment(self, entries: List[Dict]) -> Tuple[str, List[int]]:
+        """Stream entries into a new segment file; returns its name and each entry's offset."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = self._new_segment_name()
+        offsets = []
+        with (self.directory / name).open("wb") as f:
+            for entry in entries:
+                offsets.append(f.tell())
+                f.write(_encode(entry))
+        return name, offsets
+
+    def _open_segment(self) -> Tuple[str, BinaryIO]:
+        """
+        Open the last segment for appending, starting a new one when it is
+        full or ends in a torn line (a record glued onto it would be lost).
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = self.manifest["segments"]
+        if segments:
+            path = self.directory / segments[-1]
+            try:
+                size = path.stat().st_size
+                if size < MAX_SEGMENT_BYTES and (size == 0 or _last_byte(path) == b"\n"):
+                    return segments[-1], path.open("ab")
+            except OSError:
+                pass
+
+        name = self._new_segment_name()
+        segments.append(name)
+        return name, (self.directory / name).open("ab")
+
+    def _replay(self) -> List[Tuple[Dict, Tuple[str, int]]]:
+        """Live entries with their (segment, offset), in the order they were (last) written."""
+        entries = []  # (sequence number, entry, location)
+        tombstones = {}  # source -> sequence number of its last tombstone
+        sequence = 0
+        for segment in self.manifest["segments"]:
+            for offset, record in _read_segment(self.directory / segment):
+                sequence += 1
+                if "tombstone" in record:
+                    tombstones[tuple(record["tombstone"])] = sequence
+                else:
+                    entries.append((sequence, record, (segment, offset)))
+
+        return [
+            (entry, location) for sequence, entry, location in entries
+            if sequence > tombstones.get(_source(entry), 0)
+        ]
+
+    def _remove_segments(self, segments: List[str]) -> None:
+        for segment in segments:
+            if segment not in self.manifest["segments"]:
+                _remove_file(self.directory / segment)
+
+    def _load_index(self) -> Tuple[Dict[str, List], bool]:
+        """
+        Load the id index (id -> [project_path, session file, extracted_at,
+        segment, offset]).
+
+        The index is the snapshot in index.json plus the changes appended to
+        index.log since (see _append_index_delta). Both record the log length
+        they describe; if that doesn't match the manifest (e.g. after a crash
+        between writes), the index is rebuilt by replaying the log.
+
+        Returns:
+            Tuple of (index, whether it was rebuilt rather than read from disk)
+        """
+        try:
+            snapshot = json.loads(self.index_file.read_text(encoding="utf-8"))
+            self._index_base = snapshot["base"]
+            index = snapshot["entries"]
+            records = snapshot["records"]
+            for delta in _read_index_deltas(self.index_log_file, snapshot["base"]):
+                for key in delta["remove"]:
+                    index.pop(key, None)
+                index.update(delta["add"])
+                records = delta["records"]
+            if records == self.manifest["records"]:
+                return index, False
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            pass
+
+        index = {
+            entry["id"]: _index_record(entry, location)
+            for entry, location in self._replay()
+            if entry.get("id")
+        }
+        return index, True
+
+    def _save_index(self, index: Dict[str, List]) -> None:
+        """Write a new index snapshot, folding in (and dropping) the appended changes."""
+        self._index_base = uuid.uuid4().hex
+        _write_json(
+            self.index_file,
+            {"base": self._index_base, "records": self.manifest["records"], "entries": index},
+        )
+        _remove_file(self.index_log_file)
+
+    def _append_index_delta(self, removed: Iterable[str], added: Dict[str, List]) -> None:
+        """
+        Record index changes by appending one line to index.log.
+
+        Costs only the size of the change; the snapshot in index.json (which
+        _load_index must have read) is rewritten when the log is compacted.
+        """
+        delta = {
+            "base": self._index_base,
+            "records": self.manifest["records"],
+            "remove": sorted(removed),
+            "add": added,
+        }
+        with self.index_log_file.open("ab") as f:
+            f.write(_encode(delta))
+
+    def _connect_lsh(self) -> sqlite3.Connection:
+        """Open lsh.db (creating its tables if needed)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.lsh_db_file), timeout=10)
+        connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL
+        if not self._lsh_created:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_LSH_SCHEMA)
+            self._lsh_created = True
+        return connection
+
+    def _lsh_records(self) -> Optional[int]:
+        """The log length (manifest "records") lsh.db was last brought up to date with."""
+        try:
+            with closing(self._connect_lsh()) as connection:
+                row = connection.execute("SELECT value FROM meta WHERE key = 'records'").fetchone()
+        except sqlite3.Error:
+            return None
+        return None if row is None else int(row[0])
+
+    def _update_lsh(self, removed: Iterable[str], added: Iterable[Tuple[Dict, Tuple[str, int]]]) -> None:
+        """Delete the rows of some entries and add others, in one transaction."""
+        rows = _lsh_rows(added)
+        with closing(self._connect_lsh()) as connection:
+            with connection:
+                keys = [(key,) for key in removed]
+                connection.executemany("DELETE FROM signatures WHERE entry_id = ?", keys)
+                connection.executemany("DELETE FROM lsh_buckets WHERE entry_id = ?", keys)
+                _insert_lsh_rows(connection, rows)
+                _set_lsh_records(connection, self.manifest["records"])
+
+    def _move_lsh(self, locations: List[Tuple[Dict, Tuple[str, int]]]) -> None:
+        """Point the stored rows at the entries' new positions (after compaction)."""
+        with closing(self._connect_lsh()) as connection:
+            with connection:
+                connection.executemany(
+                    "UPDATE signatures SET segment = ?, offset = ? WHERE entry_id = ?",
+                    [(segment, offset, entry["id"]) for entry, (segment, offset) in locations],
+                )
+                _set_lsh_records(connection, self.manifest["records"])
+
+    def _rebuild_lsh(self, locations: Iterable[Tuple[Dict, Tuple[str, int]]]) -> None:
+        """Refill lsh.db with the given live entries (computing their signatures)."""
+        rows = _lsh_rows(locations)
+        with closing(self._connect_lsh()) as connection:
+            with connection:
+                connection.execute("DELETE FROM signatures")
+                connection.execute("DELETE FROM lsh_buckets")
+                _insert_lsh_rows(connection, rows)
+                _set_lsh_records(connection, self.manifest["records"])
+
+    def _save_manifest(self) -> None:
+        _write_json(self.manifest_file, self.manifest)
+
+
+_LSH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    entry_id TEXT PRIMARY KEY,
+    minhash BLOB NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    entry_id TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, entry_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lsh_buckets_entry_id ON lsh_buckets (entry_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _empty_manifest(next_segment: int = 1, store_id: Optional[str] = None) -> Dict:
+    return {
+        "version": LOG_VERSION,
+        "store_id": store_id or _new_store_id(),
+        "segments": [],
+        "next_segment": next_segment,
+        "records": 0,  # Lines in all segments
+        "sources": {},  # project_path -> {session file: live entries}
+    }
+
+
+def _new_store_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _index_record(entry: Dict, location: Tuple[str, int]) -> List:
+    """What the id index keeps about an entry."""
+    segment, offset = location
+    return [entry.get("project_path"), entry.get("session_file"), entry.get("extracted_at"), segment, offset]
+
+
+def _lsh_rows(locations: Iterable[Tuple[Dict, Tuple[str, int]]]) -> List[tuple]:
+    """signatures rows (entry id, signature, segment, offset) of entries that have a signature."""
+    rows = []
+    for entry, (segment, offset) in locations:
+        signature = minhash_signature(entry.get("content", ""))
+        if signature is not None and entry.get("id"):
+            rows.append((entry["id"], signature, segment, offset))
+    return rows
+
+
+def _insert_lsh_rows(connection: sqlite3.Connection, rows: List[tuple]) -> None:
+    connection.executemany(
+        "INSERT OR REPLACE INTO signatures (entry_id, minhash, segment, offset) VALUES (?, ?, ?, ?)", rows
+    )
+    connection.executemany(
+        "INSERT OR IGNORE INTO lsh_buckets (band, bucket, entry_id) VALUES (?, ?, ?)",
+        [(band, value, row[0]) for row in rows for band, value in band_keys(row[1])],
+    )
+
+
+def _set_lsh_records(connection: sqlite3.Connection, records: int) -> None:
+    connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('records', ?)", (str(records),))
+
+
+def _encode(record: Dict) -> bytes:
+    """A record as one segment line."""
+    return (_encoder.encode(record) + "\n").encode("utf-8")
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    """Replace a JSON file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_suffix(".tmp")
+    tmp_file.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_file, path)
+
+
+def _count_entry(sources: Dict, entry: Dict) -> None:
+    """Add an entry to the per-source live counts."""
+    sessions = sources.setdefault(entry.get("project_path") or "", {})
+    session_file = entry.get("session_file") or ""
+    sessions[session_file] = sessions.get(session_file, 0) + 1
+
+
+def _read_segment(path: Path) -> Iterator[Tuple[int, Dict]]:
+    """(offset, record) pairs of a segment (a torn last line from a crash is skipped)."""
+    try:
+        with path.open("rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    yield offset, json.loads(line)
+                except ValueError:
+                    pass
+                offset += len(line)
+    except OSError:
+        return
+
+
+def _last_byte(path: Path) -> bytes:
+    with path.open("rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1)
+
+
+def _read_index_deltas(path: Path, base: str) -> Iterator[Dict]:
+    """Index changes appended on top of the snapshot `base` (others are left over from a crash)."""
+    for offset, delta in _read_segment(path):
+        if delta.get("base") == base:
+            yield delta
+
+
+def _read_record(path: Path, offset: int) -> Optional[Dict]:
+    """The record at an offset of a segment (None if it can't be read)."""
+    try:
+        with path.open("rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def _source(entry: Dict) -> Tuple[str, str]:
+    """(project_path, session file name) an entry was extracted from."""
+    return (entry.get("project_path"), entry.get("session_file"))
+
+
+def _remove_file(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def _lock(f: BinaryIO) -> None:
+    """Block until this process holds the exclusive lock on an open lock file."""
+    if sys.platform == "win32":
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after about 10 seconds
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock(f: BinaryIO) -> None:
+    if sys.platform == "win32":
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
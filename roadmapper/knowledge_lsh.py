@@ -0,0 +1,100 @@
+"""MinHash signatures and LSH buckets for finding related knowledge entries.
+
+An entry's signature is a MinHash of the set of significant words in its
+content: the fraction of positions where two signatures agree estimates
+the Jaccard similarity of the two word sets. The signature is cut into
+bands; entries sharing any band value land in the same bucket, so similar
+entries are found by looking up a few buckets instead of comparing
+against every entry.
+
+With BANDS bands of ROWS values each, two entries with similarity s share
+a bucket with probability 1 - (1 - s**ROWS)**BANDS: about 0.78 at s = 0.3
+and 0.99 at s = 0.5. Candidates are then filtered by their estimated
+similarity against the caller's threshold.
+
+Signatures and buckets are computed at index time and stored in a SQLite
+bucket table by both knowledge stores (see knowledge_db and knowledge_log).
+"""
+
+import hashlib
+import random
+import re
+import struct
+import unicodedata
+from typing import List, Optional, Set, Tuple
+
+
+# Signature layout; changing any of these invalidates stored signatures
+BANDS = 16
+ROWS = 2
+NUM_HASHES = BANDS * ROWS
+
+# Default minimum estimated similarity for related entries
+DEFAULT_THRESHOLD = 0.3
+
+# Words shorter than this are ignored
+MIN_WORD_LENGTH = 3
+
+_STOPWORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has his how its may new now "
+    "see two who did get let say she too use that with have this will your from they been more "
+    "when were what into than then them some also just only very which while there their would "
+    "could should about after before other these those where being does done each such".split()
+)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Universal hashing (a * x + b) mod a Mersenne prime, with fixed coefficients
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(0x5EED)
+_COEFFICIENTS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_HASHES)]
+
+_SIGNATURE = struct.Struct(f">{NUM_HASHES}I")
+_BAND_BYTES = ROWS * 4
+
+
+def tokenize(content: str) -> Set[str]:
+    """Significant words of some content (lowercased, stopwords dropped)."""
+    words = _WORD.findall(unicodedata.normalize("NFC", content).lower())
+    return {word for word in words if len(word) >= MIN_WORD_LENGTH and word not in _STOPWORDS}
+
+
+def minhash_signature(content: str) -> Optional[bytes]:
+    """
+    Compute the MinHash signature of some content.
+
+    Args:
+        content: Entry content
+
+    Returns:
+        Packed signature (NUM_HASHES 32-bit values), or None if the content
+        has no significant words
+    """
+    words = tokenize(content)
+    if not words:
+        return None
+
+    word_hashes = [
+        int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+        for word in words
+    ]
+    return _SIGNATURE.pack(*(
+        min(((a * x + b) % _PRIME) & _MAX_HASH for x in word_hashes)
+        for a, b in _COEFFICIENTS
+    ))
+
+
+def band_keys(signature: bytes) -> List[Tuple[int, bytes]]:
+    """(band number, band value) buckets a signature falls into."""
+    return [
+        (band, signature[band * _BAND_BYTES:(band + 1) * _BAND_BYTES])
+        for band in range(BANDS)
+    ]
+
+
+def estimate_similarity(signature: bytes, other: bytes) -> float:
+    """Estimated Jaccard similarity of the word sets behind two signatures."""
+    values = _SIGNATURE.unpack(signature)
+    other_values = _SIGNATURE.unpack(other)
+    return sum(1 for a, b in zip(values, other_values) if a == b) / NUM_HASHES
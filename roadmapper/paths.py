@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 def get_home_dir() -> Path:
@@ -72,6 +72,26 @@ def get_project_config_file(project_root: Optional[Path] = None) -> Optional[Pat
     return project_root / ".roadmapper.toml"
 
 
+def list_session_files(project_root: Path) -> List[Path]:
+    """
+    List current and archived session files of a project.
+    
+    Args:
+        project_root: Project root directory
+    
+    Returns:
+        SESSION_*.md files in the project root, then those in
+        docs/archive/sessions/ (each group sorted by name)
+    """
+    session_files = sorted(project_root.glob("SESSION_*.md"))
+    
+    archive_dir = project_root / "docs" / "archive" / "sessions"
+    if archive_dir.exists():
+        session_files.extend(sorted(archive_dir.glob("SESSION_*.md")))
+    
+    return session_files
+
+
 def get_project_history_dir(project_root: Optional[Path] = None) -> Path:
     """
     Get project history directory (.roadmapper/).
@@ -106,3 +126,30 @@ def get_project_history_file(project_root: Optional[Path] = None) -> Path:
     """
     return get_project_history_dir(project_root) / "history.jsonl"
 
+
+def get_project_cache_dir(project_root: Optional[Path] = None) -> Path:
+    """
+    Get project cache directory (.roadmapper/cache/).
+
+    Holds derived data (indexes, parsed files) that can always be rebuilt
+    from the project files. A .gitignore is written so the cache is never
+    committed alongside history.jsonl.
+
+    Args:
+        project_root: Project root directory (searches from cwd if None)
+
+    Returns:
+        Path to project cache directory (creates if needed)
+    """
+    cache_dir = get_project_history_dir(project_root) / "cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    gitignore = cache_dir / ".gitignore"
+    if not gitignore.exists():
+        try:
+            gitignore.write_text("*\n", encoding="utf-8")
+        except OSError:
+            pass
+
+    return cache_dir
+
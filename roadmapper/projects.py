@@ -1,21 +1,56 @@
 """Project registry for cross-project intelligence."""
 
 import json
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
 import os
+import time
 
-from roadmapper.paths import get_global_config_dir, get_project_root
-from roadmapper.utils import read_text_file, write_text_file
-from roadmapper.history import read_history, get_session_stats
+from roadmapper.config import DEFAULT_CONFIG, get_config_value, get_storage_backend
+from roadmapper.paths import get_global_config_dir, get_project_cache_dir, get_project_root
+from roadmapper.utils import read_text_file, stat_key, write_text_file
+from roadmapper.history import load_history, read_history
+from roadmapper.registry_db import RegistryDatabase
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_registry_databases: Dict[str, RegistryDatabase] = {}
+
+
+def get_registry_backend() -> str:
+    """
+    Get the registry storage backend from the global configuration.
+    
+    The registry is shared by all projects, so project-level configuration
+    is ignored for this setting.
+    
+    Returns:
+        "json" (projects.json) or "sqlite" (projects.db)
+    """
+    return get_storage_backend("registry")
 
 
 def get_projects_registry_file() -> Path:
-    """Get path to projects registry file (~/.roadmapper/projects.json)."""
+    """Get path to projects registry file (~/.roadmapper/projects.json or projects.db)."""
+    if get_registry_backend() == "sqlite":
+        return get_global_config_dir() / "projects.db"
     return get_global_config_dir() / "projects.json"
 
 
+def _get_registry_database() -> RegistryDatabase:
+    """Open the SQLite registry, migrating projects.json into it on first use."""
+    db_file = get_projects_registry_file()
+    database = _registry_databases.get(str(db_file))
+    if database is None or not db_file.exists():
+        database = RegistryDatabase.open(db_file, get_global_config_dir() / "projects.json")
+        _registry_databases[str(db_file)] = database
+    return database
+
+
 def load_projects_registry() -> Dict[str, Dict]:
     """
     Load projects registry from disk.
@@ -23,6 +58,9 @@ def load_projects_registry() -> Dict[str, Dict]:
     Returns:
         Dictionary mapping project paths to project metadata
     """
+    if get_registry_backend() == "sqlite":
+        return _get_registry_database().load()
+    
     registry_file = get_projects_registry_file()
     
     if not registry_file.exists():
@@ -42,11 +80,50 @@ def save_projects_registry(registry: Dict[str, Dict]) -> None:
     Args:
         registry: Dictionary mapping project paths to project metadata
     """
+    if get_registry_backend() == "sqlite":
+        _get_registry_database().replace(registry)
+        return
+    
     registry_file = get_projects_registry_file()
     content = json.dumps(registry, indent=2, sort_keys=True)
     write_text_file(registry_file, content)
 
 
+def apply_registry_changes(
+    upserts: Optional[Dict[str, Dict]] = None,
+    removals: Optional[List[str]] = None,
+) -> int:
+    """
+    Add, replace and remove registry entries in one write.
+    
+    With the SQLite backend only the affected rows are written, in a single
+    transaction; projects.json is loaded and saved once.
+    
+    Args:
+        upserts: Dictionary mapping project paths to project metadata
+        removals: Paths of projects to remove
+    
+    Returns:
+        Number of projects removed
+    """
+    upserts = upserts or {}
+    removals = removals or []
+    
+    if get_registry_backend() == "sqlite":
+        return _get_registry_database().update(upserts, removals)
+    
+    registry = load_projects_registry()
+    removed = 0
+    for project_key in removals:
+        if registry.pop(project_key, None) is not None:
+            removed += 1
+    registry.update(upserts)
+    
+    if upserts or removed:
+        save_projects_registry(registry)
+    return removed
+
+
 def register_project(project_path: Path, name: Optional[str] = None) -> Dict[str, any]:
     """
     Register a project in the registry.
@@ -58,11 +135,17 @@ def register_project(project_path: Path, name: Optional[str] = None) -> Dict[str
     Returns:
         Project metadata dictionary
     """
+    project_info = _build_project_info(project_path, name)
+    apply_registry_changes({project_info["path"]: project_info})
+    
+    return project_info
+
+
+def _build_project_info(project_path: Path, name: Optional[str] = None) -> Dict[str, any]:
+    """Build the registry entry for a project."""
     project_path = project_path.resolve()
     project_key = str(project_path)
     
-    registry = load_projects_registry()
-    
     # Get project name
     if name is None:
         name = project_path.name
@@ -81,9 +164,6 @@ def register_project(project_path: Path, name: Optional[str] = None) -> Dict[str
         "health": health,
     }
     
-    registry[project_key] = project_info
-    save_projects_registry(registry)
-    
     return project_info
 
 
@@ -97,54 +177,158 @@ def unregister_project(project_path: Path) -> bool:
     Returns:
         True if project was registered and removed, False otherwise
     """
-    project_path = project_path.resolve()
-    project_key = str(project_path)
+    project_key = str(project_path.resolve())
     
-    registry = load_projects_registry()
-    
-    if project_key not in registry:
-        return False
-    
-    del registry[project_key]
-    save_projects_registry(registry)
-    
-    return True
+    return apply_registry_changes(removals=[project_key]) > 0
 
 
 def get_all_projects() -> List[Dict[str, any]]:
     """
     Get all registered projects with updated metadata.
     
+    Projects are refreshed in parallel (see performance.scan_workers). A
+    project that doesn't finish within performance.scan_timeout keeps its
+    last saved metadata.
+    
     Returns:
-        List of project metadata dictionaries
+        List of project metadata dictionaries (in registry order)
     """
     registry = load_projects_registry()
-    projects = []
+    items = list(registry.items())
     
-    for project_key, project_info in registry.items():
-        project_path = Path(project_key)
-        
+    # Timed-out or failing projects default to "exists, unchanged"
+    refreshed = map_projects(
+        _refresh_project,
+        items,
+        default=lambda item: (True, item[1]),
+    )
+    
+    projects = []
+    missing = []
+    for (project_key, _), (exists, project_info) in zip(items, refreshed):
         # Skip if project no longer exists
-        if not project_path.exists():
+        if not exists:
+            missing.append(project_key)
             continue
-        
-        # Update metadata
-        project_info["last_session"] = get_last_session_info(project_path)
-        project_info["health"] = get_project_health(project_path)
-        
         projects.append(project_info)
     
-    # Remove non-existent projects from registry
-    updated_registry = {
-        key: info for key, info in registry.items()
-        if Path(key).exists()
-    }
-    if len(updated_registry) != len(registry):
-        save_projects_registry(updated_registry)
+    # Remove non-existent projects from registry (only their rows, with SQLite)
+    if missing:
+        apply_registry_changes(removals=missing)
     
     return projects
 
 
+def _refresh_project(item: Tuple[str, Dict]) -> Tuple[bool, Dict]:
+    """Refresh one registry entry; returns (exists, updated project info)."""
+    project_key, project_info = item
+    project_path = Path(project_key)
+    
+    if not project_path.exists():
+        return False, project_info
+    
+    summary = get_project_summary(project_path)
+    project_info = dict(project_info)
+    project_info["last_session"] = summary["last_session"]
+    project_info["health"] = summary["health"]
+    return True, project_info
+
+
+def map_projects(
+    func: Callable[[T], R],
+    items: List[T],
+    default: Optional[Callable[[T], R]] = None,
+) -> List[Optional[R]]:
+    """
+    Apply func to each item using a bounded thread pool.
+    
+    Per-project work is dominated by filesystem calls, which release the GIL,
+    so threads overlap well on slow (e.g. network-mounted) drives. Each item
+    gets performance.scan_timeout from when it starts running; items still
+    running then get the default result, as do queued items once every
+    worker is stuck on a timed-out one.
+    
+    Args:
+        func: Function to apply to each item
+        items: Items to process (typically projects)
+        default: Optional function giving the result for an item that raised
+            or timed out (defaults to None)
+    
+    Returns:
+        Results in the same order as items
+    """
+    workers, timeout = _get_scan_settings()
+    
+    def fallback(item):
+        return default(item) if default else None
+    
+    if workers <= 1 or len(items) <= 1:
+        results = []
+        for item in items:
+            try:
+                results.append(func(item))
+            except Exception:
+                results.append(fallback(item))
+        return results
+    
+    workers = min(workers, len(items))
+    deadlines: Dict[int, float] = {}  # Item index -> when it times out (set once it starts)
+    
+    def run(index: int, item: T) -> R:
+        deadlines[index] = time.monotonic() + timeout
+        return func(item)
+    
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(run, index, item) for index, item in enumerate(items)]
+        pending = set(range(len(futures)))
+        while pending:
+            now = time.monotonic()
+            expired = {index for index in pending if deadlines.get(index, now + 1) <= now}
+            live = pending - expired
+            # A timed-out item still holds its worker; with all of them held, queued items never start
+            if not live or len(expired) >= workers:
+                break
+            running = [deadlines[index] for index in live if index in deadlines]
+            next_deadline = min(running) if running else now + timeout
+            done, _ = wait(
+                [futures[index] for index in live],
+                timeout=max(0.0, next_deadline - now),
+                return_when=FIRST_COMPLETED,
+            )
+            pending -= {index for index in live if futures[index] in done}
+        
+        results = []
+        for item, future in zip(items, futures):
+            if not future.done():
+                # Timed out - isolate it, don't fail the whole scan
+                future.cancel()
+                results.append(fallback(item))
+                continue
+            try:
+                results.append(future.result())
+            except Exception:
+                results.append(fallback(item))
+        return results
+    finally:
+        # Don't block on a project that is still hanging (its git calls time out on their own)
+        try:
+            executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError:  # Python 3.8
+            executor.shutdown(wait=False)
+
+
+def _get_scan_settings() -> Tuple[int, float]:
+    """Read worker count and per-project timeout from configuration."""
+    defaults = DEFAULT_CONFIG["performance"]
+    try:
+        workers = int(get_config_value("performance.scan_workers") or defaults["scan_workers"])
+        timeout = float(get_config_value("performance.scan_timeout") or defaults["scan_timeout"])
+    except (ImportError, TypeError, ValueError):
+        workers, timeout = defaults["scan_workers"], defaults["scan_timeout"]
+    return max(1, workers), max(0.1, timeout)
+
+
 def get_last_session_info(project_path: Path) -> Optional[Dict[str, any]]:
     """
     Get information about the last session for a project.
@@ -185,31 +369,105 @@ def get_project_health(project_path: Path) -> str:
     if not roadmap_file.exists():
         return "unknown"
     
-    # Check last session date
+    # Check last session date (history is cached, so this doesn't re-read it)
+    last_session = get_last_session_info(project_path)
+    if last_session and last_session.get("date"):
+        try:
+            last_date = datetime.fromisoformat(last_session["date"].replace("Z", "+00:00"))
+            days_ago = (datetime.now(last_date.tzinfo) - last_date).days
+            
+            if days_ago > 30:
+                return "stale"
+            elif days_ago > 7:
+                return "inactive"
+            else:
+                return "healthy"
+        except Exception:
+            pass
+    
+    return "unknown"
+
+
+def get_project_summary(project_path: Path) -> Dict[str, any]:
+    """
+    Get a project's derived summary: last session, health and session counts.
+    
+    The summary is kept in the project's .roadmapper/cache/summary.json
+    (which `roadmapper watch` refreshes as files change) and recomputed only
+    when history.jsonl or PROJECT_ROADMAP.md changed or the hour changed
+    (health and recent counts depend on the current time).
+    
+    Args:
+        project_path: Path to project root
+    
+    Returns:
+        Dictionary with last_session, health, total_sessions,
+        sessions_last_7_days and sessions_last_30_days
+    """
     try:
-        stats = get_session_stats(project_path)
-        if stats.get("total_sessions", 0) == 0:
-            return "unknown"
-        
-        # Check if last session was within 30 days
-        last_session = get_last_session_info(project_path)
-        if last_session and last_session.get("date"):
-            try:
-                last_date = datetime.fromisoformat(last_session["date"].replace("Z", "+00:00"))
-                days_ago = (datetime.now(last_date.tzinfo) - last_date).days
-                
-                if days_ago > 30:
-                    return "stale"
-                elif days_ago > 7:
-                    return "inactive"
-                else:
-                    return "healthy"
-            except Exception:
-                pass
+        cached = json.loads(read_text_file(_get_project_summary_file(project_path)))
+        if cached.get("fingerprint") == _get_summary_fingerprint(project_path):
+            return cached["summary"]
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError, AttributeError, KeyError):
+        pass
+    
+    return refresh_project_summary(project_path)
+
+
+def refresh_project_summary(project_path: Path) -> Dict[str, any]:
+    """
+    Recompute a project's summary and save it (see get_project_summary).
+    
+    Args:
+        project_path: Path to project root
+    
+    Returns:
+        Summary dictionary
+    """
+    fingerprint = _get_summary_fingerprint(project_path)
+    summary = {
+        "last_session": get_last_session_info(project_path),
+        "health": get_project_health(project_path),
+        "total_sessions": 0,
+        "sessions_last_7_days": 0,
+        "sessions_last_30_days": 0,
+    }
+    
+    try:
+        # Counts are bisections over the cached timestamp array
+        history = load_history(project_path)
+        now = datetime.now()
+        summary["total_sessions"] = len(history)
+        summary["sessions_last_7_days"] = history.count_since(now - timedelta(days=8))
+        summary["sessions_last_30_days"] = history.count_since(now - timedelta(days=31))
     except Exception:
         pass
     
-    return "unknown"
+    try:
+        summary_file = _get_project_summary_file(project_path)
+        tmp_file = summary_file.with_suffix(".tmp")
+        tmp_file.write_text(
+            json.dumps({"fingerprint": fingerprint, "summary": summary}, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp_file, summary_file)
+    except OSError:
+        pass  # Still usable for this call
+    
+    return summary
+
+
+def _get_project_summary_file(project_path: Path) -> Path:
+    return get_project_cache_dir(project_path) / "summary.json"
+
+
+def _get_summary_fingerprint(project_path: Path) -> List:
+    """What a project summary depends on (as stored in JSON)."""
+    keys = [
+        stat_key(project_path / ".roadmapper" / "history.jsonl"),
+        stat_key(project_path / "PROJECT_ROADMAP.md"),
+    ]
+    return [datetime.now().strftime("%Y-%m-%dT%H")] + [list(key) if key else None for key in keys]
 
 
 def discover_projects(search_paths: Optional[List[Path]] = None) -> List[Path]:
@@ -265,14 +523,17 @@ def update_project_registry() -> int:
     """
     registry = load_projects_registry()
     discovered = discover_projects()
-    new_count = 0
+    new_projects = {}
     
     for project_path in discovered:
         project_key = str(project_path.resolve())
         
-        if project_key not in registry:
-            register_project(project_path)
-            new_count += 1
+        if project_key not in registry and project_key not in new_projects:
+            new_projects[project_key] = _build_project_info(project_path)
+    
+    # One registry write for the whole batch
+    if new_projects:
+        apply_registry_changes(new_projects)
     
-    return new_count
+    return len(new_projects)
 
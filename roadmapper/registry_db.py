@@ -0,0 +1,180 @@
+"""SQLite storage for the project registry.
+
+Used instead of projects.json when storage.registry is "sqlite". Each
+project is one row, so registering or removing a project writes only that
+row instead of rewriting the whole registry, and a batch of changes is one
+transaction. The database runs in WAL mode, so readers (dashboard, watch)
+never block a writer.
+
+Full project metadata is kept as JSON in the `info` column; name, health
+and last session date are also stored in their own columns for ad-hoc
+queries (they are not indexed, as roadmapper only looks projects up by path).
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+# Bump when the table layout changes (and add the upgrade to _create)
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    name TEXT,
+    health TEXT,
+    last_session_date TEXT,
+    info TEXT NOT NULL
+);
+"""
+
+
+class RegistryDatabase:
+    """
+    The project registry in a SQLite database.
+
+    A connection is opened per operation, so one RegistryDatabase can be used
+    from several threads (see projects.map_projects).
+    """
+
+    def __init__(self, db_file: Path):
+        self.db_file = db_file
+
+    @classmethod
+    def open(cls, db_file: Path, json_file: Optional[Path] = None) -> "RegistryDatabase":
+        """
+        Open (creating if needed) a registry database.
+
+        A new database is filled from json_file if that exists, which is then
+        renamed to projects.json.migrated so it can't drift out of sync.
+
+        Args:
+            db_file: Path to database file
+            json_file: projects.json to migrate from
+
+        Returns:
+            RegistryDatabase
+
+        Raises:
+            RuntimeError: If the database was written by a newer roadmapper
+        """
+        database = cls(db_file)
+        created = not db_file.exists()
+        database._create()
+
+        if created and json_file is not None and json_file.exists():
+            try:
+                registry = json.loads(json_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                registry = None
+            if isinstance(registry, dict):
+                database.update(registry)
+                try:
+                    os.replace(json_file, json_file.with_name(json_file.name + ".migrated"))
+                except OSError:
+                    pass
+
+        return database
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.db_file), timeout=10)
+        connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL
+        return connection
+
+    def _create(self) -> None:
+        """
+        Create (or upgrade) the schema and switch to WAL mode (both persist in the file).
+
+        Raises:
+            RuntimeError: If the database was written by a newer roadmapper
+        """
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"{self.db_file} was written by a newer roadmapper (schema version {version});"
+                    " upgrade roadmapper to use it"
+                )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            connection.commit()
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Load every project.
+
+        Returns:
+            Dictionary mapping project paths to project metadata (sorted by path)
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT path, info FROM projects ORDER BY path").fetchall()
+
+        registry = {}
+        for path, info in rows:
+            try:
+                registry[path] = json.loads(info)
+            except ValueError:
+                continue
+        return registry
+
+    def update(self, upserts: Optional[Dict[str, Dict]] = None, removals: Iterable[str] = ()) -> int:
+        """
+        Add or replace and remove projects in one transaction.
+
+        Args:
+            upserts: Dictionary mapping project paths to project metadata
+            removals: Paths of projects to remove
+
+        Returns:
+            Number of projects removed
+        """
+        rows = [_to_row(path, project_info) for path, project_info in (upserts or {}).items()]
+        removals = [(path,) for path in removals]
+
+        with closing(self._connect()) as connection:
+            with connection:
+                if rows:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO projects (path, name, health, last_session_date, info)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                removed = 0
+                if removals:
+                    removed = connection.executemany(
+                        "DELETE FROM projects WHERE path = ?", removals
+                    ).rowcount
+            # Copy into the main file so its mtime tells watchers the registry changed
+            connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+        return removed
+
+    def replace(self, registry: Dict[str, Dict]) -> None:
+        """
+        Make the stored registry equal to `registry`, in one transaction.
+
+        Args:
+            registry: Dictionary mapping project paths to project metadata
+        """
+        with closing(self._connect()) as connection:
+            stored = {path for (path,) in connection.execute("SELECT path FROM projects")}
+
+        self.update(registry, stored - set(registry))
+
+
+def _to_row(path: str, project_info: Dict) -> tuple:
+    """Table row for a project's metadata."""
+    last_session = project_info.get("last_session") or {}
+    return (
+        path,
+        project_info.get("name"),
+        project_info.get("health"),
+        last_session.get("date"),
+        json.dumps(project_info, sort_keys=True),
+    )
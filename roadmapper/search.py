@@ -1,14 +1,12 @@
 """Cross-project search functionality."""
 
-import json
 import re
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime
 
 from roadmapper.projects import get_all_projects
 from roadmapper.utils import read_text_file
-from roadmapper.history import read_history
+from roadmapper.search_index import FILE_TYPES, load_search_index
 
 
 class SearchResult:
@@ -102,21 +100,11 @@ def search_projects(
             continue
         
         project_name = project_names.get(str(project_path), project_path.name)
+        results.extend(_search_project(project_path, project_name, query, pattern, file_types))
         
-        # Search session files
-        if "session" in file_types:
-            session_results = _search_sessions(project_path, project_name, pattern)
-            results.extend(session_results)
-        
-        # Search roadmap
-        if "roadmap" in file_types:
-            roadmap_results = _search_roadmap(project_path, project_name, pattern)
-            results.extend(roadmap_results)
-        
-        # Search history
-        if "history" in file_types:
-            history_results = _search_history(project_path, project_name, pattern)
-            results.extend(history_results)
+        # Stop early once enough results are collected
+        if len(results) >= max_results:
+            break
     
     # Limit results
     if len(results) > max_results:
@@ -125,125 +113,82 @@ def search_projects(
     return results
 
 
-def _search_sessions(
+def _search_project(
     project_path: Path,
     project_name: str,
+    query: str,
     pattern: re.Pattern,
+    file_types: List[str],
 ) -> List[SearchResult]:
-    """Search session files in a project."""
+    """
+    Search one project using its inverted index.
+    
+    Only files with candidate lines are read, and only those lines are
+    checked against the search pattern.
+    """
     results = []
     
-    # Search current session files
-    for session_file in project_path.glob("SESSION_*.md"):
-        try:
-            content = read_text_file(session_file)
-            matches = _find_matches(content, pattern)
-            if matches:
-                results.append(SearchResult(
-                    project_name=project_name,
-                    project_path=project_path,
-                    file_path=session_file,
-                    file_type="session",
-                    matches=matches,
-                ))
-        except Exception:
-            continue
+    index = load_search_index(project_path)
+    candidates = index.candidates(query)
     
-    # Search archived sessions
-    archive_dir = project_path / "docs" / "archive" / "sessions"
-    if archive_dir.exists():
-        for session_file in archive_dir.glob("SESSION_*.md"):
+    for file_type in FILE_TYPES:
+        if file_type not in file_types:
+            continue
+        
+        for rel_path, info in sorted(index.files.items()):
+            if info["type"] != file_type:
+                continue
+            
+            if candidates is None:
+                line_nums = None  # No word tokens in query, check every line
+            elif rel_path in candidates:
+                line_nums = sorted(candidates[rel_path])
+            else:
+                continue
+            
+            file_path = project_path / rel_path
             try:
-                content = read_text_file(session_file)
-                matches = _find_matches(content, pattern)
-                if matches:
-                    results.append(SearchResult(
-                        project_name=project_name,
-                        project_path=project_path,
-                        file_path=session_file,
-                        file_type="session",
-                        matches=matches,
-                    ))
+                content = read_text_file(file_path)
             except Exception:
                 continue
-    
-    return results
-
-
-def _search_roadmap(
-    project_path: Path,
-    project_name: str,
-    pattern: re.Pattern,
-) -> List[SearchResult]:
-    """Search roadmap file in a project."""
-    results = []
-    
-    roadmap_file = project_path / "PROJECT_ROADMAP.md"
-    if roadmap_file.exists():
-        try:
-            content = read_text_file(roadmap_file)
-            matches = _find_matches(content, pattern)
+            
+            matches = _find_matches(content, pattern, line_nums)
             if matches:
                 results.append(SearchResult(
                     project_name=project_name,
                     project_path=project_path,
-                    file_path=roadmap_file,
-                    file_type="roadmap",
+                    file_path=file_path,
+                    file_type=file_type,
                     matches=matches,
                 ))
-        except Exception:
-            pass
     
     return results
 
 
-def _search_history(
-    project_path: Path,
-    project_name: str,
+def _find_matches(
+    content: str,
     pattern: re.Pattern,
-) -> List[SearchResult]:
-    """Search history file in a project."""
-    results = []
-    
-    try:
-        history_records = read_history(project_path)
-        if not history_records:
-            return results
-        
-        # Convert history records to text for searching
-        history_text = "\n".join([
-            json.dumps(record, indent=2) for record in history_records
-        ])
-        
-        matches = _find_matches(history_text, pattern)
-        if matches:
-            history_file = project_path / ".roadmapper" / "history.jsonl"
-            results.append(SearchResult(
-                project_name=project_name,
-                project_path=project_path,
-                file_path=history_file,
-                file_type="history",
-                matches=matches,
-            ))
-    except Exception:
-        pass
-    
-    return results
-
-
-def _find_matches(content: str, pattern: re.Pattern) -> List[Tuple[int, str]]:
+    line_nums: Optional[List[int]] = None,
+) -> List[Tuple[int, str]]:
     """
     Find all matches of pattern in content.
     
+    Args:
+        content: Text to search
+        pattern: Compiled search pattern
+        line_nums: Optional line numbers to check (defaults to every line)
+    
     Returns:
         List of (line_number, line_content) tuples
     """
     matches = []
     lines = content.split("\n")
     
-    for line_num, line in enumerate(lines):
-        if pattern.search(line):
-            matches.append((line_num, line))
+    if line_nums is None:
+        line_nums = range(len(lines))
+    
+    for line_num in line_nums:
+        if line_num < len(lines) and pattern.search(lines[line_num]):
+            matches.append((line_num, lines[line_num]))
     
     return matches
-
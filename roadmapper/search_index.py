@@ -0,0 +1,232 @@
+"""Persistent inverted index backing cross-project search."""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from roadmapper.paths import get_project_cache_dir, list_session_files
+from roadmapper.utils import read_text_file
+
+
+# Bump when the on-disk layout or tokenization changes
+INDEX_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Search order for file types (matches the order results were always reported in)
+FILE_TYPES = ("session", "roadmap", "history")
+
+
+def get_search_index_file(project_path: Path) -> Path:
+    """Get path to a project's search index (.roadmapper/cache/search_index.json)."""
+    return get_project_cache_dir(project_path) / "search_index.json"
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Set of unique tokens
+    """
+    return set(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def iter_searchable_files(project_path: Path) -> Iterator[Tuple[str, str, Path]]:
+    """
+    Yield the files that search covers in a project.
+
+    Args:
+        project_path: Path to project root
+
+    Yields:
+        Tuples of (relative_path, file_type, absolute_path)
+    """
+    for session_file in list_session_files(project_path):
+        yield session_file.relative_to(project_path).as_posix(), "session", session_file
+
+    roadmap_file = project_path / "PROJECT_ROADMAP.md"
+    if roadmap_file.exists():
+        yield "PROJECT_ROADMAP.md", "roadmap", roadmap_file
+
+    history_file = project_path / ".roadmapper" / "history.jsonl"
+    if history_file.exists():
+        yield ".roadmapper/history.jsonl", "history", history_file
+
+
+class SearchIndex:
+    """
+    Token -> file/line postings for one project.
+
+    Files are fingerprinted by mtime and size, so refresh() only re-reads
+    files that were added or changed since the index was last saved.
+    """
+
+    def __init__(
+        self,
+        project_path: Path,
+        files: Optional[Dict[str, Dict]] = None,
+        postings: Optional[Dict[str, Dict[str, List[int]]]] = None,
+    ):
+        self.project_path = project_path
+        self.files = files or {}  # relative path -> {"type", "mtime", "size"}
+        self.postings = postings or {}  # token -> {relative path: [line numbers]}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, project_path: Path) -> "SearchIndex":
+        """Load a project's index from disk (empty index if missing or outdated)."""
+        try:
+            index_file = get_search_index_file(project_path)
+            if index_file.exists():
+                data = json.loads(read_text_file(index_file))
+                if data.get("version") == INDEX_VERSION:
+                    return cls(project_path, data.get("files"), data.get("postings"))
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            pass
+
+        return cls(project_path)
+
+    def save(self) -> None:
+        """Write the index to disk if it changed (fails silently if not writable)."""
+        if not self.dirty:
+            return
+
+        try:
+            index_file = get_search_index_file(self.project_path)
+            content = json.dumps(
+                {"version": INDEX_VERSION, "files": self.files, "postings": self.postings},
+                separators=(",", ":"),
+            )
+            tmp_file = index_file.with_suffix(".tmp")
+            tmp_file.write_text(content, encoding="utf-8")
+            os.replace(tmp_file, index_file)
+            self.dirty = False
+        except OSError:
+            pass
+
+    def refresh(self) -> bool:
+        """
+        Bring the index up to date with the files on disk.
+
+        Returns:
+            True if anything was re-indexed or removed
+        """
+        current = {}
+        for rel_path, file_type, file_path in iter_searchable_files(self.project_path):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            current[rel_path] = (file_type, file_path, stat.st_mtime_ns, stat.st_size)
+
+        stale = set()
+        for rel_path, info in self.files.items():
+            entry = current.get(rel_path)
+            if entry is None or (entry[2], entry[3]) != (info["mtime"], info["size"]):
+                stale.add(rel_path)
+
+        if stale:
+            self._remove_files(stale)
+
+        added = False
+        for rel_path, (file_type, file_path, mtime, size) in current.items():
+            if rel_path not in self.files:
+                self._add_file(rel_path, file_type, file_path, mtime, size)
+                added = True
+
+        if stale or added:
+            self.dirty = True
+        return self.dirty
+
+    def _remove_files(self, rel_paths: Set[str]) -> None:
+        """Drop files and all their postings."""
+        for rel_path in rel_paths:
+            self.files.pop(rel_path, None)
+
+        for token in list(self.postings):
+            file_postings = self.postings[token]
+            for rel_path in rel_paths:
+                file_postings.pop(rel_path, None)
+            if not file_postings:
+                del self.postings[token]
+
+    def _add_file(self, rel_path: str, file_type: str, file_path: Path, mtime: int, size: int) -> None:
+        """Tokenize a file and add its postings."""
+        self.files[rel_path] = {"type": file_type, "mtime": mtime, "size": size}
+
+        try:
+            content = read_text_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            return  # Unreadable files stay listed (so they aren't retried) but never match
+
+        for line_num, line in enumerate(content.split("\n")):
+            for token in tokenize(line):
+                self.postings.setdefault(token, {}).setdefault(rel_path, []).append(line_num)
+
+    def candidates(self, query: str) -> Optional[Dict[str, Set[int]]]:
+        """
+        Find lines that may contain the query.
+
+        A line is a candidate when every query token is a substring of some
+        token on that line, which is necessary (not sufficient) for the line to
+        contain the query. Callers must verify candidates against the file.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Mapping of relative path to candidate line numbers, or None when the
+            query has no word tokens and every line is a candidate
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return None
+
+        result: Optional[Dict[str, Set[int]]] = None
+
+        # Rarest-looking (longest) tokens first narrows the intersection fastest
+        for query_token in sorted(query_tokens, key=len, reverse=True):
+            token_lines: Dict[str, Set[int]] = {}
+            for token, file_postings in self.postings.items():
+                if query_token not in token:
+                    continue
+                for rel_path, line_nums in file_postings.items():
+                    if result is not None and rel_path not in result:
+                        continue
+                    token_lines.setdefault(rel_path, set()).update(line_nums)
+
+            if result is None:
+                result = token_lines
+            else:
+                result = {
+                    rel_path: lines & result[rel_path]
+                    for rel_path, lines in token_lines.items()
+                    if lines & result[rel_path]
+                }
+
+            if not result:
+                return {}
+
+        return result
+
+
+def load_search_index(project_path: Path) -> SearchIndex:
+    """
+    Load a project's search index and bring it up to date.
+
+    Args:
+        project_path: Path to project root
+
+    Returns:
+        Refreshed SearchIndex (saved back to disk if anything changed)
+    """
+    index = SearchIndex.load(project_path)
+    if index.refresh():
+        index.save()
+    return index
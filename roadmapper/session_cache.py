@@ -0,0 +1,207 @@
+"""Persistent cache of parsed session files.
+
+summarize, commit-msg, close and knowledge indexing all extract data from
+the same session files. Extracted data is kept per project in
+.roadmapper/cache/sessions.bin, keyed by the SHA-256 of the file content, so
+a file is only parsed again after it changes. Archived sessions never
+change, so after the first pass they are never re-parsed.
+"""
+
+import hashlib
+import marshal
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+from roadmapper.paths import get_project_cache_dir, get_project_root
+from roadmapper.session_parser import SessionDocument, parse_session
+from roadmapper.utils import read_text_file
+
+
+# Bump when the on-disk layout or any cached extractor's output changes
+CACHE_VERSION = 1
+
+# Marshal format used for the cache file (stable across Python 3 releases)
+_MARSHAL_VERSION = 4
+
+_caches: Dict[str, "SessionCache"] = {}
+_batch_depth = 0
+
+
+def get_session_cache_file(project_root: Path) -> Path:
+    """Get path to a project's parsed-session cache (.roadmapper/cache/sessions.bin)."""
+    return get_project_cache_dir(project_root) / "sessions.bin"
+
+
+class SessionCache:
+    """
+    Content hash -> extracted data for one project's session files.
+
+    Files are fingerprinted by mtime and size, so an unchanged file is not
+    even read to find its hash. Entries whose content no file has any more
+    are dropped when the file that had it changes.
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[Path],
+        files: Optional[Dict[str, list]] = None,
+        entries: Optional[Dict[str, Dict[str, object]]] = None,
+    ):
+        self.cache_file = cache_file  # None: keep in memory only
+        self.files = files or {}  # file path -> [mtime, size, content hash]
+        self.entries = entries or {}  # content hash -> {kind: extracted data}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, cache_file: Optional[Path]) -> "SessionCache":
+        """Load a cache from disk (empty cache if missing, outdated or corrupt)."""
+        if cache_file is None:
+            return cls(None)
+
+        try:
+            with cache_file.open("rb") as f:
+                data = marshal.load(f)
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                return cls(cache_file, data.get("files"), data.get("entries"))
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        return cls(cache_file)
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed (fails silently if not writable)."""
+        if not self.dirty or self.cache_file is None:
+            return
+
+        try:
+            data = {"version": CACHE_VERSION, "files": self.files, "entries": self.entries}
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            with tmp_file.open("wb") as f:
+                marshal.dump(data, f, _MARSHAL_VERSION)
+            os.replace(tmp_file, self.cache_file)
+            self.dirty = False
+        except (OSError, ValueError):
+            pass
+
+    def get(self, session_file: Path, kind: str, extract: Callable[[SessionDocument], object]) -> object:
+        """
+        Get extracted data for a session file, parsing it only on a cache miss.
+
+        Args:
+            session_file: Path to session file
+            kind: Name of the extraction (e.g. "summary"); each kind is cached
+                separately for the same content
+            extract: Builds the data from the parsed document. The result must
+                be made of dicts, lists, strings and numbers only.
+
+        Returns:
+            Extracted data (shared with the cache - treat as read-only)
+
+        Raises:
+            OSError, UnicodeDecodeError: If the file can't be read
+        """
+        file_key = str(session_file)
+        stat = session_file.stat()
+        fingerprint = [stat.st_mtime_ns, stat.st_size]
+
+        record = self.files.get(file_key)
+        content = None
+        if record is not None and record[:2] == fingerprint:
+            content_hash = record[2]
+        else:
+            content = read_text_file(session_file)
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            self._set_file(file_key, fingerprint, content_hash)
+
+        entry = self.entries.get(content_hash)
+        if entry is not None and kind in entry:
+            return entry[kind]
+
+        if content is None:
+            content = read_text_file(session_file)
+        data = extract(parse_session(content))
+        self.entries.setdefault(content_hash, {})[kind] = data
+        self.dirty = True
+        return data
+
+    def _set_file(self, file_key: str, fingerprint: list, content_hash: str) -> None:
+        """Record a file's fingerprint, dropping the entry for its old content if now unused."""
+        old = self.files.get(file_key)
+        self.files[file_key] = fingerprint + [content_hash]
+        self.dirty = True
+
+        if old is None or old[2] == content_hash:
+            return
+        if not any(record[2] == old[2] for record in self.files.values()):
+            self.entries.pop(old[2], None)
+
+
+def get_session_cache(session_file: Path) -> SessionCache:
+    """
+    Get the cache for the project a session file belongs to.
+
+    Caches are loaded once per process. Session files outside any project
+    get a memory-only cache.
+
+    Args:
+        session_file: Path to session file
+
+    Returns:
+        SessionCache
+    """
+    project_root = get_project_root(session_file.parent)
+    key = str(project_root) if project_root is not None else ""
+
+    cache = _caches.get(key)
+    if cache is None:
+        cache_file = None
+        if project_root is not None:
+            try:
+                cache_file = get_session_cache_file(project_root)
+            except OSError:
+                pass  # Read-only project - cache in memory only
+        cache = SessionCache.load(cache_file)
+        _caches[key] = cache
+    return cache
+
+
+def get_parsed(session_file: Path, kind: str, extract: Callable[[SessionDocument], object]) -> object:
+    """
+    Get extracted data for a session file through its project's cache.
+
+    The cache is written back straight away, unless inside batch().
+
+    Args:
+        session_file: Path to session file
+        kind: Name of the extraction
+        extract: Builds the data from the parsed document
+
+    Returns:
+        Extracted data (treat as read-only)
+    """
+    cache = get_session_cache(session_file)
+    data = cache.get(session_file, kind, extract)
+    if _batch_depth == 0:
+        cache.save()
+    return data
+
+
+@contextmanager
+def batch() -> Iterator[None]:
+    """Defer cache writes until the outermost batch() block exits."""
+    global _batch_depth
+    _batch_depth += 1
+    try:
+        yield
+    finally:
+        _batch_depth -= 1
+        if _batch_depth == 0:
+            for cache in _caches.values():
+                cache.save()
+
+
+def clear_session_cache() -> None:
+    """Forget all loaded caches (e.g. for long-running processes)."""
+    _caches.clear()
@@ -6,7 +6,11 @@ from datetime import datetime
 
 from roadmapper.paths import get_project_root
 from roadmapper.utils import read_text_file, write_text_file
-from roadmapper.summarize import extract_session_summary, generate_roadmap_summary
+from roadmapper.summarize import (
+    extract_session_frontmatter,
+    extract_session_summary,
+    generate_roadmap_summary,
+)
 from roadmapper.context import add_session_summary
 
 
@@ -47,11 +51,8 @@ def close_session(
     session_data = extract_session_summary(session_file)
     session_id = session_file.stem
     
-    # Read session file for metadata
-    session_content = read_text_file(session_file)
-    
     # Extract YAML frontmatter if present
-    metadata = _extract_yaml_frontmatter(session_content)
+    metadata = extract_session_frontmatter(session_file)
     project_name = metadata.get("project", "Unknown Project")
     phase = metadata.get("phase", "Unknown Phase")
     
@@ -128,25 +129,6 @@ def close_session(
     }
 
 
-def _extract_yaml_frontmatter(content: str) -> Dict[str, str]:
-    """Extract YAML frontmatter from session file."""
-    metadata = {}
-    
-    if content.startswith("---"):
-        # Extract YAML frontmatter
-        parts = content.split("---", 2)
-        if len(parts) >= 3:
-            yaml_content = parts[1].strip()
-            for line in yaml_content.split("\n"):
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    metadata[key] = value
-    
-    return metadata
-
-
 def _suggest_next_goals(
     project_root: Path,
     session_data: Dict,
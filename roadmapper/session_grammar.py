@@ -0,0 +1,129 @@
+"""Compiled regular expressions for the session file format.
+
+Every module that reads session files (summaries, knowledge extraction,
+documentation checks, session closing) shares these patterns, so each is
+compiled once at import time instead of on every call. Section structure
+comes from session_parser; the patterns here match headings and single
+lines within it.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Pattern
+
+
+# --- Section headings (matched against the text after a heading's #'s) -----
+
+ACCOMPLISHMENTS_HEADING = re.compile(r"\s*✅\s*Session Accomplishments", re.IGNORECASE)
+WORK_LOG_HEADING = re.compile(r"\s*🔧\s*Work Log", re.IGNORECASE)
+
+
+@lru_cache(maxsize=32)
+def heading_pattern(section_name: str) -> Pattern:
+    """
+    Get the heading pattern for a "## <name>" section.
+
+    Args:
+        section_name: Heading text (regex syntax allowed)
+
+    Returns:
+        Compiled pattern to match against a heading's text
+    """
+    return re.compile(rf"\s*{section_name}", re.IGNORECASE)
+
+
+# --- Block labels -------------------------------------------------------------
+
+# "Completed:" ... up to "In Progress:" / "Deferred:" / "Discoveries:"
+COMPLETED_LABEL = re.compile(r"Completed:", re.IGNORECASE)
+COMPLETED_END = re.compile(r"In Progress:|Deferred:|Discoveries:", re.IGNORECASE)
+
+# "**Completed:**" alone on its line
+COMPLETED_BOLD_LABEL = re.compile(r"^\*\*Completed:\*\*[^\S\n]*$", re.MULTILINE | re.IGNORECASE)
+
+DISCOVERIES_LABEL = re.compile(r"Discoveries:", re.IGNORECASE)
+
+
+# --- Line patterns ------------------------------------------------------------
+
+# "- ✅ item" (also mid-line, e.g. "Phase 4.1 - ✅ Complete")
+CHECKED_LINE = re.compile(r"[-*]\s*✅\s*(.+)")
+
+# "- ✅ item" across a block of text (item may not span lines)
+CHECKED_ITEM = re.compile(r"[-*]\s*✅\s*(.+?)(?=\n[-*]|\n##|\Z)", re.MULTILINE)
+
+# "- [x] item" or "- ✅ item" on a single stripped line
+CHECKBOX_LINE = re.compile(r"^-\s*(\[x\]|✅)\s+(.+)$", re.IGNORECASE)
+
+# "- **Title** - description"
+BOLD_DASH_LINE = re.compile(r"[-*]\s*\*\*(.+?)\*\*\s*[-–—]\s*(.+)")
+
+# "- **Title**"
+BOLD_ITEM = re.compile(r"[-*]\s*\*\*(.+?)\*\*")
+
+
+# --- Inline markup ----------------------------------------------------------
+
+BOLD = re.compile(r"\*\*([^*]+)\*\*")
+INLINE_CODE = re.compile(r"`([^`]+)`")
+
+
+# --- Reasoning markers and structured tasks ---------------------------------
+
+# 🧭 DECISION: text up to the next marker or end of line
+DECISION_MARKER = re.compile(
+    r"🧭[^\S\n]*DECISION:[^\S\n]*(.+?)(?=🧭|🤔|✅|⚠️|💡|$)", re.MULTILINE | re.IGNORECASE
+)
+
+# [TASK] / [STATUS] / [NOTES] field markers (only count at the start of a line)
+TASK_FIELD = re.compile(r"\[(TASK|STATUS|NOTES)\]", re.IGNORECASE)
+
+# Work log insight lines ("Learned: ...", "**Title**: ...")
+INSIGHT_PATTERNS: List[Pattern] = [
+    re.compile(
+        r"(?:Learn|Learned|Discovery|Found|Key insight|Insight|Important|Note|Remember):\s*(.+?)(?:\n|$)",
+        re.IGNORECASE | re.MULTILINE,
+    ),
+    re.compile(r"\*\*(.+?)\*\*:\s*(.+?)(?:\n|$)", re.IGNORECASE | re.MULTILINE),
+]
+
+
+# --- Roadmap ----------------------------------------------------------------
+
+PHASE_PROGRESS = re.compile(r"Phase Progress:.*?🔵 Phase (\d+[\.\d]*):\s*([^\n]+)", re.DOTALL)
+ACTIVE_PHASE = re.compile(r"🔵 Phase (\d+[\.\d]*):\s*([^\n]+)")
+
+FEATURE_PATTERNS: List[Pattern] = [
+    re.compile(r"roadmapper (\w+)", re.IGNORECASE),
+    re.compile(r"`roadmapper (\w+)`", re.IGNORECASE),
+    re.compile(r"roadmapper\.(\w+)", re.IGNORECASE),
+]
+
+
+@lru_cache(maxsize=32)
+def phase_status_patterns(phase_name: str) -> List[Pattern]:
+    """
+    Get the status patterns (Complete / In Progress / Planning) for a phase.
+
+    Args:
+        phase_name: Phase name as it appears in the roadmap (e.g. "Phase 4")
+
+    Returns:
+        Compiled patterns in priority order
+    """
+    return [
+        re.compile(rf"{phase_name}.*?✅.*?Complete", re.IGNORECASE | re.DOTALL),
+        re.compile(rf"{phase_name}.*?🔵.*?In Progress", re.IGNORECASE | re.DOTALL),
+        re.compile(rf"{phase_name}.*?🟡.*?Planning", re.IGNORECASE | re.DOTALL),
+    ]
+
+
+@lru_cache(maxsize=32)
+def phase_section_pattern(phase_number: str) -> Pattern:
+    """Get the pattern for a "Phase X.Y.Z" section up to the next phase."""
+    return re.compile(rf"Phase {phase_number}.*?(?=Phase |\Z)", re.DOTALL | re.IGNORECASE)
+
+
+# --- Commit messages --------------------------------------------------------
+
+SUBJECT_PREFIX = re.compile(r"^(Completed|Added|Created|Implemented|Fixed):?\s*", re.IGNORECASE)
@@ -0,0 +1,310 @@
+"""Single-pass parser that turns a session file into a section tree.
+
+The extractors in summarize.py and knowledge.py used to locate their
+sections by running DOTALL regexes over the whole session text, once per
+extractor. parse_session() scans the text once and records everything they
+need: frontmatter, "##" sections (nested by level), list items, 🧭 DECISION
+markers and [TASK]/[STATUS]/[NOTES] blocks.
+"""
+
+import re
+from bisect import bisect_right
+from heapq import merge
+from itertools import accumulate
+from operator import add
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+from roadmapper import session_grammar as grammar
+
+
+class ListItem:
+    """A "- item" / "* item" line inside a section."""
+
+    def __init__(self, line: int, indent: int, marker: str, text: str):
+        self.line = line  # Index into SessionDocument.lines
+        self.indent = indent
+        self.marker = marker
+        self.text = text
+
+
+class Section:
+    """
+    A "##" heading and the lines directly under it.
+
+    A section's lines stop at the next "##"-or-deeper heading; deeper
+    headings become children, so the full subtree is available via children.
+    """
+
+    def __init__(self, document: "SessionDocument", level: int, heading: str, line: int):
+        self.document = document
+        self.level = level
+        self.heading = heading  # Heading text after the leading #'s (not stripped)
+        self.line = line  # Index of the heading line
+        self.end = line + 1  # Index after the last body line (set by parse_session)
+        self.parent: Optional["Section"] = None
+        self.children: List["Section"] = []
+        self._items: Optional[List[ListItem]] = None
+
+    @property
+    def title(self) -> str:
+        """Heading text without #'s or surrounding whitespace."""
+        return self.heading.strip()
+
+    @property
+    def lines(self) -> List[str]:
+        """Body lines (between this heading and the next one)."""
+        return self.document.lines[self.line + 1:self.end]
+
+    @property
+    def text(self) -> str:
+        """Body text (between this heading and the next one)."""
+        return "\n".join(self.lines)
+
+    @property
+    def content_end(self) -> int:
+        """
+        Index after the last line of the section's content.
+
+        Same as end, except that a heading directly followed by a subheading
+        (no lines of its own) takes that first subsection as its content.
+        """
+        if self.end == self.line + 1 and self.children and self.children[0].line == self.end:
+            return self.children[0].end
+        return self.end
+
+    @property
+    def content(self) -> str:
+        """Content text (see content_end)."""
+        return "\n".join(self.document.lines[self.line + 1:self.content_end])
+
+    @property
+    def items(self) -> List[ListItem]:
+        """List items in the content, including nested ones."""
+        if self._items is None:
+            self._items = []
+            for line_num in range(self.line + 1, self.content_end):
+                raw = self.document.lines[line_num]
+                stripped = raw.strip()
+                # Markdown list items need whitespace after the marker
+                if stripped[:1] in ("-", "*") and stripped[1:2].isspace():
+                    self._items.append(ListItem(
+                        line_num,
+                        len(raw) - len(raw.lstrip()),
+                        stripped[0],
+                        stripped[1:].strip(),
+                    ))
+        return self._items
+
+
+class SessionDocument:
+    """Parsed session file: lines, frontmatter, section tree, markers and tasks."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.split("\n")
+        self.frontmatter: Dict[str, str] = {}
+        self.sections: List[Section] = []  # Every section, in document order
+        self.decisions: List[str] = []
+        self.tasks: List[Dict[str, str]] = []
+        self._line_offsets: Optional[List[int]] = None
+
+    @property
+    def roots(self) -> List[Section]:
+        """Top-level sections of the tree."""
+        return [section for section in self.sections if section.parent is None]
+
+    def find_section(self, heading_pattern: Pattern) -> Optional[Section]:
+        """
+        Find the first section whose heading matches a pattern.
+
+        Args:
+            heading_pattern: Compiled pattern matched against the heading text
+                (after the #'s, leading whitespace included)
+
+        Returns:
+            Matching section, or None
+        """
+        for section in self.sections:
+            if heading_pattern.match(section.heading):
+                return section
+        return None
+
+    def find_line(self, pattern: Pattern, start: int = 0) -> Tuple[int, Optional[re.Match]]:
+        """
+        Find the first line at or after start that contains a pattern.
+
+        The pattern is searched in the document text, so it must not match
+        across lines (no bare \\s; compile with MULTILINE if it uses ^ or $).
+
+        Args:
+            pattern: Compiled pattern searched in the document text
+            start: Line index to start from
+
+        Returns:
+            Tuple of (line index, match), or (-1, None) if not found.
+            Match offsets are relative to the document text.
+        """
+        if start >= len(self.lines):
+            return -1, None
+
+        offsets = self._get_line_offsets()
+        match = pattern.search(self.text, offsets[start])
+        if match is None:
+            return -1, None
+        return bisect_right(offsets, match.start()) - 1, match
+
+    def line_offset(self, line_num: int) -> int:
+        """Offset of a line's first character in the document text."""
+        return self._get_line_offsets()[line_num]
+
+    def _get_line_offsets(self) -> List[int]:
+        """Start offset of every line (built on first use)."""
+        if self._line_offsets is None:
+            # Characters before line i, plus one newline per earlier line
+            lengths = accumulate(map(len, self.lines[:-1]), initial=0)
+            self._line_offsets = list(map(add, lengths, range(len(self.lines))))
+        return self._line_offsets
+
+
+def parse_session(content: str) -> SessionDocument:
+    """
+    Parse session file content.
+
+    The text is scanned once for each kind of marker (headings, task
+    fields, decisions) with C-level searches, and the section tree is built
+    from the results in document order, so parsing is linear in file size.
+
+    Args:
+        content: Session file content
+
+    Returns:
+        SessionDocument
+    """
+    document = SessionDocument(content)
+    document.frontmatter = _parse_frontmatter(document.lines)
+
+    for match in grammar.DECISION_MARKER.finditer(content):
+        decision = match.group(1).strip()
+        if decision:
+            document.decisions.append(decision)
+
+    stack: List[Section] = []
+    task: Optional[Dict[str, str]] = None
+    line_num = 0
+    position = 0
+
+    for offset, field, value in _iter_structure(content):
+        line_num += content.count("\n", position, offset)
+        position = offset
+
+        if field is None:
+            # "##" heading: value is the whole heading line
+            heading = value.lstrip("#")
+            section = Section(document, len(value) - len(heading), heading, line_num)
+            if document.sections:
+                document.sections[-1].end = line_num
+            while stack and stack[-1].level >= section.level:
+                stack.pop()
+            if stack:
+                section.parent = stack[-1]
+                stack[-1].children.append(section)
+            stack.append(section)
+            document.sections.append(section)
+            task = None  # Task blocks don't continue past a heading
+        elif field == "TASK":
+            task = None
+            if value:
+                task = {"task": value, "status": "unknown", "notes": ""}
+                document.tasks.append(task)
+        elif task is not None:
+            # First [STATUS] / [NOTES] in the block wins
+            if field == "STATUS" and value and task["status"] == "unknown":
+                task["status"] = value
+            elif field == "NOTES" and not task["notes"]:
+                task["notes"] = value
+
+    if document.sections:
+        document.sections[-1].end = len(document.lines)
+
+    return document
+
+
+def _iter_structure(content: str) -> Iterator[Tuple[int, Optional[str], str]]:
+    """
+    Yield headings and task fields in document order.
+
+    Yields:
+        Tuples of (offset, field, value): field is None for a "##" heading
+        (value is the heading line), otherwise "TASK", "STATUS" or "NOTES"
+        (value is the stripped rest of the line)
+    """
+    headings = []
+    offset = 0 if content.startswith("##") else content.find("\n##") + 1
+    while offset > 0 or (offset == 0 and content.startswith("##")):
+        line_end = content.find("\n", offset)
+        if line_end == -1:
+            line_end = len(content)
+        headings.append((offset, None, content[offset:line_end]))
+        offset = content.find("\n##", line_end) + 1
+
+    fields = []
+    for match in grammar.TASK_FIELD.finditer(content):
+        line_start = content.rfind("\n", 0, match.start()) + 1
+        if content[line_start:match.start()].strip():
+            continue  # Not at the start of the line
+        line_end = content.find("\n", match.end())
+        if line_end == -1:
+            line_end = len(content)
+        fields.append((line_start, match.group(1).upper(), content[match.end():line_end].strip()))
+
+    return merge(headings, fields, key=lambda event: event[0])
+
+
+def _parse_frontmatter(lines: List[str]) -> Dict[str, str]:
+    """Parse "key: value" pairs between a leading "---" and the next "---"."""
+    metadata = {}
+
+    if not lines or not lines[0].startswith("---"):
+        return metadata
+
+    block = []
+    for line_num, line in enumerate(lines):
+        if line_num == 0:
+            line = line[3:]  # Skip the opening "---"
+        end = line.find("---")
+        if end != -1:
+            block.append(line[:end])
+            break
+        block.append(line)
+    else:
+        return metadata  # Unterminated frontmatter
+
+    for line in "\n".join(block).strip().split("\n"):
+        if ":" in line:
+            key, value = line.split(":", 1)
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            metadata[key] = value
+
+    return metadata
+
+
+def next_line_starts_item(lines: List[str], line_num: int) -> bool:
+    """
+    Check whether a line is directly followed by a list item or heading.
+
+    Single-line entries (checked items, bold discoveries) only count when
+    the next line starts a new "-"/"*" item or a "##" heading, or when they
+    are the last line of their block; entries followed by nested detail or
+    prose are skipped. This is the rule the extractors have always applied.
+
+    Args:
+        lines: Block lines
+        line_num: Index of the entry within lines
+
+    Returns:
+        True if the entry ends at a block boundary
+    """
+    if line_num == len(lines) - 1:
+        return True
+    return lines[line_num + 1].startswith(("-", "*", "##"))
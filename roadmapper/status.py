@@ -1,10 +1,10 @@
 """Status display functionality."""
 
-import subprocess
 from pathlib import Path
 from datetime import datetime
 import re
 
+from roadmapper.git import get_status
 from roadmapper.utils import ensure_utf8_console
 from roadmapper.history import get_session_stats
 from roadmapper.paths import get_project_root
@@ -59,30 +59,20 @@ def show_status() -> None:
     # Git status
     print("\n🔧 Git Status:")
     try:
-        result = subprocess.run(
-            ["git", "status", "--short"],
-            capture_output=True,
-            text=True,
-            cwd=cwd,
-        )
+        # Branch and file status come from a single git call
+        git_status = get_status(cwd)
         
-        if result.returncode == 0:
-            if result.stdout.strip():
+        if git_status is not None:
+            if not git_status.clean:
                 print("   Modified files:")
-                for line in result.stdout.strip().split("\n"):
-                    print(f"   {line}")
+                for entry in git_status.entries:
+                    print(f"   {entry.short_format()}")
             else:
                 print("   ✅ Working tree clean")
             
             # Branch info
-            branch_result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                capture_output=True,
-                text=True,
-                cwd=cwd,
-            )
-            if branch_result.returncode == 0 and branch_result.stdout.strip():
-                print(f"   Branch: {branch_result.stdout.strip()}")
+            if git_status.branch:
+                print(f"   Branch: {git_status.branch}")
         else:
             print("   ⚠️  Not a git repository")
     except FileNotFoundError:
@@ -1,10 +1,12 @@
 """Session summarization functionality."""
 
-import re
+import copy
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Pattern, Tuple
 
-from roadmapper.utils import read_text_file
+from roadmapper import session_cache
+from roadmapper import session_grammar as grammar
+from roadmapper.session_parser import SessionDocument, next_line_starts_item
 from roadmapper.paths import get_project_root
 
 
@@ -27,19 +29,40 @@ def extract_session_summary(session_file: Path) -> Dict[str, any]:
             "tasks": [],
         }
     
-    content = read_text_file(session_file)
+    # Parsed once per content version (see session_cache)
+    summary = session_cache.get_parsed(session_file, "summary", _summarize_document)
+    return copy.deepcopy(summary)  # Callers may modify their copy
+
+
+def extract_session_frontmatter(session_file: Path) -> Dict[str, str]:
+    """
+    Extract YAML frontmatter from a session file.
+    
+    Args:
+        session_file: Path to session file
     
+    Returns:
+        Dictionary of frontmatter keys and values (empty if none)
+    """
+    if not session_file.exists():
+        return {}
+    
+    return dict(session_cache.get_parsed(session_file, "frontmatter", lambda document: document.frontmatter))
+
+
+def _summarize_document(document: SessionDocument) -> Dict[str, any]:
+    """Build the summary dictionary for a parsed session file."""
     # Extract accomplishments from "Session Accomplishments" section
-    accomplishments = _extract_accomplishments(content)
+    accomplishments = _extract_accomplishments(document)
     
     # Extract decisions using reasoning markers
-    decisions = _extract_decisions(content)
+    decisions = _extract_decisions(document)
     
     # Extract discoveries
-    discoveries = _extract_discoveries(content)
+    discoveries = _extract_discoveries(document)
     
     # Extract structured tasks
-    tasks = _extract_tasks(content)
+    tasks = _extract_tasks(document)
     
     # Generate summary from accomplishments
     summary = _generate_summary(accomplishments, decisions, discoveries)
@@ -53,74 +76,105 @@ def extract_session_summary(session_file: Path) -> Dict[str, any]:
     }
 
 
-def _extract_accomplishments(content: str) -> List[str]:
+def _extract_accomplishments(document: SessionDocument) -> List[str]:
     """Extract accomplishments from session file."""
     accomplishments = []
     
     # Look for "## ✅ Session Accomplishments" section
-    pattern = r'##\s*✅\s*Session Accomplishments(.*?)(?=\n##|\Z)'
-    match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-    
-    if match:
-        section = match.group(1)
-        
-        # Look for "Completed:" subsection
-        completed_pattern = r'Completed:.*?(?=In Progress:|Deferred:|Discoveries:|\Z)'
-        completed_match = re.search(completed_pattern, section, re.DOTALL | re.IGNORECASE)
-        
-        if completed_match:
-            completed_section = completed_match.group(0)
-            # Extract list items starting with - or * and containing ✅
-            items = re.findall(r'[-*]\s*✅\s*(.+?)(?=\n[-*]|\n##|\Z)', completed_section, re.MULTILINE)
-            for item in items:
-                item = item.strip()
-                # Remove markdown formatting
-                item = re.sub(r'\*\*([^*]+)\*\*', r'\1', item)  # Remove bold
-                item = re.sub(r'`([^`]+)`', r'\1', item)  # Remove code
-                # Clean up nested bullets
-                item = re.sub(r'\n\s*[-*]\s*', ' ', item)
-                if item and len(item) > 10:  # Filter out very short items
-                    accomplishments.append(item)
+    section = document.find_section(grammar.ACCOMPLISHMENTS_HEADING)
+    if section is None:
+        return accomplishments
+    
+    # Rest of the heading line, then the section body
+    heading_match = grammar.ACCOMPLISHMENTS_HEADING.match(section.heading)
+    lines = [section.heading[heading_match.end():]] + section.lines
+    
+    # Look for "Completed:" subsection (up to "In Progress:", "Deferred:" or "Discoveries:")
+    completed = _slice_block(lines, grammar.COMPLETED_LABEL, grammar.COMPLETED_END)
+    
+    for line_num, line in enumerate(completed):
+        # Extract list items starting with - or * and containing ✅
+        match = grammar.CHECKED_LINE.search(line)
+        if not match or not next_line_starts_item(completed, line_num):
+            continue
+        item = match.group(1).strip()
+        # Remove markdown formatting
+        item = grammar.BOLD.sub(r'\1', item)  # Remove bold
+        item = grammar.INLINE_CODE.sub(r'\1', item)  # Remove code
+        if item and len(item) > 10:  # Filter out very short items
+            accomplishments.append(item)
     
     return accomplishments
 
 
-def _extract_decisions(content: str) -> List[str]:
-    """Extract decisions using reasoning markers."""
-    decisions = []
-    
-    # Look for 🧭 DECISION: markers
-    pattern = r'🧭\s*DECISION:\s*(.+?)(?=\n|🧭|🤔|✅|⚠️|💡|\Z)'
-    matches = re.findall(pattern, content, re.MULTILINE | re.IGNORECASE)
+def _slice_block(lines: List[str], start_pattern: Pattern, end_pattern: Pattern) -> List[str]:
+    """
+    Cut the lines from the first start_pattern match up to the next end_pattern match.
     
-    for match in matches:
-        decision = match.strip()
-        if decision:
-            decisions.append(decision)
+    Args:
+        lines: Lines to search
+        start_pattern: Pattern marking the start of the block (included)
+        end_pattern: Pattern marking the end of the block (excluded)
     
-    return decisions
+    Returns:
+        Block lines (first and last may be partial), or [] if start not found
+    """
+    for start, line in enumerate(lines):
+        start_match = start_pattern.search(line)
+        if start_match:
+            break
+    else:
+        return []
+    
+    block = []
+    offset = start_match.end()
+    for line_num in range(start, len(lines)):
+        line = lines[line_num]
+        end_match = end_pattern.search(line, offset)
+        first = start_match.start() if line_num == start else 0
+        if end_match:
+            block.append(line[first:end_match.start()])
+            break
+        block.append(line[first:])
+        offset = 0
+    
+    return block
+
+
+def _extract_decisions(document: SessionDocument) -> List[str]:
+    """Extract decisions using reasoning markers."""
+    # 🧭 DECISION: markers are collected while parsing
+    return list(document.decisions)
 
 
-def _extract_discoveries(content: str) -> List[str]:
+def _extract_discoveries(document: SessionDocument) -> List[str]:
     """Extract discoveries from session file."""
     discoveries = []
     
-    # Look for "Discoveries:" section
-    pattern = r'Discoveries:.*?(?=\n---|\n##|\Z)'
-    match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-    
-    if match:
-        section = match.group(0)
-        # Extract list items with bold text (discoveries are usually bold)
-        items = re.findall(r'[-*]\s*\*\*(.+?)\*\*\s*[-–—]\s*(.+?)(?=\n[-*]|\n##|\Z)', section)
-        for bold_part, rest in items:
+    # Look for "Discoveries:" section (up to the next "---" rule or "##" heading)
+    start, match = document.find_line(grammar.DISCOVERIES_LABEL)
+    if match is None:
+        return discoveries
+    
+    column = match.start() - document.line_offset(start)
+    section = [document.lines[start][column:]]
+    for line in document.lines[start + 1:]:
+        if line.startswith(("---", "##")):
+            break
+        section.append(line)
+    
+    # Extract list items with bold text (discoveries are usually bold)
+    for line_num, line in enumerate(section):
+        item_match = grammar.BOLD_DASH_LINE.search(line)
+        if item_match and next_line_starts_item(section, line_num):
+            bold_part, rest = item_match.groups()
             discovery = f"{bold_part.strip()} - {rest.strip()}"
             discoveries.append(discovery)
-        
-        # Also catch standalone bold items
-        if not discoveries:
-            items = re.findall(r'[-*]\s*\*\*(.+?)\*\*', section)
-            for item in items:
+    
+    # Also catch standalone bold items
+    if not discoveries:
+        for line in section:
+            for item in grammar.BOLD_ITEM.findall(line):
                 item = item.strip()
                 if item and len(item) > 10:
                     discoveries.append(item)
@@ -128,32 +182,10 @@ def _extract_discoveries(content: str) -> List[str]:
     return discoveries
 
 
-def _extract_tasks(content: str) -> List[Dict[str, str]]:
+def _extract_tasks(document: SessionDocument) -> List[Dict[str, str]]:
     """Extract structured tasks from session file."""
-    tasks = []
-    
-    # Look for [TASK] blocks
-    pattern = r'\[TASK\]\s*(.+?)(?=\n\[TASK\]|\n\[STATUS\]|\Z)'
-    task_matches = re.findall(pattern, content, re.MULTILINE | re.IGNORECASE)
-    
-    for task_desc in task_matches:
-        task_desc = task_desc.strip()
-        
-        # Find corresponding [STATUS] and [NOTES]
-        task_start = content.find(f"[TASK] {task_desc}")
-        if task_start != -1:
-            task_section = content[task_start:task_start + 500]  # Look ahead 500 chars
-            
-            status_match = re.search(r'\[STATUS\]\s*(.+?)(?=\n\[|\Z)', task_section, re.MULTILINE | re.IGNORECASE)
-            notes_match = re.search(r'\[NOTES\]\s*(.+?)(?=\n\[|\Z)', task_section, re.MULTILINE | re.IGNORECASE)
-            
-            tasks.append({
-                "task": task_desc,
-                "status": status_match.group(1).strip() if status_match else "unknown",
-                "notes": notes_match.group(1).strip() if notes_match else "",
-            })
-    
-    return tasks
+    # [TASK] blocks (with their [STATUS] and [NOTES]) are collected while parsing
+    return [dict(task) for task in document.tasks]
 
 
 def _generate_summary(
@@ -2,7 +2,7 @@
 
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 
 def ensure_utf8_console():
@@ -53,3 +53,11 @@ def write_text_file(file_path: Path, content: str, encoding: str = 'utf-8') -> N
     """
     file_path.write_text(content, encoding=encoding)
 
+
+def stat_key(file_path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,222 @@
+"""Background indexing for `roadmapper watch`.
+
+An IndexDaemon watches every registered project (see watcher.ProjectWatcher)
+and, when a project's files change, brings its derived stores up to date:
+
+- the project's search index (.roadmapper/cache/search_index.json)
+- the parsed-session cache (summaries and frontmatter of every session)
+- the history date index used by `history stats`
+- the project summary (last session, health, session counts) that project
+  listings and the dashboard read
+- the global knowledge base (only the changed projects are rescanned; the
+  knowledge log is compacted once most of it is replaced entries)
+
+Foreground commands read these stores and only re-derive what changed, so
+with the daemon running they find everything current. In-memory caches are
+dropped after each update, so the daemon's footprint does not grow with the
+number of projects or sessions it has seen.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from roadmapper import git, session_cache
+from roadmapper.history import clear_history_cache, read_history
+from roadmapper.knowledge import compact_knowledge, index_all_projects
+from roadmapper.paths import list_session_files
+from roadmapper.projects import get_projects_registry_file, load_projects_registry, refresh_project_summary
+from roadmapper.search_index import SearchIndex
+from roadmapper.summarize import extract_session_frontmatter, extract_session_summary
+from roadmapper.watcher import ProjectWatcher
+
+
+# How far back the history date index is extended on each update
+HISTORY_WINDOW = timedelta(days=30)
+
+LogCallback = Callable[[str], None]
+
+
+class ProjectUpdate:
+    """What an IndexDaemon refreshed for one project."""
+
+    def __init__(self, project_path: Path):
+        self.project_path = project_path
+        self.search_updated = False
+        self.health: Optional[str] = None  # From the refreshed summary
+        self.sessions = 0  # Session files whose parsed data is cached
+        self.errors: List[str] = []
+
+    def describe(self) -> str:
+        """One-line description for the watch log."""
+        parts = [f"{self.sessions} session(s)"]
+        if self.search_updated:
+            parts.append("search index updated")
+        if self.health is not None:
+            parts.append(f"health {self.health}")
+        parts.extend(f"error: {error}" for error in self.errors)
+        return ", ".join(parts)
+
+
+class IndexDaemon:
+    """
+    Keeps every registered project's derived stores current.
+
+    Runs an initial catch-up pass over all projects, then updates only the
+    projects a ProjectWatcher reports. A change to the projects registry
+    re-reads it and, if projects were added or removed, watches the new set.
+    """
+
+    def __init__(
+        self,
+        on_log: Optional[LogCallback] = None,
+        use_notifications: bool = True,
+        poll_interval: float = 1.0,
+    ):
+        self.on_log = on_log or (lambda message: None)
+        self.use_notifications = use_notifications
+        self.poll_interval = poll_interval
+
+        self.project_paths: List[Path] = []
+        self._watcher: Optional[ProjectWatcher] = None
+        self._lock = threading.Lock()  # One update at a time
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Watcher backend in use ("inotify" or "polling"), None if not started."""
+        return self._watcher.backend if self._watcher is not None else None
+
+    def start(self) -> None:
+        """Catch up on all projects, then start watching them."""
+        self.project_paths = _get_registered_paths()
+        self.update(set(self.project_paths))
+        self._start_watcher()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def update(self, project_paths: Set[Path]) -> Dict[Path, ProjectUpdate]:
+        """
+        Refresh the derived stores of the given projects.
+
+        Args:
+            project_paths: Projects whose files changed
+
+        Returns:
+            Mapping of project path to what was refreshed
+        """
+        updates = {}
+        with self._lock:
+            try:
+                for project_path in sorted(project_paths):
+                    if project_path.exists():
+                        updates[project_path] = refresh_project(project_path)
+
+                if updates:
+                    try:
+                        added = index_all_projects(project_paths=list(updates))
+                    except Exception as e:
+                        self.on_log(f"knowledge: error: {e}")
+                    else:
+                        if added:
+                            self.on_log(f"knowledge: {added} new entr{'y' if added == 1 else 'ies'}")
+                        compacted = compact_knowledge(only_if_needed=True)
+                        if compacted:
+                            self.on_log(f"knowledge: compacted {compacted[0]} records to {compacted[1]} entries")
+            finally:
+                # Everything is on disk now; keep the process footprint flat
+                clear_history_cache()
+                session_cache.clear_session_cache()
+                git.clear_git_cache()
+
+        for project_path, project_update in updates.items():
+            self.on_log(f"{project_path}: {project_update.describe()}")
+        return updates
+
+    def handle_change(self, changed: Set[Path]) -> None:
+        """Watcher callback."""
+        registry_file = get_projects_registry_file()
+        if registry_file in changed:
+            changed.discard(registry_file)
+            project_paths = _get_registered_paths()
+            if project_paths != self.project_paths:
+                added = set(project_paths) - set(self.project_paths)
+                self.project_paths = project_paths
+                self.on_log(f"registry changed: watching {len(project_paths)} project(s)")
+                changed |= added
+                self._restart_watcher()
+
+        if changed:
+            self.update(changed)
+
+    def _start_watcher(self) -> None:
+        self._watcher = ProjectWatcher(
+            self.project_paths,
+            self.handle_change,
+            extra_files=[get_projects_registry_file()],
+            poll_interval=self.poll_interval,
+            use_notifications=self.use_notifications,
+        )
+        self._watcher.start()
+
+    def _restart_watcher(self) -> None:
+        """Replace the watcher so it covers the current registry."""
+        old_watcher = self._watcher
+        self._start_watcher()
+        if old_watcher is not None:
+            # Called from the old watcher's own thread; stop it without joining itself
+            threading.Thread(target=old_watcher.stop, daemon=True).start()
+
+
+def refresh_project(project_path: Path) -> ProjectUpdate:
+    """
+    Bring one project's search index, session cache, history index and summary up to date.
+
+    Each store only re-derives what changed since it was last written.
+
+    Args:
+        project_path: Path to project root
+
+    Returns:
+        ProjectUpdate describing what was refreshed
+    """
+    project_update = ProjectUpdate(project_path)
+
+    try:
+        index = SearchIndex.load(project_path)
+        if index.refresh():
+            index.save()
+            project_update.search_updated = True
+    except Exception as e:
+        project_update.errors.append(f"search: {e}")
+
+    with session_cache.batch():
+        for session_file in list_session_files(project_path):
+            try:
+                extract_session_summary(session_file)
+                extract_session_frontmatter(session_file)
+            except (OSError, UnicodeDecodeError):
+                continue  # Deleted or unreadable meanwhile
+            project_update.sessions += 1
+
+    try:
+        read_history(project_path, since=datetime.now() - HISTORY_WINDOW)
+    except Exception as e:
+        project_update.errors.append(f"history: {e}")
+
+    try:
+        project_update.health = refresh_project_summary(project_path)["health"]
+    except Exception as e:
+        project_update.errors.append(f"summary: {e}")
+
+    return project_update
+
+
+def _get_registered_paths() -> List[Path]:
+    """Registered project paths, in registry order."""
+    return [Path(project_key) for project_key in load_projects_registry()]
+
@@ -0,0 +1,221 @@
+"""Watch registered projects for changes to the files roadmapper reads.
+
+A ProjectWatcher reports which projects had history.jsonl, PROJECT_ROADMAP.md
+or a SESSION_*.md file change. It uses filesystem notifications (inotify on
+Linux) through watchdog when that is installed (pip install
+'roadmapper[watch]'), and otherwise polls file stats once per interval.
+"""
+
+import fnmatch
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from roadmapper.utils import stat_key
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+# Directories watched per project (relative to its root, never recursive)
+WATCHED_DIRS = ("", ".roadmapper", "docs/archive/sessions")
+
+WATCHED_NAMES = ("history.jsonl", "PROJECT_ROADMAP.md")
+WATCHED_PATTERN = "SESSION_*.md"
+
+ChangeCallback = Callable[[Set[Path]], None]
+
+
+def is_watched_file(name: str) -> bool:
+    """Check whether a file name is one a project watcher reports."""
+    return name in WATCHED_NAMES or fnmatch.fnmatchcase(name, WATCHED_PATTERN)
+
+
+class ProjectWatcher:
+    """
+    Reports changed projects to a callback, from a background thread.
+
+    Changes are batched: the callback receives the set of project paths (and
+    extra files, as given) that changed within `debounce` seconds, so a burst
+    of writes to one session file causes one call.
+    """
+
+    def __init__(
+        self,
+        project_paths: Iterable[Path],
+        on_change: ChangeCallback,
+        extra_files: Iterable[Path] = (),
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+        use_notifications: bool = True,
+    ):
+        self.project_paths = [Path(p) for p in project_paths]
+        self.extra_files = [Path(p) for p in extra_files]
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.backend = "inotify" if use_notifications and Observer is not None else "polling"
+
+        self._pending: Set[Path] = set()
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._observer = None
+
+    def start(self) -> None:
+        """Start watching in background threads."""
+        self._stopped.clear()
+
+        if self.backend == "inotify":
+            self._observer = Observer()
+            handler = _EventHandler(self)
+            for directory in self._watched_dirs():
+                try:
+                    self._observer.schedule(handler, str(directory), recursive=False)
+                except OSError:
+                    continue  # Unreadable or vanished directory
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._start_thread(self._poll)
+
+        self._start_thread(self._dispatch)
+
+    def stop(self) -> None:
+        """Stop watching and wait briefly for the background threads."""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=1)
+            self._observer = None
+
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+
+    def notify(self, changed: Path) -> None:
+        """Queue a changed project (or extra file) for the next callback."""
+        with self._condition:
+            self._pending.add(changed)
+            self._condition.notify_all()
+
+    def _start_thread(self, target: Callable[[], None]) -> None:
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _watched_dirs(self) -> List[Path]:
+        """Existing directories to subscribe to."""
+        directories = []
+        for project_path in self.project_paths:
+            for relative in WATCHED_DIRS:
+                directory = project_path / relative if relative else project_path
+                if directory.is_dir():
+                    directories.append(directory)
+        for extra_file in self.extra_files:
+            if extra_file.parent.is_dir() and extra_file.parent not in directories:
+                directories.append(extra_file.parent)
+        return directories
+
+    def _watch_new_dir(self, directory: Path) -> None:
+        """Subscribe to a watched directory created after start (e.g. .roadmapper)."""
+        for project_path in self.project_paths:
+            for relative in WATCHED_DIRS:
+                if relative and directory == project_path / relative and self._observer is not None:
+                    try:
+                        self._observer.schedule(_EventHandler(self), str(directory), recursive=False)
+                    except OSError:
+                        return
+                    self.notify(project_path)  # Files may already be inside
+                    return
+
+    def _owner(self, file_path: Path) -> Optional[Path]:
+        """Map a changed file to the project (or extra file) it belongs to."""
+        if file_path in self.extra_files:
+            return file_path
+        if not is_watched_file(file_path.name):
+            return None
+
+        for project_path in self.project_paths:
+            for relative in WATCHED_DIRS:
+                directory = project_path / relative if relative else project_path
+                if file_path.parent == directory:
+                    return project_path
+        return None
+
+    def _dispatch(self) -> None:
+        """Deliver batched changes to the callback."""
+        while not self._stopped.is_set():
+            with self._condition:
+                while not self._pending and not self._stopped.is_set():
+                    self._condition.wait()
+            if self._stopped.wait(self.debounce):
+                return
+
+            with self._condition:
+                changed, self._pending = self._pending, set()
+            try:
+                self.on_change(changed)
+            except Exception:
+                pass  # A failing callback must not stop the watcher
+
+    def _poll(self) -> None:
+        """Polling backend: compare file stats every poll_interval seconds."""
+        snapshot = self._snapshot()
+        while not self._stopped.wait(self.poll_interval):
+            current = self._snapshot()
+            for key in current.keys() | snapshot.keys():
+                if current.get(key) != snapshot.get(key):
+                    self.notify(key)
+            snapshot = current
+
+    def _snapshot(self) -> Dict[Path, Tuple]:
+        """Stats of every watched file, grouped by project (or extra file)."""
+        snapshot = {}
+        for project_path in self.project_paths:
+            files = []
+            for relative in WATCHED_DIRS:
+                directory = project_path / relative if relative else project_path
+                try:
+                    entries = list(directory.iterdir())
+                except OSError:
+                    continue
+                for entry in entries:
+                    if is_watched_file(entry.name):
+                        files.append((str(entry), stat_key(entry)))
+            snapshot[project_path] = tuple(sorted(files))
+
+        for extra_file in self.extra_files:
+            snapshot[extra_file] = stat_key(extra_file)
+        return snapshot
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forwards watchdog events for watched files to a ProjectWatcher."""
+
+    def __init__(self, watcher: ProjectWatcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        # Ignore reads (opened / closed-without-writing), including our own
+        if event.event_type not in ("created", "deleted", "modified", "moved", "closed"):
+            return
+        if event.is_directory:
+            if event.event_type == "created":
+                self.watcher._watch_new_dir(Path(event.src_path))
+            return
+        paths = [event.src_path, getattr(event, "dest_path", None)]
+        for path in paths:
+            if not path:
+                continue
+            owner = self.watcher._owner(Path(path))
+            if owner is not None:
+                self.watcher.notify(owner)
@@ -0,0 +1,13 @@
+"""Shared fixtures: every test gets its own home directory (~/.roadmapper)."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def home_dir(tmp_path, monkeypatch):
+    """Point the home directory (and so ~/.roadmapper) at a temporary directory."""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("USERPROFILE", str(home))
+    return home
@@ -0,0 +1,72 @@
+"""Tests for roadmapper.cli."""
+
+import json
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from roadmapper.cli import main
+
+
+# The only roadmapper modules `import roadmapper.cli` may load; subcommands
+# import the rest when they run
+CLI_MODULES = {"roadmapper", "roadmapper.cli", "roadmapper.paths", "roadmapper.utils"}
+
+# Third-party and stdlib modules that only the subcommands needing them may import
+HEAVY_MODULES = ("flask", "watchdog", "sqlite3")
+
+
+def test_importing_cli_stays_lightweight():
+    code = "import json, sys, roadmapper.cli; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    modules = json.loads(output)
+
+    assert {module for module in modules if module.split(".")[0] == "roadmapper"} == CLI_MODULES
+    loaded = [
+        module for module in modules
+        if any(module == heavy or module.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+    ]
+    assert loaded == []
+
+
+def _search_results(monkeypatch, count):
+    from roadmapper import knowledge
+
+    entries = [
+        {"type": "discovery", "content": f"Entry {i}", "project": "app", "session_file": "SESSION_A.md"}
+        for i in range(count)
+    ]
+    monkeypatch.setattr(
+        knowledge,
+        "search_knowledge",
+        lambda query, knowledge_type=None: knowledge.KnowledgeResults(
+            len(entries), lambda offset, limit: entries[offset:offset + limit]
+        ),
+    )
+
+
+def test_knowledge_search_says_how_many_results_are_not_shown(monkeypatch):
+    _search_results(monkeypatch, 30)
+    result = CliRunner().invoke(main, ["knowledge", "search", "entry", "--limit", "5", "--offset", "10"])
+
+    assert result.exit_code == 0
+    assert "11. " in result.output and "16. " not in result.output
+    assert "... and 15 more results (use --offset 15 to see them)" in result.output
+
+
+def test_knowledge_search_rejects_a_limit_below_one():
+    result = CliRunner().invoke(main, ["knowledge", "search", "entry", "--limit", "0"])
+    assert result.exit_code == 2
+
+
+def test_knowledge_learn_shows_five_entries_per_project(monkeypatch):
+    _search_results(monkeypatch, 7)
+    result = CliRunner().invoke(main, ["knowledge", "learn", "entry"])
+
+    assert result.exit_code == 0
+    assert "app (7 entries)" in result.output
+    assert "Entry 4" in result.output and "Entry 5" not in result.output
+    assert "... and 2 more" in result.output
@@ -0,0 +1,31 @@
+"""Tests for roadmapper.dashboard."""
+
+from roadmapper import dashboard
+
+
+def test_timed_out_projects_are_not_reported_as_having_no_sessions(tmp_path, monkeypatch):
+    # Every project times out, as on a hung network drive
+    monkeypatch.setattr(
+        dashboard,
+        "map_projects",
+        lambda func, items, default: [default(item) for item in items],
+    )
+    project_infos = [
+        {"name": name, "path": str(tmp_path / name), "health": "healthy"}
+        for name in ("app", "api")
+    ]
+
+    summaries = dashboard.build_project_summaries(project_infos)
+
+    assert all(summary.partial for summary in summaries)
+    assert dashboard.detect_projects_without_sessions(summaries) is None
+
+
+def test_projects_without_sessions_are_reported(tmp_path):
+    project_path = tmp_path / "app"
+    project_path.mkdir()
+
+    [summary] = dashboard.build_project_summaries([{"name": "app", "path": str(project_path)}])
+
+    assert not summary.partial
+    assert dashboard.detect_projects_without_sessions([summary])["projects"] == ["app"]
@@ -0,0 +1,23 @@
+"""Tests for roadmapper.git."""
+
+from roadmapper import git
+
+
+def test_memoize_evicts_only_when_over_the_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(git, "MAX_MEMO_CACHE_BYTES", 2000)
+    monkeypatch.setattr(git, "MEMO_CACHE_TRIM_BYTES", 1500)
+    scans = []
+    evict = git._evict_memo_entries
+
+    def counting_evict(memo_dir, max_bytes):
+        scans.append(max_bytes)
+        return evict(memo_dir, max_bytes)
+
+    monkeypatch.setattr(git, "_evict_memo_entries", counting_evict)
+
+    for number in range(100):
+        assert git.memoize(tmp_path, ["metric", str(number)], lambda: "x" * 50) == "x" * 50
+
+    memo_dir = tmp_path / ".roadmapper" / "cache" / "git"
+    assert sum(path.stat().st_size for path in memo_dir.glob("*.json")) <= 2000
+    assert len(scans) < 20  # Not one directory scan per write
@@ -0,0 +1,50 @@
+"""Tests for roadmapper.history."""
+
+import json
+from datetime import datetime, timedelta
+
+from roadmapper import history
+
+
+START = datetime(2025, 1, 1)
+
+
+def _write_records(history_file, hours, mode="a"):
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with history_file.open(mode, encoding="utf-8") as f:
+        for hour in hours:
+            record = {"type": "session", "date": (START + timedelta(hours=hour)).isoformat() + "Z"}
+            f.write(json.dumps(record) + "\n")
+
+
+def test_since_counts_out_of_order_appends(tmp_path):
+    project = tmp_path / "project"
+    history_file = project / ".roadmapper" / "history.jsonl"
+    since = START + timedelta(hours=900)
+
+    _write_records(history_file, range(1000), mode="w")
+    history.clear_history_cache()
+    assert len(history.read_history(project, since=since)) == 100
+
+    # History merged in from another machine: older than the last records
+    _write_records(history_file, range(850, 950))
+    history.clear_history_cache()
+    assert len(history.read_history(project, since=since)) == 150
+    history.clear_history_cache()
+    assert history.get_session_stats(project, since=since)["total_sessions"] == 150
+
+
+def test_since_reindexes_rewritten_history(tmp_path):
+    project = tmp_path / "project"
+    history_file = project / ".roadmapper" / "history.jsonl"
+    since = START + timedelta(hours=500)
+
+    _write_records(history_file, range(1000), mode="w")
+    history.clear_history_cache()
+    assert len(history.read_history(project, since=since)) == 500
+
+    # Same-size prefix rewritten with other dates, then extended
+    _write_records(history_file, range(1000, 2000), mode="w")
+    _write_records(history_file, range(2000, 2010))
+    history.clear_history_cache()
+    assert len(history.read_history(project, since=since)) == 1010
@@ -0,0 +1,101 @@
+"""Tests for roadmapper.knowledge."""
+
+import pytest
+
+from roadmapper import knowledge, projects
+
+
+SESSION = """# Session
+
+## Discoveries
+
+- Parsing session files once into a section tree avoids repeated regex scans
+- The dashboard can reuse cached project summaries between requests
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    project_path = tmp_path / "app"
+    project_path.mkdir()
+    (project_path / "SESSION_2025_01_01.md").write_text(SESSION, encoding="utf-8")
+    projects.register_project(project_path)
+    return project_path
+
+
+def _use_backend(monkeypatch, backend):
+    monkeypatch.setattr(knowledge, "get_knowledge_backend", lambda: backend)
+
+
+def test_switching_backend_reindexes_into_the_new_store(project, monkeypatch):
+    _use_backend(monkeypatch, "json")
+    assert knowledge.index_all_projects() == 2
+    assert knowledge.index_all_projects() == 0
+
+    _use_backend(monkeypatch, "sqlite")
+    assert knowledge.index_all_projects() == 2
+    assert knowledge.get_knowledge_count() == 2
+    assert len(knowledge.search_knowledge("section tree")) == 1
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_clones_with_the_same_name_keep_their_own_entries(tmp_path, monkeypatch, backend):
+    _use_backend(monkeypatch, backend)
+    clones = []
+    for parent in ("first", "second"):
+        clone = tmp_path / parent / "app"
+        clone.mkdir(parents=True)
+        (clone / "SESSION_2025_01_01.md").write_text(SESSION, encoding="utf-8")
+        projects.register_project(clone)
+        clones.append(clone)
+
+    assert knowledge.index_all_projects() == 4
+
+    projects.unregister_project(clones[0])
+    knowledge.index_all_projects()
+    remaining = knowledge.load_knowledge()
+    assert len(remaining) == 2
+    assert {entry["project_path"] for entry in remaining} == {str(clones[1].resolve())}
+
+
+def _results(total):
+    entries = [{"content": f"entry {i}"} for i in range(total)]
+    fetches = []
+
+    def fetch(offset, limit):
+        fetches.append((offset, limit))
+        return entries[offset:offset + limit]
+
+    return knowledge.KnowledgeResults(total, fetch), fetches
+
+
+def test_knowledge_results_behave_like_a_list():
+    results, fetches = _results(10)
+
+    assert len(results) == 10
+    assert [entry["content"] for entry in results.page(8)] == ["entry 8", "entry 9"]
+    assert results.page(10) == []
+    assert results[-1]["content"] == "entry 9"
+    assert results[0]["content"] == "entry 0"
+    assert [entry["content"] for entry in results[2:4]] == ["entry 2", "entry 3"]
+    assert results[20:] == []
+    with pytest.raises(IndexError):
+        results[-11]
+    assert (8, 2) in fetches and (2, 2) in fetches
+
+
+def test_iterating_knowledge_results_runs_the_search_once():
+    results, fetches = _results(250)
+    assert len(list(results)) == 250
+    assert fetches == [(0, 250)]
+
+
+def test_sqlite_results_are_streamed_from_one_query(project, monkeypatch):
+    _use_backend(monkeypatch, "sqlite")
+    knowledge.index_all_projects()
+    database = knowledge.get_knowledge_database()
+    monkeypatch.setattr(type(database), "search", lambda *args: pytest.fail("paged while iterating"))
+
+    assert [entry["content"] for entry in knowledge.search_knowledge("section tree")] == [
+        "Parsing session files once into a section tree avoids repeated regex scans"
+    ]
@@ -0,0 +1,98 @@
+"""Tests for roadmapper.knowledge_db."""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from roadmapper.knowledge_db import SCHEMA_VERSION, KnowledgeDatabase, build_match_query
+
+
+def _entry(content, project="app", session_file="SESSION_2025_01_01.md", knowledge_type="discovery"):
+    return {
+        "type": knowledge_type,
+        "content": content,
+        "project": project,
+        "project_path": f"/work/{project}",
+        "session_file": session_file,
+        "extracted_at": "2025-01-01T00:00:00",
+    }
+
+
+def test_newer_schema_is_not_dropped(tmp_path):
+    db_file = tmp_path / "knowledge.db"
+    database = KnowledgeDatabase.open(db_file)
+    database.replace_all([_entry("Caching parsed sessions by content hash")])
+    with closing(sqlite3.connect(str(db_file))) as connection:
+        connection.execute(f"PRAGMA user_version={SCHEMA_VERSION + 1}")
+        connection.commit()
+
+    with pytest.raises(RuntimeError):
+        KnowledgeDatabase.open(db_file)
+
+    with closing(sqlite3.connect(str(db_file))) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 1
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = KnowledgeDatabase.open(tmp_path / "knowledge.db")
+    database.replace_all([
+        _entry(
+            "The deploy script copies files, restarts workers, checks health endpoints"
+            " and mentions the cache once near the end of a long note"
+        ),
+        _entry("Cache parsed sessions; the cache is keyed by content hash"),
+        _entry("Parsing session files once into a section tree", knowledge_type="pattern"),
+        _entry("Dashboard pages are cached with ETags", project="api"),
+    ])
+    return database
+
+
+def test_search_ranks_closer_matches_first(database):
+    results = database.search("cache")
+    assert len(results) == 3
+    # Two mentions in a short entry first, one mention in a long entry last
+    assert results[0]["content"].startswith("Cache parsed")
+    assert results[-1]["content"].startswith("The deploy script")
+
+
+def test_search_marks_matches_in_snippets(database):
+    [result] = database.search("section tree")
+    assert "[section]" in result["snippet"]
+    assert "[tree]" in result["snippet"]
+
+
+def test_search_filters_by_type(database):
+    assert [result["type"] for result in database.search("parsing", "pattern")] == ["pattern"]
+    assert database.search("parsing", "decision") == []
+
+
+def test_only_the_last_query_word_matches_as_a_prefix(database):
+    assert build_match_query("tree sess") == 'content : ("tree" AND "sess"*)'
+    assert len(database.search("tree sess")) == 1
+    assert database.search("sess tree") == []
+
+
+@pytest.mark.parametrize("query", ['"cache', "cache*", "(cache", "-cache", "cache:", "cache^"])
+def test_fts_syntax_in_queries_is_dropped(database, query):
+    # Passed to FTS5 as is, these would be syntax errors or operators
+    assert len(database.search(query)) == 3
+    assert database.count_matches(query) == 3
+
+
+@pytest.mark.parametrize("query", ["*", '""', "()", " - ", ""])
+def test_queries_of_only_fts_syntax_find_nothing(database, query):
+    assert database.search(query) == []
+    assert database.count_matches(query) == 0
+
+
+@pytest.mark.parametrize("query, knowledge_type", [
+    ("cache", None),
+    ("cache", "discovery"),
+    ("parsing", "pattern"),
+    ("session", None),
+    ("nothing matches this", None),
+])
+def test_count_matches_agrees_with_search(database, query, knowledge_type):
+    assert database.count_matches(query, knowledge_type) == len(database.search(query, knowledge_type))
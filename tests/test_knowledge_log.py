@@ -0,0 +1,113 @@
+"""Tests for roadmapper.knowledge_log."""
+
+import json
+
+import pytest
+
+from roadmapper.knowledge_log import LOG_VERSION, KnowledgeLog
+
+
+def _entry(content, project="app", session_file="SESSION_2025_01_01.md"):
+    return {
+        "type": "discovery",
+        "content": content,
+        "project": project,
+        "project_path": f"/work/{project}",
+        "session_file": session_file,
+        "extracted_at": "2025-01-01T00:00:00",
+    }
+
+
+def test_writers_in_separate_handles_keep_each_others_appends(tmp_path):
+    directory = tmp_path / "knowledge"
+    first = KnowledgeLog.open(directory)
+    second = KnowledgeLog.open(directory)
+
+    first.replace_sources(
+        {("/work/app", "SESSION_A.md")}, [_entry("First writer's entry", session_file="SESSION_A.md")]
+    )
+    second.replace_sources(
+        {("/work/app", "SESSION_B.md")}, [_entry("Second writer's entry", session_file="SESSION_B.md")]
+    )
+
+    reopened = KnowledgeLog.open(directory)
+    assert reopened.count() == 2
+    assert reopened.manifest["records"] == 2
+    assert sorted(entry["session_file"] for entry in reopened.load()) == ["SESSION_A.md", "SESSION_B.md"]
+
+
+def test_index_changes_are_appended_and_folded_in_by_compaction(tmp_path):
+    directory = tmp_path / "knowledge"
+    log = KnowledgeLog.open(directory)
+    source = ("/work/app", "SESSION_A.md")
+    log.replace_sources({source}, [_entry("Original entry content", session_file="SESSION_A.md")])
+    snapshot = log.index_file.read_bytes()
+
+    entry = _entry("Replacement entry content", session_file="SESSION_A.md")
+    log.replace_sources({source}, [entry])
+    assert log.index_file.read_bytes() == snapshot  # Not rewritten
+    assert log.index_log_file.exists()
+
+    reopened = KnowledgeLog.open(directory)
+    [stored] = reopened.load()
+    assert [found["content"] for found in reopened.get([stored["id"]])] == [entry["content"]]
+
+    reopened.compact()
+    assert not reopened.index_log_file.exists()
+    assert [found["content"] for found in KnowledgeLog.open(directory).get([stored["id"]])] == [
+        entry["content"]
+    ]
+
+
+def test_related_looks_up_only_the_entrys_buckets(tmp_path, monkeypatch):
+    directory = tmp_path / "knowledge"
+    log = KnowledgeLog.open(directory)
+    content = "Caching database queries with redis speeds up dashboard loading"
+    log.replace_sources({("/work/app", "SESSION_A.md")}, [_entry(content, session_file="SESSION_A.md")])
+    log.replace_sources(
+        {("/work/api", "SESSION_A.md")},
+        [
+            _entry(content.replace("dashboard", "report"), project="api", session_file="SESSION_A.md"),
+            _entry("Deploy scripts now template kubernetes manifests", project="api", session_file="SESSION_A.md"),
+        ],
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("related() loaded the whole knowledge base")
+
+    reopened = KnowledgeLog.open(directory)
+    monkeypatch.setattr(KnowledgeLog, "_load_index", fail)
+    monkeypatch.setattr(KnowledgeLog, "_replay", fail)
+    [related] = reopened.related(_entry(content))
+    assert related["project"] == "api"
+    assert related["similarity"] > 0.5
+
+
+def test_appends_after_a_torn_line_start_a_new_segment(tmp_path):
+    directory = tmp_path / "knowledge"
+    log = KnowledgeLog.open(directory)
+    log.replace_sources({("/work/app", "SESSION_A.md")}, [_entry("Entry before the crash", session_file="SESSION_A.md")])
+    segment = directory / log.manifest["segments"][-1]
+    with segment.open("ab") as f:
+        f.write(b'{"content": "Half-written rec')  # Crash mid-write
+
+    log.replace_sources({("/work/app", "SESSION_B.md")}, [_entry("Entry after the crash", session_file="SESSION_B.md")])
+
+    reopened = KnowledgeLog.open(directory)
+    assert reopened.count() == 2
+    entries = reopened.load()
+    assert [entry["content"] for entry in entries] == ["Entry before the crash", "Entry after the crash"]
+    assert len(reopened.get([entry["id"] for entry in entries])) == 2
+
+
+def test_newer_log_is_not_replaced(tmp_path):
+    directory = tmp_path / "knowledge"
+    log = KnowledgeLog.open(directory)
+    log.replace_sources({("/work/app", "SESSION_A.md")}, [_entry("Kept entry", session_file="SESSION_A.md")])
+    manifest = json.loads(log.manifest_file.read_text(encoding="utf-8"))
+    log.manifest_file.write_text(json.dumps(dict(manifest, version=LOG_VERSION + 1)), encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        KnowledgeLog.open(directory)
+
+    assert json.loads(log.manifest_file.read_text(encoding="utf-8"))["sources"] == manifest["sources"]
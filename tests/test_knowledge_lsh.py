@@ -0,0 +1,114 @@
+"""Tests for roadmapper.knowledge_lsh and the related-entry lookups built on it."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from roadmapper import knowledge
+from roadmapper.knowledge_db import KnowledgeDatabase
+from roadmapper.knowledge_log import KnowledgeLog
+from roadmapper.knowledge_lsh import (
+    BANDS,
+    NUM_HASHES,
+    ROWS,
+    band_keys,
+    estimate_similarity,
+    minhash_signature,
+)
+
+
+CONTENT = "Caching database queries with redis speeds up dashboard loading"
+
+
+def _entry(content, project):
+    return {
+        "type": "discovery",
+        "content": content,
+        "project": project,
+        "project_path": f"/work/{project}",
+        "session_file": "SESSION_2025_01_01.md",
+        "extracted_at": "2025-01-01T00:00:00",
+    }
+
+
+def test_signatures_are_the_same_in_every_process():
+    code = (
+        "from roadmapper.knowledge_lsh import minhash_signature;"
+        f"print(minhash_signature({CONTENT!r}).hex())"
+    )
+    signatures = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True, env=dict(os.environ, PYTHONHASHSEED=seed),
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert signatures == {minhash_signature(CONTENT).hex()}
+
+
+def test_content_without_significant_words_has_no_signature():
+    assert minhash_signature("it is up to us") is None
+
+
+def test_similarity_of_identical_and_disjoint_content():
+    signature = minhash_signature(CONTENT)
+    assert estimate_similarity(signature, minhash_signature(CONTENT.upper())) == 1.0
+    disjoint = minhash_signature("Kubernetes manifests templated by deploy scripts nightly")
+    assert estimate_similarity(signature, disjoint) < 0.1
+
+
+def test_band_keys_cut_the_signature_into_consecutive_bands():
+    signature = minhash_signature(CONTENT)
+    keys = band_keys(signature)
+
+    assert len(signature) == NUM_HASHES * 4
+    assert [band for band, value in keys] == list(range(BANDS))
+    assert all(len(value) == ROWS * 4 for band, value in keys)
+    assert b"".join(value for band, value in keys) == signature
+
+
+@pytest.fixture(params=["log", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "log":
+        store = KnowledgeLog.open(tmp_path / "knowledge")
+    else:
+        store = KnowledgeDatabase.open(tmp_path / "knowledge.db")
+    store.replace_all([
+        _entry(CONTENT, "app"),  # Same project as the query
+        _entry(CONTENT.replace("dashboard", "report"), "api"),
+        _entry(CONTENT.replace("dashboard loading", "nightly report exports"), "web"),
+        _entry("Kubernetes manifests templated by deploy scripts nightly", "ops"),
+    ])
+    return store
+
+
+def test_related_excludes_the_entrys_own_project(store):
+    related = store.related(_entry(CONTENT, "app"), threshold=0.0)
+    assert "app" not in {entry["project"] for entry in related}
+    assert [entry["project"] for entry in related][:2] == ["api", "web"]
+
+
+def test_related_honours_threshold_and_limit(store):
+    query = _entry(CONTENT, "app")
+    similarities = {entry["project"]: entry["similarity"] for entry in store.related(query, threshold=0.0)}
+    assert similarities["api"] > similarities["web"] > 0.3
+
+    threshold = (similarities["api"] + similarities["web"]) / 2
+    assert [entry["project"] for entry in store.related(query, threshold=threshold)] == ["api"]
+    assert [entry["project"] for entry in store.related(query, threshold=0.0, limit=1)] == ["api"]
+    assert store.related(_entry("it is up to us", "app")) == []
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 0.3),
+    ("not a number", 0.3),
+    (0.5, 0.5),
+    ("0.7", 0.7),
+    (-1, 0.0),
+    (2, 1.0),
+])
+def test_related_threshold_is_clamped_with_a_fallback(monkeypatch, value, expected):
+    monkeypatch.setattr(knowledge, "get_config_value", lambda key: value)
+    assert knowledge._get_related_threshold() == expected
@@ -0,0 +1,84 @@
+"""Tests for roadmapper.projects."""
+
+import shutil
+import threading
+import time
+
+from roadmapper import projects
+
+
+def test_map_projects_waits_once_for_hung_items(monkeypatch):
+    monkeypatch.setattr(projects, "_get_scan_settings", lambda: (4, 0.2))
+    release = threading.Event()
+
+    def refresh(item):
+        if item % 2:
+            release.wait(5)  # Hung project
+        return item * 10
+
+    try:
+        started = time.monotonic()
+        results = projects.map_projects(refresh, list(range(4)), default=lambda item: -item)
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    assert results == [0, -1, 20, -3]
+    assert elapsed < 0.35  # Hung items time out together, not one after another
+
+
+def test_map_projects_times_out_each_item_from_when_it_starts(monkeypatch):
+    monkeypatch.setattr(projects, "_get_scan_settings", lambda: (2, 0.2))
+    release = threading.Event()
+
+    def refresh(item):
+        if item == 0:
+            release.wait(5)  # Hung project, holding one worker
+        else:
+            time.sleep(0.15)  # Slow but within its own timeout
+        return item * 10
+
+    try:
+        results = projects.map_projects(refresh, list(range(6)), default=lambda item: "timed out")
+    finally:
+        release.set()
+
+    # The slow items queue behind each other on the free worker, well past 3 rounds of timeout
+    assert results == ["timed out", 10, 20, 30, 40, 50]
+
+
+def test_project_summary_is_reused_until_history_changes(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    (project / ".roadmapper").mkdir(parents=True)
+    (project / "PROJECT_ROADMAP.md").write_text("# Roadmap\n", encoding="utf-8")
+    history_file = project / ".roadmapper" / "history.jsonl"
+    history_file.write_text('{"type": "session", "date": "2025-01-01T10:00:00Z"}\n', encoding="utf-8")
+
+    assert projects.get_project_summary(project)["total_sessions"] == 1
+
+    load_history = projects.load_history
+    calls = []
+    monkeypatch.setattr(projects, "load_history", lambda path: calls.append(path) or load_history(path))
+    assert projects.get_project_summary(project)["total_sessions"] == 1
+    assert calls == []
+
+    with history_file.open("a", encoding="utf-8") as f:
+        f.write('{"type": "session", "date": "2025-01-02T10:00:00Z"}\n')
+    assert projects.get_project_summary(project)["total_sessions"] == 2
+    assert calls == [project]
+
+
+def test_pruning_missing_projects_deletes_only_their_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(projects, "get_registry_backend", lambda: "sqlite")
+    kept, removed = tmp_path / "kept", tmp_path / "removed"
+    for project_path in (kept, removed):
+        project_path.mkdir()
+        projects.register_project(project_path)
+    shutil.rmtree(removed)
+
+    def replace(self, registry):
+        raise AssertionError("rewrote the whole registry")
+
+    monkeypatch.setattr(projects.RegistryDatabase, "replace", replace)
+    assert [project["name"] for project in projects.get_all_projects()] == ["kept"]
+    assert list(projects.load_projects_registry()) == [str(kept.resolve())]
@@ -0,0 +1,23 @@
+"""Tests for roadmapper.registry_db."""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from roadmapper.registry_db import SCHEMA_VERSION, RegistryDatabase
+
+
+def test_newer_schema_is_not_dropped(tmp_path):
+    db_file = tmp_path / "projects.db"
+    database = RegistryDatabase.open(db_file)
+    database.update({"/work/app": {"name": "app", "path": "/work/app"}})
+    with closing(sqlite3.connect(str(db_file))) as connection:
+        connection.execute(f"PRAGMA user_version={SCHEMA_VERSION + 1}")
+        connection.commit()
+
+    with pytest.raises(RuntimeError):
+        RegistryDatabase.open(db_file)
+
+    with closing(sqlite3.connect(str(db_file))) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 1